@@ -3,7 +3,7 @@ import os
 import pkg_resources
 import argparse
 import time
-from . import tasks
+from . import tasks, utils
 
 
 def main():
@@ -474,6 +474,20 @@ def add_import_gff_arguments(parser: argparse.ArgumentParser):
                         help="in case of an update, mark features not present in the input file as obsolete")
     parser.add_argument("--full_attributes", action="store_true",
                         help="in case of an update, delete feature attributes not present in the input file")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="number of parallel processes, each importing the features on a subset of the sequences "
+                             "(default: 1; more than 1 cannot be combined with '--commit_interval', "
+                             "'--commit_per_sequence' or '--resume')")
+    add_checkpoint_arguments(parser)
+    parser.add_argument("--commit_per_sequence", action="store_true",
+                        help="commit the changes after the records of each sequence")
+    parser.add_argument("--staging", action="store_true",
+                        help="in case of an update, copy the input file into staging tables and merge them with the "
+                             "existing features in bulk (cannot be combined with '--jobs', '--commit_interval', "
+                             "'--commit_per_sequence' or '--resume')")
+    parser.add_argument("--skip_unchanged", action="store_true",
+                        help="in case of an update, skip records that are unchanged since the previous import, "
+                             "according to a checksum stored for each feature")
 
 
 def add_import_fasta_arguments(parser: argparse.ArgumentParser):
@@ -483,6 +497,7 @@ def add_import_fasta_arguments(parser: argparse.ArgumentParser):
                         help="abbreviation/short name of the organism")
     parser.add_argument("-t", "--sequence_type", choices=["chromosome", "supercontig", "contig", "region"],
                         default="region", help="type of the sequences (default: region)")
+    add_checkpoint_arguments(parser)
 
 
 def add_import_gaf_arguments(parser: argparse.ArgumentParser):
@@ -493,6 +508,16 @@ def add_import_gaf_arguments(parser: argparse.ArgumentParser):
     parser.add_argument("-L", "--annotation_level", choices=["default", "gene", "transcript", "protein"],
                         default="default", help="level to which GO terms are related in the database (default: "
                                                 "same level as in the input file)")
+    add_checkpoint_arguments(parser)
+
+
+def add_checkpoint_arguments(parser: argparse.ArgumentParser):
+    """Defines formal arguments for committing the changes of an import in batches"""
+    parser.add_argument("--commit_interval", type=int, default=0,
+                        help="commit the changes after every N records, and record the progress in a checkpoint file "
+                             "(default: commit once at the end)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip the records committed in a previous run, as recorded in the checkpoint file")
 
 
 def add_export_arguments(parser: argparse.ArgumentParser):
@@ -527,6 +552,7 @@ def add_export_fasta_arguments(parser: argparse.ArgumentParser):
                         help="type of the sequences to be exported")
     parser.add_argument("-r", "--release", help="name of the FASTA release")
     parser.add_argument("--include_obsolete", action="store_true", help="export all features, including obsoletes")
+    add_region_arguments(parser)
 
 
 def add_export_gff_arguments(parser: argparse.ArgumentParser):
@@ -537,6 +563,24 @@ def add_export_gff_arguments(parser: argparse.ArgumentParser):
     parser.add_argument("--export_fasta", action="store_true", help="export FASTA sequences along with annotations")
     parser.add_argument("--fasta_file", help="FASTA output file with sequences (default: paste to end of GFF file)")
     parser.add_argument("--include_obsolete", action="store_true", help="export all features, including obsoletes")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="number of parallel processes, each exporting the features on one sequence at a time "
+                             "(default: 1)")
+    parser.add_argument("--previous_file",
+                        help="GFF file of a previous export; only the records of features changed since then are "
+                             "re-created, all others are copied (requires the audit schema and '--since'; cannot be "
+                             "combined with '--jobs' or '--region')")
+    parser.add_argument("--since",
+                        help="time of the previous export, e.g. '2019-01-31 12:00'; an earlier time is safe "
+                             "(requires '--previous_file')")
+    add_region_arguments(parser)
+
+
+def add_region_arguments(parser: argparse.ArgumentParser):
+    """Defines formal arguments restricting an export to genomic regions"""
+    parser.add_argument("--region", type=utils.parse_region, action="append", dest="regions",
+                        help="export only the region 'seqid:start-end' (1-based, inclusive) or the entire sequence "
+                             "'seqid'; can be given several times (default: export all sequences)")
 
 
 def add_export_gaf_arguments(parser: argparse.ArgumentParser):
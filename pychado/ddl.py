@@ -76,6 +76,14 @@ class DDLClient(DatabaseAccessClient):
             functions_condition.bindparams(schema=schema, function=function_name)).select()
         return self.connection.execute(exists_query).scalar()
 
+    def index_exists(self, schema: str, index_name: str) -> bool:
+        """Checks if an index with a given name exists in a given database schema"""
+        indexes_table = sqlalchemy.text("pg_catalog.pg_indexes")
+        indexes_condition = sqlalchemy.text("schemaname=:schema AND indexname=:index_name")
+        exists_query = sqlalchemy.exists().select_from(indexes_table).where(
+            indexes_condition.bindparams(schema=schema, index_name=index_name)).select()
+        return self.connection.execute(exists_query).scalar()
+
     def role_exists(self, role_name: str) -> bool:
         """Checks if a given role/user exists in a database"""
         roles_table = sqlalchemy.text("pg_catalog.pg_roles")
@@ -184,6 +192,17 @@ class SchemaSetupClient(DDLClient):
         self.metadata.create_all(self.engine, tables=self.metadata.sorted_tables)
         print("Created missing tables in schema '" + self.schema + "'.")
 
+        # Create indexes added to tables that already existed
+        self.create_missing_indexes()
+        print("Created missing indexes in schema '" + self.schema + "'.")
+
+    def create_missing_indexes(self) -> None:
+        """Creates the indexes of all tables in the schema that don't exist yet"""
+        for table in self.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda idx: idx.name):
+                if not self.index_exists(self.schema, index.name):
+                    index.create(self.engine)
+
     def create_schema(self) -> None:
         """Creates a schema in the target database, if it doesn't exist yet"""
         if not self.schema_exists(self.schema):
@@ -259,6 +278,10 @@ class AuditSchemaSetupClient(SchemaSetupClient):
         self.metadata.create_all(self.engine, tables=([self.master_table] + audit_tables))
         print("Created missing tables in schema '" + self.schema + "'.")
 
+        # Create indexes added to tables that already existed
+        self.create_missing_indexes()
+        print("Created missing indexes in schema '" + self.schema + "'.")
+
         # Set up inheritance
         self.setup_inheritance(self.master_table.name, audit_tablenames)
         print("Set up table inheritance in schema '" + self.schema + "'.")
@@ -293,6 +316,9 @@ class AuditSchemaSetupClient(SchemaSetupClient):
                                                server_default=data_column.server_default)
                 audit_table.append_column(new_column)
 
+            # Index the time of the changes, so that recent changes can be found quickly
+            sqlalchemy.Index(data_table.name + "_time_idx", audit_table.c.time)
+
             # Add table to list
             audit_tables.append(audit_table)
 
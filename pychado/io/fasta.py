@@ -1,7 +1,9 @@
 import os
 import urllib.parse
-from typing import Union, List
+from typing import Union, List, Dict, Tuple
+import sqlalchemy.orm
 from Bio import SeqIO, Seq
+from Bio.Data import IUPACData
 from . import iobase
 from .. import utils
 from ..orm import cv, organism, sequence
@@ -33,7 +35,7 @@ class FastaImportClient(iobase.ChadoClient):
             "sequence", ["contig", "supercontig", "chromosome", "region"])
         self._top_level_term = self._load_cvterm("top_level_seq")
 
-    def load(self, filename: str, organism_name: str, sequence_type: str):
+    def load(self, filename: str, organism_name: str, sequence_type: str, commit_interval=0, resume=False):
         """Import data from a FASTA file into a Chado database"""
 
         # Load dependencies
@@ -44,15 +46,28 @@ class FastaImportClient(iobase.ChadoClient):
         if not os.path.exists(filename):
             raise iobase.InputFileError("Input file '" + filename + "' does not exist.")
 
+        # Get the number of records committed in a previous run, if applicable
+        checkpoint_file = self._checkpoint_filename(filename)
+        committed_records = self._read_checkpoint(checkpoint_file) if resume else 0
+
         # Loop over all entries in the FASTA file
-        for record in SeqIO.parse(filename, "fasta"):
+        for record_number, record in enumerate(SeqIO.parse(filename, "fasta"), 1):
+
+            # Skip entries committed in a previous run
+            if record_number <= committed_records:
+                continue
 
             # Insert or update entries in the 'feature' table
             feature_entry = self._handle_sequence(record, default_organism, default_type)
             self._mark_as_top_level_sequence(feature_entry)
 
+            # Commit changes in regular intervals, if requested
+            if commit_interval and record_number % commit_interval == 0:
+                self._commit_checkpoint(checkpoint_file, record_number)
+
         # Commit changes
         self.session.commit()
+        self._remove_checkpoint(checkpoint_file)
 
     def _handle_sequence(self, fasta_record: SeqIO.SeqRecord, organism_entry: organism.Organism,
                          default_type_entry: cv.CvTerm) -> sequence.Feature:
@@ -74,16 +89,6 @@ class FastaImportClient(iobase.ChadoClient):
         feature_entry = self._handle_feature(new_feature_entry, organism_entry.abbreviation)
         return feature_entry
 
-    def _mark_as_top_level_sequence(self, feature_entry: sequence.Feature) -> sequence.FeatureProp:
-        """Inserts or updates an entry in the 'featureprop' table and returns it"""
-        existing_featureprops = self.query_all(sequence.FeatureProp, feature_id=feature_entry.feature_id)
-        new_featureprop_entry = sequence.FeatureProp(feature_id=feature_entry.feature_id,
-                                                     type_id=self._top_level_term.cvterm_id, value="true")
-        featureprop_entry = self._handle_featureprop(new_featureprop_entry, existing_featureprops,
-                                                     self._top_level_term.name, new_featureprop_entry.value,
-                                                     feature_entry.uniquename)
-        return featureprop_entry
-
     @staticmethod
     def _create_feature(fasta_record: SeqIO.SeqRecord, organism_id: int, type_id: int) -> sequence.Feature:
         """Creates a feature object from a FASTA record"""
@@ -102,67 +107,11 @@ class FastaImportClient(iobase.ChadoClient):
         return None
 
 
-class FastaExportClient(iobase.ChadoClient):
-    """Class for exporting genomic data from Chado to FASTA files"""
-
-    def __init__(self, uri: str, verbose=False, test_environment=False):
-        """Constructor"""
-
-        # Connect to database
-        self.test_environment = test_environment
-        if not self.test_environment:
-            super().__init__(uri, verbose)
-
-        # Load essentials
-        if not self.test_environment:
-            self._load_essentials()
-
-    def __del__(self):
-        """Destructor - disconnect from database"""
-        if not self.test_environment:
-            super().__del__()
-
-    def _load_essentials(self) -> None:
-        """Loads essential database entries"""
-        self._sequence_terms = self._load_terms_from_cv_dict(
-            "sequence", ["gene", "polypeptide"])
-        self._part_of_term = self._load_cvterm_from_cv("part_of", "relationship")
-        self._derives_from_term = self._load_cvterm_from_cv("derives_from", "sequence")
-        self._top_level_term = self._load_cvterm("top_level_seq")
-
-    def export(self, filename: str, organism_name: str, sequence_type: str, release: str,
-               include_obsolete_features=False):
-        """Exports sequences from Chado to a FASTA file"""
-
-        # Load dependencies and features of interest
-        organism_entry = self._load_organism(organism_name)
-        genome_version = self._extract_genome_version(organism_entry)
-        feature_entries = self._extract_features_by_type(organism_entry, sequence_type)
-        srcfeature_entries = self._extract_srcfeatures_by_type(organism_entry, sequence_type)
-        records = []
-
-        # Loop over all features of interest
-        for feature_entry in feature_entries:
-
-            # Get feature type
-            type_entry = self.query_first(cv.CvTerm, cvterm_id=feature_entry.type_id)
-
-            # Create FASTA record
-            residues = self._extract_residues_by_type(feature_entry, srcfeature_entries, sequence_type)
-            if self._are_residues_valid(residues, sequence_type) and \
-                    (include_obsolete_features or not feature_entry.is_obsolete):
-                record = self._create_fasta_record(feature_entry, organism_entry, type_entry, residues,
-                                                   genome_version, release)
-                records.append(record)
-
-        # Write all FASTA records to file
-        records.sort(key=self._sort_record_key)
-        SeqIO.write(records, filename, "fasta")
+class FastaClient(object):
+    """Helper class for FASTA-related operations"""
 
-    @staticmethod
-    def _sort_record_key(record: SeqIO.SeqRecord):
-        """Helper function for sorting records"""
-        return record.id
+    # Complementary nucleotides in IUPAC notation
+    _complementary_nucleotides = str.maketrans(IUPACData.ambiguous_dna_complement)
 
     def _create_fasta_record(self, feature_entry: sequence.Feature, organism_entry: organism.Organism,
                              type_entry: cv.CvTerm, residues: str, genome_version: str, release: str
@@ -173,37 +122,6 @@ class FastaExportClient(iobase.ChadoClient):
                                  description=attributes)
         return record
 
-    def _extract_srcfeatures_by_type(self, organism_entry: organism.Organism, sequence_type: str
-                                     ) -> List[sequence.Feature]:
-        """Extract features from the database"""
-        srcfeature_entries = []
-        if sequence_type == "genes":
-            srcfeature_entries = self.query_features_by_property_type(organism_entry.organism_id,
-                                                                      self._top_level_term.cvterm_id).all()
-        return srcfeature_entries
-
-    def _extract_features_by_type(self, organism_entry: organism.Organism, sequence_type: str
-                                  ) -> List[sequence.Feature]:
-        """Extract features from the database"""
-        if sequence_type == "proteins":
-            query = self.query_protein_features(organism_entry.organism_id, self._sequence_terms["gene"].cvterm_id,
-                                                self._part_of_term.cvterm_id, self._derives_from_term.cvterm_id)
-        elif sequence_type == "genes":
-            query = self.query_features_by_type(
-                organism_entry.organism_id, [self._sequence_terms["gene"].cvterm_id])
-        else:
-            query = self.query_features_by_property_type(organism_entry.organism_id, self._top_level_term.cvterm_id)
-        return query.all()
-
-    def _extract_residues_by_type(self, feature_entry: sequence.Feature, srcfeature_entries: List[sequence.Feature],
-                                  sequence_type: str) -> Union[None, str]:
-        """Extracts the sequence of nucleotides/amino acids of a feature"""
-        if sequence_type == "genes":
-            residues = self._extract_nucleotide_sequence(feature_entry, srcfeature_entries)
-        else:
-            residues = feature_entry.residues
-        return residues
-
     @staticmethod
     def _are_residues_valid(residues: str, sequence_type: str) -> bool:
         """Checks if the sequences of nucleotides/amino acids are composed of valid IUPAC codes"""
@@ -223,34 +141,10 @@ class FastaExportClient(iobase.ChadoClient):
                     return False
         return True
 
-    def _extract_nucleotide_sequence(self, feature_entry: sequence.Feature, srcfeature_entries: List[sequence.Feature]
-                                     ) -> Union[None, str]:
-        """Extracts the nucleotide sequence of a (gene) feature"""
-
-        # Get the entry from the 'featureloc' table
-        featureloc_entry = self.query_first(sequence.FeatureLoc,
-                                            feature_id=feature_entry.feature_id)        # type: sequence.FeatureLoc
-        if not featureloc_entry:
-            return None
-
-        # Get the entry from the 'feature' table
-        matching_entries = utils.filter_objects(
-            srcfeature_entries, feature_id=featureloc_entry.srcfeature_id)              # type: List[sequence.Feature]
-        if not matching_entries:
-            return None
-
-        # Extract the nucleotide sequence
-        matching_entry = matching_entries[0]
-        if len(matching_entry.residues) >= featureloc_entry.fmax + 1:
-            residues = matching_entry.residues[featureloc_entry.fmin:featureloc_entry.fmax].upper()
-        else:
-            residues = None
-
-        # Compute the complementary sequence, if necessary
-        if residues and featureloc_entry.strand < 0:
-            sequence_object = Seq.Seq(residues, alphabet=Seq.IUPAC.ambiguous_dna)
-            residues = str(sequence_object.reverse_complement())
-        return residues
+    @staticmethod
+    def _reverse_complement(residues: str) -> str:
+        """Computes the reverse complement of a sequence of nucleotides in IUPAC notation"""
+        return residues.translate(FastaClient._complementary_nucleotides)[::-1]
 
     def _extract_genome_version(self, organism_entry: organism.Organism) -> Union[None, str]:
         """Extracts the version of a genome from the database"""
@@ -313,3 +207,179 @@ class FastaExportClient(iobase.ChadoClient):
         release_name = urllib.parse.quote(release)
         release_pair = "=".join([release_key, release_name])
         return release_pair
+
+
+class FastaExportClient(iobase.ChadoClient, FastaClient):
+    """Class for exporting genomic data from Chado to FASTA files"""
+
+    def __init__(self, uri: str, verbose=False, test_environment=False):
+        """Constructor"""
+
+        # Connect to database
+        self.test_environment = test_environment
+        if self.test_environment:
+            self.printer = utils.VerbosePrinter(verbose)
+        else:
+            super().__init__(uri, verbose)
+
+        # Load essentials
+        if not self.test_environment:
+            self._load_essentials()
+
+    def __del__(self):
+        """Destructor - disconnect from database"""
+        if not self.test_environment:
+            super().__del__()
+
+    def _load_essentials(self) -> None:
+        """Loads essential database entries"""
+        self._sequence_terms = self._load_terms_from_cv_dict(
+            "sequence", ["gene", "polypeptide"])
+        self._part_of_term = self._load_cvterm_from_cv("part_of", "relationship")
+        self._derives_from_term = self._load_cvterm_from_cv("derives_from", "sequence")
+        self._top_level_term = self._load_cvterm("top_level_seq")
+
+    def export(self, filename: str, organism_name: str, sequence_type: str, release: str,
+               include_obsolete_features=False, regions: List[Tuple[str, int, int]] = None):
+        """Exports sequences from Chado to a FASTA file, or only those in given regions (seqid, start, end)"""
+
+        # Load dependencies and features of interest
+        organism_entry = self._load_organism(organism_name)
+        genome_version = self._extract_genome_version(organism_entry)
+        located_feature_ids = None
+        if regions:
+
+            # Restrict the export to the requested regions
+            sequence_regions = self.group_regions_by_sequence(regions)
+            chromosome_entries = self._extract_sequences_by_names(organism_entry, list(sequence_regions.keys()))
+            if sequence_type == "contigs":
+                self._export_sequence_regions(filename, organism_entry, chromosome_entries, sequence_regions,
+                                              genome_version, release, include_obsolete_features)
+                return
+            located_feature_ids = self.query_feature_ids_by_regions({
+                chromosome_entry.feature_id: sequence_regions[chromosome_entry.uniquename]
+                for chromosome_entry in chromosome_entries})
+        if sequence_type == "genes":
+            self._export_gene_sequences(filename, organism_entry, genome_version, release, include_obsolete_features,
+                                        located_feature_ids)
+            return
+        feature_entries = self._extract_features_by_type(organism_entry, sequence_type, located_feature_ids)
+        records = []
+
+        # Loop over all features of interest
+        for feature_entry in feature_entries:
+
+            # Get feature type
+            type_entry = self.query_first(cv.CvTerm, cvterm_id=feature_entry.type_id)
+
+            # Create FASTA record
+            residues = feature_entry.residues
+            if self._are_residues_valid(residues, sequence_type) and \
+                    (include_obsolete_features or not feature_entry.is_obsolete):
+                record = self._create_fasta_record(feature_entry, organism_entry, type_entry, residues,
+                                                   genome_version, release)
+                records.append(record)
+
+        # Write all FASTA records to file
+        records.sort(key=self._sort_record_key)
+        SeqIO.write(records, filename, "fasta")
+
+    @staticmethod
+    def _sort_record_key(record: SeqIO.SeqRecord):
+        """Helper function for sorting records"""
+        return record.id
+
+    def _export_sequence_regions(self, filename: str, organism_entry: organism.Organism,
+                                 chromosome_entries: List[sequence.Feature],
+                                 sequence_regions: Dict[str, List[Tuple[int, int]]], genome_version: str,
+                                 release: str, include_obsolete_features: bool) -> None:
+        """Exports given regions of top-level sequences to a FASTA file, with the residues extracted in the database"""
+        records = []
+        for chromosome_entry in chromosome_entries:
+            if chromosome_entry.is_obsolete and not include_obsolete_features:
+                continue
+            type_entry = self.query_first(cv.CvTerm, cvterm_id=chromosome_entry.type_id)
+            for start, end in sequence_regions[chromosome_entry.uniquename] or [(None, None)]:
+
+                # Create FASTA record for the sequence section, named 'seqid:start-end' in 1-based coordinates
+                residues = self.query_feature_residues(chromosome_entry.feature_id, start, end).scalar()
+                if not self._are_residues_valid(residues, "contigs"):
+                    continue
+                record = self._create_fasta_record(chromosome_entry, organism_entry, type_entry, residues,
+                                                   genome_version, release)
+                if start is not None:
+                    record.id = record.name = chromosome_entry.uniquename + ":" + str(start + 1) + "-" \
+                                              + str(start + len(residues))
+                records.append(record)
+
+        # Write all FASTA records to file
+        records.sort(key=self._sort_record_key)
+        SeqIO.write(records, filename, "fasta")
+
+    def _export_gene_sequences(self, filename: str, organism_entry: organism.Organism, genome_version: str,
+                               release: str, include_obsolete_features: bool,
+                               located_feature_ids: sqlalchemy.orm.Query = None) -> None:
+        """Exports the nucleotide sequences of genes to a FASTA file, or only those of genes with given IDs. The
+        residues of each top-level sequence are loaded once and cut into the sections spanned by the genes on it."""
+        gene_term = self._sequence_terms["gene"]
+        gene_ids = self.query_features_by_type(organism_entry.organism_id, [gene_term.cvterm_id])\
+            .with_entities(sequence.Feature.feature_id)
+        if located_feature_ids is not None:
+            gene_ids = gene_ids.filter(sequence.Feature.feature_id.in_(located_feature_ids))
+        chromosome_entries = self.query_features_by_property_type(organism_entry.organism_id,
+                                                                  self._top_level_term.cvterm_id).all()
+        records = []
+        exported_feature_ids = set()
+
+        # Loop over all top-level sequences and the genes located on them
+        for chromosome_entry in chromosome_entries:
+            chromosome_residues = None
+            for feature_entry, fmin, fmax, strand in self.query_feature_locations(
+                    gene_ids, chromosome_entry.feature_id):
+
+                # Only consider the first location of each gene, and check that the source sequence is long enough
+                if feature_entry.feature_id in exported_feature_ids:
+                    continue
+                exported_feature_ids.add(feature_entry.feature_id)
+                if chromosome_residues is None:
+                    chromosome_residues = (self.query_feature_residues(chromosome_entry.feature_id).scalar()
+                                           or "").upper()
+                if fmax > len(chromosome_residues):
+                    continue
+
+                # Create FASTA record, with the complementary sequence for genes on the reverse strand
+                residues = chromosome_residues[fmin:fmax]
+                if strand is not None and strand < 0:
+                    residues = self._reverse_complement(residues)
+                if self._are_residues_valid(residues, "genes") and \
+                        (include_obsolete_features or not feature_entry.is_obsolete):
+                    records.append(self._create_fasta_record(feature_entry, organism_entry, gene_term, residues,
+                                                             genome_version, release))
+
+        # Write all FASTA records to file
+        records.sort(key=self._sort_record_key)
+        SeqIO.write(records, filename, "fasta")
+
+    def _extract_sequences_by_names(self, organism_entry: organism.Organism, names: List[str]
+                                    ) -> List[sequence.Feature]:
+        """Extracts top-level sequences with given names from the database"""
+        chromosome_entries = self.query_features_by_property_type(organism_entry.organism_id,
+                                                                  self._top_level_term.cvterm_id)\
+            .filter(sequence.Feature.uniquename.in_(names)).all()
+        chromosome_names = [chromosome_entry.uniquename for chromosome_entry in chromosome_entries]
+        for name in names:
+            if name not in chromosome_names:
+                self.printer.print("WARNING: Sequence '" + name + "' not present in database.")
+        return chromosome_entries
+
+    def _extract_features_by_type(self, organism_entry: organism.Organism, sequence_type: str,
+                                  located_feature_ids: sqlalchemy.orm.Query = None) -> List[sequence.Feature]:
+        """Extract features from the database, or only those of genes with given IDs"""
+        if sequence_type == "proteins":
+            query = self.query_protein_features(organism_entry.organism_id, self._sequence_terms["gene"].cvterm_id,
+                                                self._part_of_term.cvterm_id, self._derives_from_term.cvterm_id,
+                                                located_feature_ids)
+        else:
+            query = self.query_features_by_property_type(organism_entry.organism_id, self._top_level_term.cvterm_id)
+        return query.options(sqlalchemy.orm.undefer("residues")).all()
+
@@ -17,6 +17,9 @@ class GAFClient(iobase.ChadoClient):
         else:
             super().__init__(uri, verbose)
 
+        # Cache entries of lookup tables that are referenced repeatedly in annotation files
+        self.enable_lookup_caches()
+
         # Load essentials
         if not self.test_environment:
             self._load_essentials()
@@ -225,22 +228,36 @@ class GAFClient(iobase.ChadoClient):
 class GAFImportClient(GAFClient):
     """Class for importing genomic data from GAF files into Chado"""
 
-    def load(self, filename: str, organism_name: str, annotation_level: str):
+    def load(self, filename: str, organism_name: str, annotation_level: str, commit_interval=0, resume=False):
         """Import data from a GAF file into a Chado database"""
 
         # Load dependencies
         default_organism = self._load_organism(organism_name)
         features_with_product = set()
 
+        # Get the number of records committed in a previous run, if applicable
+        checkpoint_file = self._checkpoint_filename(filename)
+        committed_records = self._read_checkpoint(checkpoint_file) if resume else 0
+
         # Loop over all records in the GAF file
         with open(filename) as f:
-            for gaf_record in GOA.gafiterator(f):
+            for record_number, gaf_record in enumerate(GOA.gafiterator(f), 1):
+
+                # Skip records committed in a previous run
+                if record_number <= committed_records:
+                    continue
 
                 # Import this record into the database
                 self._load_gaf_record(gaf_record, default_organism, annotation_level, features_with_product)
 
+                # Commit changes in regular intervals, if requested
+                if commit_interval and record_number % commit_interval == 0:
+                    self._commit_checkpoint(checkpoint_file, record_number)
+
         # Commit changes
         self.session.commit()
+        self._remove_checkpoint(checkpoint_file)
+        self._print_lookup_cache_statistics()
 
     def _load_gaf_record(self, gaf_record: dict, organism_entry: organism.Organism, annotation_level: str,
                          features_with_product: Set[str]) -> None:
@@ -331,24 +348,11 @@ class GAFImportClient(GAFClient):
         (db_authority, accession, version) = ontology.split_dbxref(ontology_term)
         publication = self._extract_primary_publication(gaf_record)
 
-        # Get entry from 'db' table
-        db_entry = self.query_first(general.Db, name=db_authority)
-        if not db_entry:
-            self.printer.print("WARNING: Ontology '" + db_authority + "' not present in database.")
-            return None
-
-        # Get entry from 'dbxref' table
-        dbxref_entry = self.query_first(general.DbxRef, db_id=db_entry.db_id, accession=accession)
-        if not dbxref_entry:
-            self.printer.print("WARNING: Ontology term '" + ontology_term + "' not present in database.")
-            return None
-
-        # Get entry from 'cvterm' table
-        cvterm_entry = self.query_first(cv.CvTerm, dbxref_id=dbxref_entry.dbxref_id)
-        if not cvterm_entry:
-            self.printer.print("WARNING: CV term for ontology term '" + ontology_term
-                               + "' not present in database.")
+        # Get the CV term from the terms of the ontology
+        resolved_term = self._resolve_ontology_term(db_authority, accession, ontology_term)
+        if not resolved_term:
             return None
+        (db_entry, cvterm_id, cvterm_name) = resolved_term
 
         # Insert/update entry in the 'pub' table
         if publication:
@@ -363,11 +367,11 @@ class GAFImportClient(GAFClient):
 
         # Insert/update entry in the 'feature_cvterm' table
         new_feature_cvterm_entry = sequence.FeatureCvTerm(feature_id=feature_entry.feature_id,
-                                                          cvterm_id=cvterm_entry.cvterm_id,
+                                                          cvterm_id=cvterm_id,
                                                           pub_id=pub_entry.pub_id,
                                                           is_not=("NOT" in gaf_record["Qualifier"]))
         feature_cvterm_entry = self._handle_feature_cvterm(new_feature_cvterm_entry, existing_feature_cvterms,
-                                                           cvterm_entry.name, feature_entry.uniquename)
+                                                           cvterm_name, feature_entry.uniquename)
         return feature_cvterm_entry
 
     def _handle_product_term(self, gaf_record: dict, feature_entry: sequence.Feature
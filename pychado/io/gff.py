@@ -1,7 +1,22 @@
+import io
 import os
+import re
+import zlib
+import json
+import heapq
+import shutil
+import hashlib
 import tempfile
-from typing import List, Dict, Union
+import itertools
+import collections
+import multiprocessing
+import urllib.parse
+from typing import List, Dict, Set, Tuple, Union, Iterator, Iterable, Container, Callable
+import sqlalchemy
 import gffutils
+import gffutils.feature
+from Bio import SeqIO, Seq
+from Bio.SeqIO.FastaIO import SimpleFastaParser
 from . import iobase, ontology, fasta
 from .. import utils
 from ..orm import general, cv, organism, pub, sequence
@@ -17,6 +32,197 @@ class ArtemisGffAttribute:
         self.dict_params = {}                # type: Dict[str, Union[str, int, float, bool]]
 
 
+class GFFReader(object):
+    """Helper class for reading the records and sequences of a GFF3 file one by one"""
+
+    def __init__(self, filename: str, max_pending_records=10000, seqid_filter: Callable[[str], bool] = None):
+        """Initializes the object"""
+        self.filename = filename
+        self.max_pending_records = max_pending_records
+        self.seqid_filter = seqid_filter
+        self.directives = []                                        # type: List[str]
+        self.has_fasta = False
+        self.sequence_record_ids = set()                            # type: Set[str]
+        self._file_handle = None
+        self._read_ids = set()                                      # type: Set[str]
+        self._pending_records = collections.OrderedDict()           # type: Dict[str, gffutils.Feature]
+        self._missing_references = {}                               # type: Dict[str, Set[str]]
+        self._waiting_records = {}                                  # type: Dict[str, List[str]]
+        self._autoincrements = collections.defaultdict(int)         # type: Dict[str, int]
+
+    @staticmethod
+    def _reference_attributes() -> List[str]:
+        """Lists attributes referencing other features in the file"""
+        return ["parent", "derives_from"]
+
+    def records(self) -> Iterator[gffutils.Feature]:
+        """Yields the records of the GFF file in the order of the file. Records referencing features further down in
+        the file are held back until these features have been read."""
+        self._file_handle = utils.open_file_read(self.filename)
+        try:
+            for line in self._file_handle:
+                if line.startswith("##FASTA") or line.startswith(">"):
+                    self.has_fasta = True
+                    break
+                elif line.startswith("##"):
+                    directive = line.rstrip("\n\r")[2:]
+                    self.directives.append(directive)
+                    if directive == "#":
+
+                        # All forward references have been resolved at this point
+                        yield from self._release_pending_records(0)
+                elif line.startswith("#") or not line.strip():
+                    continue
+                elif self.seqid_filter and not self.seqid_filter(line.split("\t", 1)[0]):
+                    yield from self._skip_line(line)
+                else:
+                    yield from self._handle_record(self._parse_line(line))
+            yield from self._release_pending_records(0)
+        finally:
+            self.close()
+
+    def sequences(self) -> Iterator[SeqIO.SeqRecord]:
+        """Yields the sequences of the FASTA section of the GFF file. The file is read in a separate pass, so that the
+        sequences can be imported before the records that are located on them."""
+        file_handle = utils.open_file_read(self.filename)
+        try:
+            for line in file_handle:
+                if line.startswith("##FASTA") or line.startswith(">"):
+                    self.has_fasta = True
+                    lines = itertools.chain([line], file_handle) if line.startswith(">") else file_handle
+                    break
+                elif not line.startswith("#"):
+                    self._register_sequence_record(line)
+            else:
+                return
+            for title, residues in SimpleFastaParser(lines):
+                identifier = title.split(None, 1)[0] if title else ""
+                yield SeqIO.SeqRecord(Seq.Seq(residues), id=identifier, name=identifier, description=title)
+        finally:
+            utils.close(file_handle)
+
+    def _register_sequence_record(self, line: str) -> None:
+        """Registers the ID of a line describing a sequence itself, i.e. a record located on itself"""
+        fields = line.rstrip("\n\r").split("\t")
+        if len(fields) > 8 and "ID=" + fields[0] in fields[8] \
+                and re.search(r"(?:^|;)\s*ID=" + re.escape(fields[0]) + r"\s*(?:;|$)", fields[8]):
+            self.sequence_record_ids.add(urllib.parse.unquote(fields[0]))
+
+    def close(self) -> None:
+        """Closes the GFF file, if it is still open for reading the records"""
+        if self._file_handle:
+            utils.close(self._file_handle)
+            self._file_handle = None
+
+    def _parse_line(self, line: str) -> gffutils.Feature:
+        """Creates a GFF record from a line of the file, and assigns an ID to it"""
+        record = gffutils.feature.feature_from_line(line, keep_order=True)
+        if "ID" in record.attributes:
+            record.id = record.attributes["ID"][0]
+        else:
+            self._autoincrements[record.featuretype] += 1
+            record.id = record.featuretype + "_" + str(self._autoincrements[record.featuretype])
+        if record.id in self._read_ids:
+            raise iobase.InputFileError("GFF file '" + self.filename + "' contains duplicate ID '" + record.id + "'")
+        self._read_ids.add(record.id)
+        return record
+
+    def _skip_line(self, line: str) -> Iterator[gffutils.Feature]:
+        """Registers the ID of a line excluded by the filter, and yields all held back records referencing it"""
+        fields = line.rstrip("\n\r").split("\t")
+        id_match = re.search(r"(?:^|;)\s*ID=([^;,]*)", fields[8]) if len(fields) > 8 else None
+        if id_match:
+            record_id = urllib.parse.unquote(id_match.group(1))
+        else:
+            featuretype = fields[2] if len(fields) > 2 else ""
+            self._autoincrements[featuretype] += 1
+            record_id = featuretype + "_" + str(self._autoincrements[featuretype])
+        if record_id in self._read_ids:
+            raise iobase.InputFileError("GFF file '" + self.filename + "' contains duplicate ID '" + record_id + "'")
+        self._read_ids.add(record_id)
+        for resolved_record in self._resolve_references(record_id):
+            yield from self._release_record(resolved_record)
+
+    def _handle_record(self, record: gffutils.Feature) -> Iterator[gffutils.Feature]:
+        """Yields a record, or holds it back if it references features not yet yielded"""
+        missing_references = set()
+        for key, values in record.attributes.items():
+            if key.lower() in self._reference_attributes():
+                for value in values:
+                    if value not in self._read_ids or value in self._pending_records:
+                        missing_references.add(value)
+
+        if missing_references:
+            self._pending_records[record.id] = record
+            self._missing_references[record.id] = missing_references
+            for reference in missing_references:
+                self._waiting_records.setdefault(reference, []).append(record.id)
+            yield from self._release_pending_records(self.max_pending_records)
+        else:
+            yield from self._release_record(record)
+
+    def _release_record(self, record: gffutils.Feature) -> Iterator[gffutils.Feature]:
+        """Yields a record, followed by all held back records whose references are thereby resolved"""
+        queue = collections.deque([record])
+        while queue:
+            current_record = queue.popleft()
+            self._pending_records.pop(current_record.id, None)
+            self._missing_references.pop(current_record.id, None)
+            yield current_record
+            queue.extend(self._resolve_references(current_record.id))
+
+    def _resolve_references(self, record_id: str) -> List[gffutils.Feature]:
+        """Returns the held back records whose last missing reference is the record with a given ID"""
+        resolved_records = []
+        for waiting_id in self._waiting_records.pop(record_id, []):
+            if waiting_id not in self._missing_references:
+                continue
+            self._missing_references[waiting_id].discard(record_id)
+            if not self._missing_references[waiting_id]:
+                resolved_records.append(self._pending_records[waiting_id])
+        return resolved_records
+
+    def _release_pending_records(self, max_remaining: int) -> Iterator[gffutils.Feature]:
+        """Yields held back records in the order of the file, until only a given number is left"""
+        while len(self._pending_records) > max_remaining:
+            oldest_record = next(iter(self._pending_records.values()))
+            yield from self._release_record(oldest_record)
+
+
+class GFFRecord(object):
+    """Helper class for assembling the lines of exported GFF3 files, escaping attribute values in the same way as
+    gffutils"""
+
+    __slots__ = ("seqid", "source", "featuretype", "start", "end", "score", "strand", "frame", "attributes")
+
+    # Characters that are percent-encoded in attribute values
+    _escaped_characters = str.maketrans({character: "%{:02X}".format(ord(character))
+                                         for character in "\t\n\r%;=&," + "".join(map(chr, range(32))) + chr(127)})
+
+    def __init__(self, seqid=".", source=".", featuretype=".", start: int = None, end: int = None, score=".",
+                 strand=".", frame="."):
+        """Initializes the object"""
+        self.seqid = seqid                          # type: str
+        self.source = source                        # type: str
+        self.featuretype = featuretype              # type: str
+        self.start = start                          # type: Union[None, int]
+        self.end = end                              # type: Union[None, int]
+        self.score = score                          # type: str
+        self.strand = strand                        # type: str
+        self.frame = frame                          # type: str
+        self.attributes = {}                        # type: Dict[str, List[str]]
+
+    def __str__(self) -> str:
+        """Returns the GFF line of the record, with attributes in the order in which they were added"""
+        parts = []
+        for key, values in self.attributes.items():
+            value = ",".join([value.translate(self._escaped_characters) for value in values])
+            parts.append(key + "=" + value if value else key)
+        return "\t".join([self.seqid, self.source, self.featuretype,
+                          "." if self.start is None else str(self.start), "." if self.end is None else str(self.end),
+                          self.score, self.strand, self.frame, ";".join(parts)])
+
+
 class GFFClient(object):
     """Helper class for GFF-related operations"""
 
@@ -119,8 +325,57 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         else:
             super().__init__(self.uri, self.verbose)
 
-        # Create array for temporary SQLite databases
-        self._sqlite_databases = []
+        # Cache entries of lookup tables that are referenced repeatedly in annotation files
+        self.enable_lookup_caches()
+
+        # Create index of existing features, keyed by uniquename
+        self._feature_index = {}                        # type: Dict[str, Tuple[int, int, bool]]
+
+        # Create containers for features whose entries are removed from the session in regular intervals
+        self._processed_feature_ids = []                # type: List[int]
+        self.release_interval = 10000
+
+        # Create dictionaries for existing entries associated with features, keyed by feature_id. These are loaded for
+        # one window of a sequence at a time, and for features located elsewhere individually.
+        self.prefetch_window_size = 10000
+        self.prefetch_limit = 10000
+        self._prefetched_windows = set()                # type: Set[Tuple[str, int]]
+        self._prefetched_feature_ids = set()            # type: Set[int]
+        self._prefetched_featureprops = {}              # type: Dict[int, List[sequence.FeatureProp]]
+        self._prefetched_feature_synonyms = {}          # type: Dict[int, List[sequence.FeatureSynonym]]
+        self._prefetched_feature_dbxrefs = {}           # type: Dict[int, List[sequence.FeatureDbxRef]]
+        self._prefetched_feature_cvterms = {}           # type: Dict[int, List[sequence.FeatureCvTerm]]
+        self._prefetched_feature_pubs = {}              # type: Dict[int, List[sequence.FeaturePub]]
+        self._prefetched_feature_relationships = {}     # type: Dict[int, List[sequence.FeatureRelationship]]
+
+        # Create buffers for entries to be copied into the database in bulk during a fresh load, keyed by table
+        self._copy_buffers = {}                         # type: Dict[type, list]
+        self._reserved_primary_keys = {}                # type: Dict[type, List[int]]
+        self._buffered_features = {}                    # type: Dict[int, sequence.Feature]
+        self._buffered_featurelocs = {}                 # type: Dict[int, sequence.FeatureLoc]
+        self._buffer_entries = True
+
+        # Create a container for features inserted during this import that do not have a location yet, so that the
+        # database need not be queried for it
+        self._unlocated_new_feature_ids = set()         # type: Set[int]
+
+        # Create a dictionary for the checksums of the GFF records imported previously, keyed by feature_id
+        self._record_checksums = {}                     # type: Dict[int, str]
+
+        # Create containers for feature locations on sequences that have not been loaded yet
+        self._deferred_locations = {}                   # type: Dict[str, List[Tuple[str, sequence.FeatureLoc]]]
+        self._deferred_featurelocs = {}                 # type: Dict[int, sequence.FeatureLoc]
+        self._postponed_commit_reported = False
+
+        # Create a container for relationships with features imported by other processes, if running in parallel
+        self._unresolved_relationships = None           # type: Union[None, List[Tuple[str, str, str]]]
+
+        # Create a container for the locations of the transcripts in the input file, keyed by uniquename, from which
+        # the associated proteins are derived
+        self._transcript_locations = {}                 # type: Dict[str, Tuple[int, int, Union[None, int]]]
+
+        # Create buffers for the staging tables of an update merged in bulk, keyed by table name
+        self._staging_buffers = {}                      # type: Dict[str, io.StringIO]
 
         # Load essential database entries
         if not self.test_environment:
@@ -131,6 +386,7 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         self.force_purge = False
         self.full_genome = False
         self.full_attributes = False
+        self.skip_unchanged = False
 
     def __del__(self):
         """Destructor"""
@@ -139,11 +395,6 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         if not self.test_environment:
             super().__del__()
 
-        # Delete temporary SQLite database
-        for database in self._sqlite_databases:
-            if os.path.exists(database):
-                os.remove(database)
-
     def _load_essentials(self) -> None:
         """Loads essential database entries"""
 
@@ -165,12 +416,17 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
 
         self._sequence_terms = self._load_terms_from_cv_dict(
             "sequence", ["gene", "intron", "exon", "CDS", "mRNA", "chromosome"])
+        self._top_level_term = self._load_cvterm("top_level_seq")
         self._default_pub = self._load_pub("null")
 
         self._go_db = self._load_db("GO")
 
+        # Checksums of GFF records are not stored in databases set up without the corresponding CV term
+        self._checksum_term = self.query_first(cv.CvTerm, name="gff_checksum")
+
     def load(self, filename: str, organism_name: str, fasta_filename: str, sequence_type: str, fresh_load=False,
-             force_purge=False, full_genome=False, full_attributes=False):
+             force_purge=False, full_genome=False, full_attributes=False, jobs=1, commit_interval=0,
+             commit_per_sequence=False, resume=False, staging=False, skip_unchanged=False):
         """Import data from a GFF3 file into a Chado database"""
 
         # Update global options
@@ -178,100 +434,990 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         self.force_purge = force_purge
         self.full_genome = full_genome
         self.full_attributes = full_attributes
+        self.skip_unchanged = skip_unchanged
 
         # Check for file existence
         if not os.path.exists(filename):
             raise iobase.InputFileError("Input file '" + filename + "' does not exist.")
+        if fasta_filename and not os.path.exists(fasta_filename):
+            raise iobase.InputFileError("Input file '" + fasta_filename + "' does not exist.")
 
-        # Remove existing database entries, if applicable
+        # Create the CV term for the checksums of GFF records in databases set up without it, if required
+        if self.skip_unchanged and not self._checksum_term:
+            self._checksum_term = self._create_checksum_term()
+            self.session.commit()
+
+        # Get the number of records committed in a previous run, if applicable
+        checkpoint_file = self._checkpoint_filename(filename)
+        committed_records = self._read_checkpoint(checkpoint_file) if resume else 0
+
+        # Remove existing database entries, if applicable. Entries committed in a previous run are kept.
         default_organism = self._load_organism(organism_name)
-        self._handle_existing_features(default_organism)
+        if not committed_records:
+            self._handle_existing_features(default_organism)
+
+        # Merge an update with the existing features in bulk via staging tables, if requested
+        if staging and not self.fresh_load:
+            self._load_with_staging_tables(filename, default_organism, fasta_filename, sequence_type)
+            return
 
-        # Import FASTA sequences, if present
-        self._import_fasta(filename, fasta_filename, organism_name, sequence_type)
+        # Distribute the import of the features over several processes, if requested
+        if jobs > 1:
+            self._load_in_parallel(filename, organism_name, fasta_filename, sequence_type, jobs)
+            return
 
-        # Create temporary SQLite database
-        gff_db = self._create_sqlite_db(filename)
+        # Load an index of all features of this organism present in the database
+        self._feature_index = self._load_feature_index(default_organism)
+        self._record_checksums = self._load_record_checksums(default_organism)
 
         # Initiate global containers
-        all_feature_entries = {}
+        all_feature_ids = {}
+        skipped_records = 0
+
+        # Import sequences from a separate FASTA file or from the FASTA section of the GFF file, if present
+        gff_reader = GFFReader(filename)
+        self._import_gff_sequences(gff_reader, fasta_filename, default_organism, sequence_type)
 
         # Loop over all entries in the gff file
-        for gff_record in gff_db.all_features():
+        uncommitted_records = 0
+        previous_seqid = None
+        for record_number, gff_record in enumerate(gff_reader.records(), 1):
+
+            # Skip records committed in a previous run
+            if record_number <= committed_records:
+                self._skip_gff_record(gff_record, all_feature_ids)
+                continue
+
+            # Skip records that are unchanged since the previous import, if requested
+            if self.skip_unchanged and self._is_unchanged_gff_record(gff_record):
+                self._skip_gff_record(gff_record, all_feature_ids)
+                skipped_records += 1
+                continue
+
+            # Commit changes for the previous sequence, if requested
+            if commit_per_sequence and uncommitted_records and gff_record.seqid != previous_seqid:
+                if self._commit_gff_checkpoint(checkpoint_file, record_number - 1):
+                    uncommitted_records = 0
+            previous_seqid = gff_record.seqid
 
             # Insert, update or delete entries in various tables
-            self._insert_gff_record_into_database(gff_record, default_organism, all_feature_entries)
+            self._insert_gff_record_into_database(gff_record, default_organism, all_feature_ids)
+            uncommitted_records += 1
+
+            # Remove processed entries from the session in regular intervals
+            if record_number % self.release_interval == 0:
+                self._release_processed_features()
+
+            # Commit changes in regular intervals, if requested
+            if commit_interval and uncommitted_records >= commit_interval:
+                if self._commit_gff_checkpoint(checkpoint_file, record_number):
+                    uncommitted_records = 0
+        self._transcript_locations.clear()
+        self._handle_unresolved_locations()
 
         # Mark obsolete features
         if self.full_genome and not self.fresh_load:
-            top_level_entries = self._extract_gff_sequence_names(gff_db)
-            self._mark_obsolete_features(default_organism, all_feature_entries, top_level_entries)
+            top_level_entries = self._extract_gff_sequence_names(gff_reader.directives)
+            self._mark_obsolete_features(default_organism, all_feature_ids, top_level_entries)
+
+        # Insert buffered entries into the database
+        self._copy_buffered_entries(attach=False)
 
         # Commit changes
         self.session.commit()
+        self._remove_checkpoint(checkpoint_file)
+        if self.skip_unchanged:
+            self.printer.print("Skipped " + str(skipped_records) + " unchanged records")
+        self._print_lookup_cache_statistics()
+        self._print_peak_memory_usage()
+
+    def _skip_gff_record(self, gff_record: gffutils.Feature,
+                         all_feature_ids: Dict[str, int]) -> None:
+        """Registers the features of a GFF record that was imported in a previous run, without loading them again"""
+        if gff_record.id in self._feature_index:
+            all_feature_ids[gff_record.id] = self._feature_index[gff_record.id][0]
+        protein_source_id = self._extract_protein_source_id(gff_record)
+        if protein_source_id in self._feature_index:
+            all_feature_ids[protein_source_id] = self._feature_index[protein_source_id][0]
+        self._register_transcript_location(gff_record)
+
+    def _create_checksum_term(self) -> cv.CvTerm:
+        """Inserts the CV term for the checksums of GFF records, as imported with the essentials, and returns it"""
+        self.printer.print("WARNING: CV term 'gff_checksum' not present in database. It is inserted now, so that "
+                           "unchanged records can be skipped from the next import onwards.")
+        misc_db = self._handle_db(general.Db(name="genedb_misc"))
+        misc_cv = self._handle_cv(cv.Cv(name="genedb_misc"))
+        dbxref = self._handle_dbxref(general.DbxRef(db_id=misc_db.db_id, accession="gff_checksum"), misc_db.name)
+        return self._handle_cvterm(cv.CvTerm(cv_id=misc_cv.cv_id, dbxref_id=dbxref.dbxref_id, name="gff_checksum"),
+                                   misc_cv.name)
+
+    def _load_record_checksums(self, organism_entry: organism.Organism) -> Dict[int, str]:
+        """Returns the checksums of the GFF records imported previously for the features of a given organism, keyed by
+        feature_id"""
+        if not self._checksum_term:
+            return {}
+        return dict(self.query_featureprop_values_by_type_and_organism(organism_entry.organism_id,
+                                                                       self._checksum_term.cvterm_id))
+
+    def _gff_record_checksum(self, gff_record: gffutils.Feature) -> str:
+        """Computes a checksum of the normalized content of a GFF record. The checksum also covers the option
+        'full_attributes', as the database entries of an imported record only match the record if it is set."""
+        content = [gff_record.seqid, gff_record.source, gff_record.featuretype, gff_record.start, gff_record.end,
+                   gff_record.score, gff_record.strand, gff_record.frame, sorted(gff_record.attributes.items()),
+                   self.full_attributes]
+        return hashlib.md5(json.dumps(content).encode()).hexdigest()
+
+    def _is_unchanged_gff_record(self, gff_record: gffutils.Feature) -> bool:
+        """Checks if a GFF record is identical to the one imported previously for the same feature"""
+        if gff_record.id not in self._feature_index:
+            return False
+        (feature_id, _, is_obsolete) = self._feature_index[gff_record.id]
+        return not is_obsolete and self._record_checksums.get(feature_id) == self._gff_record_checksum(gff_record)
+
+    def _has_unresolved_references(self, gff_record: gffutils.Feature) -> bool:
+        """Checks if a GFF record refers to parent features not present in the database. (Missing sequences are handled
+        together with the deferred locations.)"""
+        return any(parent not in self._feature_index
+                   for parents in self._extract_gff_relationships(gff_record).values() for parent in parents)
+
+    def _handle_record_checksum(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature) -> None:
+        """Inserts, updates or deletes the entry in the 'featureprop' table holding the checksum of the GFF record of a
+        feature. Records with unresolved references get no checksum, so that they are imported again."""
+        if not self._checksum_term:
+            return
+
+        # Check if the checksum has changed
+        feature_id = feature_entry.feature_id
+        existing_checksum = self._record_checksums.get(feature_id)
+        checksum = None if self._has_unresolved_references(gff_record) else self._gff_record_checksum(gff_record)
+        if checksum == existing_checksum:
+            return
+
+        # Insert a new entry
+        if existing_checksum is None:
+            self.add_and_flush(sequence.FeatureProp(feature_id=feature_id, type_id=self._checksum_term.cvterm_id,
+                                                    value=checksum))
+            self._record_checksums[feature_id] = checksum
+            return
+
+        # Update or delete the existing entry, which needs to be present in the database
+        if self._copy_buffers:
+            self._copy_buffered_entries(attach=False)
+        existing_entry_query = self.query_table(sequence.FeatureProp, feature_id=feature_id,
+                                                type_id=self._checksum_term.cvterm_id)
+        if checksum is None:
+            existing_entry_query.delete(synchronize_session=False)
+            del self._record_checksums[feature_id]
+        else:
+            existing_entry_query.update({"value": checksum}, synchronize_session=False)
+            self._record_checksums[feature_id] = checksum
+
+    def _delete_record_checksums(self, feature_ids: List[int]) -> None:
+        """Deletes the entries in the 'featureprop' table holding the checksums of the GFF records of given features"""
+        feature_ids = [feature_id for feature_id in feature_ids if feature_id in self._record_checksums]
+        if not feature_ids:
+            return
+        if self._copy_buffers:
+            self._copy_buffered_entries(attach=False)
+        self.query_table(sequence.FeatureProp, type_id=self._checksum_term.cvterm_id)\
+            .filter(sequence.FeatureProp.feature_id.in_(feature_ids)).delete(synchronize_session=False)
+        for feature_id in feature_ids:
+            del self._record_checksums[feature_id]
+
+    def _commit_gff_checkpoint(self, checkpoint_file: str, committed_records: int) -> bool:
+        """Commits the changes made so far and records the progress in a checkpoint file. The commit is postponed
+        while feature locations are waiting for their sequence, as these would be lost on resuming."""
+        if self._deferred_locations:
+            if not self._postponed_commit_reported:
+                self.printer.print("WARNING: Commits are postponed while feature locations are waiting for "
+                                   + str(len(self._deferred_locations)) + " sequence(s) not present in the database")
+                self._postponed_commit_reported = True
+            return False
+        self._copy_buffered_entries(attach=False)
+        self._commit_checkpoint(checkpoint_file, committed_records)
+        return True
+
+    def _load_with_staging_tables(self, filename: str, organism_entry: organism.Organism, fasta_filename: str,
+                                  sequence_type: str) -> None:
+        """Imports an update from a GFF3 file by copying the records into staging tables, which are merged with the
+        existing entries of various tables in set-based SQL statements"""
+
+        # Load an index of all features of this organism present in the database
+        self._feature_index = self._load_feature_index(organism_entry)
+        self._record_checksums = self._load_record_checksums(organism_entry)
+
+        # Import sequences from a separate FASTA file, if present
+        if fasta_filename:
+            self._import_sequences(SeqIO.parse(fasta_filename, "fasta"), organism_entry, sequence_type, set())
+
+        # Write all entries in the gff file into the buffers for the staging tables
+        all_feature_names = set()
+        skipped_feature_ids = {}
+        skipped_records = 0
+        gff_reader = GFFReader(filename)
+        positions = itertools.count(1)
+        for gff_record in gff_reader.records():
+
+            # Skip records that are unchanged since the previous import, if requested
+            if self.skip_unchanged and self._is_unchanged_gff_record(gff_record):
+                self._skip_gff_record(gff_record, skipped_feature_ids)
+                skipped_records += 1
+                continue
+            self._stage_gff_record(gff_record, organism_entry, positions, all_feature_names)
+        self._transcript_locations.clear()
+        all_feature_names.update(skipped_feature_ids)
+
+        # Copy the buffers into temporary staging tables
+        self.session.flush()
+        for table_name, column_definitions in self._staging_tables().items():
+            buffer = self._staging_buffers.pop(table_name, io.StringIO())
+            self.copy_buffer_into_temporary_table(table_name, column_definitions, buffer)
 
-    def _import_fasta(self, gff_file: str, fasta_file: str, organism_name: str, sequence_type: str) -> None:
-        """Imports sequences from a FASTA file into the Chado database"""
+        # Insert/update entries in the 'feature' table
+        reports = self._merge_staged_features(organism_entry)
+        self.session.expire_all()
+        self._feature_index = self._load_feature_index(organism_entry)
 
-        # Check if the GFF file contains FASTA sequences
-        fasta_is_temporary = False
-        if self._has_fasta(gff_file):
-            if fasta_file:
+        # Import sequences from the FASTA section of the GFF file, if present
+        if gff_reader.has_fasta:
+            if fasta_filename:
 
                 # Error message - only one file with FASTA is permitted
                 raise iobase.InputFileError("You cannot provide a GFF file with FASTA sequences "
                                             "plus a separate FASTA file.")
-            else:
+            self._import_sequences(gff_reader.sequences(), organism_entry, sequence_type, all_feature_names)
+        self.session.flush()
+
+        # Insert/update/delete entries connected to the staged features in various tables
+        reports.extend(self._merge_staged_featurelocs(organism_entry))
+        reports.extend(self._merge_staged_feature_synonyms())
+        reports.extend(self._merge_staged_featureprops())
+        reports.extend(self._merge_staged_feature_dbxrefs())
+        reports.extend(self._merge_staged_feature_cvterms())
+        reports.extend(self._merge_staged_feature_pubs())
+        reports.extend(self._merge_staged_feature_relationships(organism_entry))
+        self._merge_staged_record_checksums()
+
+        # Report the changes in the order of the records in the input file
+        for _, _, message in sorted(reports, key=lambda report: report[:2]):
+            self.printer.print(message)
 
-                # Create a FASTA file containing the sequences in the GFF file
-                (fasta_handle, fasta_file) = tempfile.mkstemp(dir=os.getcwd())
-                os.close(fasta_handle)
-                fasta_is_temporary = True
-                self._split_off_fasta(gff_file, fasta_file)
+        # Mark obsolete features
+        if self.full_genome:
+            top_level_entries = self._extract_gff_sequence_names(gff_reader.directives)
+            self._mark_obsolete_features(organism_entry, all_feature_names, top_level_entries)
+
+        # Remove the staging tables and commit changes
+        for table_name in list(self._staging_tables()) + ["staged_feature", "staged_featureloc",
+                                                          "staged_feature_relationship"]:
+            self.drop_temporary_table(table_name)
+        self.session.commit()
+        if self.skip_unchanged:
+            self.printer.print("Skipped " + str(skipped_records) + " unchanged records")
+        self._print_lookup_cache_statistics()
+        self._print_peak_memory_usage()
 
-        # Import sequences from FASTA file, if present
-        if fasta_file:
-            fasta_client = fasta.FastaImportClient(self.uri, self.verbose)
-            fasta_client.load(fasta_file, organism_name, sequence_type)
+    @staticmethod
+    def _staging_tables() -> Dict[str, List[str]]:
+        """Lists the staging tables for an update merged in bulk, together with their column definitions. The
+        position of the record in the input file determines which values take precedence."""
+        return {
+            "staging_feature": ["position INTEGER", "uniquename VARCHAR", "feature_id BIGINT", "name VARCHAR",
+                                "type_id BIGINT", "residues TEXT", "seqlen INTEGER", "checksum CHAR(32)"],
+            "staging_featureloc": ["position INTEGER", "uniquename VARCHAR", "srcfeature VARCHAR", "fmin BIGINT",
+                                   "fmax BIGINT", "strand SMALLINT", "phase INTEGER"],
+            "staging_feature_synonym": ["position INTEGER", "uniquename VARCHAR", "synonym_id BIGINT",
+                                        "is_current BOOLEAN"],
+            "staging_featureprop": ["position INTEGER", "uniquename VARCHAR", "type_id BIGINT", "value TEXT"],
+            "staging_feature_dbxref": ["position INTEGER", "uniquename VARCHAR", "dbxref_id BIGINT",
+                                       "crossref VARCHAR"],
+            "staging_feature_cvterm": ["position INTEGER", "uniquename VARCHAR", "cvterm_id BIGINT"],
+            "staging_feature_pub": ["position INTEGER", "uniquename VARCHAR", "pub_id BIGINT"],
+            "staging_feature_relationship": ["position INTEGER", "uniquename VARCHAR", "object VARCHAR",
+                                             "type_id BIGINT"]
+        }
+
+    def _stage_row(self, table_name: str, *values) -> None:
+        """Writes a row into the buffer for a staging table"""
+        self.write_copy_row(self._staging_buffers.setdefault(table_name, io.StringIO()), values)
+
+    def _stage_gff_record(self, gff_record: gffutils.Feature, organism_entry: organism.Organism,
+                          positions: Iterator[int], staged_feature_names: Set[str]) -> None:
+        """Writes the entries of a GFF record into the buffers for the staging tables. Entries in the 'synonym',
+        'pub', 'db' and 'dbxref' tables are inserted or updated directly."""
 
-        # Delete temporary file
-        if fasta_is_temporary and os.path.exists(fasta_file):
-            os.remove(fasta_file)
+        # Check if all dependencies are met
+        if gff_record.featuretype not in self._sequence_terms:
+            self.printer.print("WARNING: Sequence type '" + gff_record.featuretype + "' not present in database")
+            return
+        type_entry = self._sequence_terms[gff_record.featuretype]
+        position = next(positions)
+        uniquename = gff_record.id
+
+        # Stage entry for the 'feature' table
+        feature_entry = self._create_feature(gff_record, organism_entry.organism_id, type_entry.cvterm_id)
+        feature_id = self._feature_index[uniquename][0] if uniquename in self._feature_index else None
+        self._stage_row("staging_feature", position, uniquename, feature_id, feature_entry.name,
+                        feature_entry.type_id, feature_entry.residues, feature_entry.seqlen,
+                        self._gff_record_checksum(gff_record))
+        staged_feature_names.add(uniquename)
+
+        # Stage entry for the 'featureloc' table, unless the considered feature is in fact the 'srcfeature'
+        if gff_record.seqid != uniquename:
+            featureloc_entry = self._create_featureloc(gff_record, 0, 0)
+            self._stage_row("staging_featureloc", position, uniquename, gff_record.seqid, featureloc_entry.fmin,
+                            featureloc_entry.fmax, featureloc_entry.strand, featureloc_entry.phase)
+            self._register_transcript_location(gff_record)
+
+        # Stage entries for the 'feature_synonym' table
+        for synonym_type, aliases in self._extract_gff_synonyms(gff_record).items():
+            if synonym_type not in self._synonym_terms:
+                self.printer.print("WARNING: Synonym type '" + synonym_type + "' not present in database.")
+                continue
+            synonym_type_entry = self._synonym_terms[synonym_type]
+            for alias in aliases:
+                synonym_entry = self._handle_synonym(sequence.Synonym(
+                    name=alias.value, type_id=synonym_type_entry.cvterm_id, synonym_sgml=alias.value))
+                self._stage_row("staging_feature_synonym", position, uniquename, synonym_entry.synonym_id,
+                                alias.dict_params.get("current"))
 
-    @staticmethod
-    def _has_fasta(gff_file: str) -> bool:
-        """Checks if a GFF file contains a FASTA section"""
-        infile = utils.open_file_read(gff_file)
-        fasta_started = False
-        for line in infile:
-            if "##FASTA" in line:
-                fasta_started = True
-                break
-        utils.close(infile)
-        return fasta_started
+        # Stage entries for the 'featureprop' table
+        for prop, values in self._extract_gff_properties(gff_record).items():
+            for value in values:
+                if prop not in self._feature_property_terms:
+                    self.printer.print("WARNING: Feature property term '" + prop + "' not present in input file.")
+                    continue
+                self._stage_row("staging_featureprop", position, uniquename,
+                                self._feature_property_terms[prop].cvterm_id, value)
+
+        # Stage entries for the 'feature_dbxref' table
+        for crossref in self._extract_gff_crossrefs(gff_record):
+            (db_authority, accession, version) = ontology.split_dbxref(crossref)
+            db_entry = self._handle_db(general.Db(name=db_authority))
+            dbxref_entry = self._handle_dbxref(general.DbxRef(db_id=db_entry.db_id, accession=accession,
+                                                              version=version), db_authority)
+            self._stage_row("staging_feature_dbxref", position, uniquename, dbxref_entry.dbxref_id, crossref)
+
+        # Stage entries for the 'feature_cvterm' table
+        for ontology_term in self._extract_gff_ontology_terms(gff_record):
+            (db_authority, accession, version) = ontology.split_dbxref(ontology_term)
+            resolved_term = self._resolve_ontology_term(db_authority, accession, ontology_term)
+            if resolved_term:
+                self._stage_row("staging_feature_cvterm", position, uniquename, resolved_term[1])
+
+        # Stage entries for the 'feature_pub' table
+        for publication in self._extract_gff_publications(gff_record):
+            pub_entry = self._handle_pub(pub.Pub(uniquename=publication, type_id=self._default_pub.type_id))
+            self._stage_row("staging_feature_pub", position, uniquename, pub_entry.pub_id)
+
+        # Stage entries for the 'feature_relationship' table
+        for relationship, parents in self._extract_gff_relationships(gff_record).items():
+            relationship_type_entry = self._parent_terms[relationship]
+            for parent in parents:
+                self._stage_row("staging_feature_relationship", position, uniquename, parent,
+                                relationship_type_entry.cvterm_id)
+
+        # Stage the entries of the associated protein, if present (Note: recursive call)
+        protein_record = self._create_staged_protein_record(gff_record)
+        if protein_record:
+            self._stage_gff_record(protein_record, organism_entry, positions, staged_feature_names)
+        self._check_if_gff_attributes_are_recognized(gff_record)
+
+    def _create_staged_protein_record(self, gff_record: gffutils.Feature) -> Union[None, gffutils.Feature]:
+        """Creates a GFF record for a protein associated with a GFF feature, located like the staged transcript"""
+
+        # Check if the GFF record is associated with a polypeptide, and if yes extract its name
+        protein_source_id = self._extract_protein_source_id(gff_record)
+        if not protein_source_id:
+            return None
+
+        # Get the location of the transcript from the staged records
+        transcript_location = self._find_transcript_location(gff_record)
+        if not transcript_location:
+            self.printer.print("WARNING: Transcript of protein '" + protein_source_id + "' not present in input file.")
+            return None
+        return self._create_protein_record(gff_record, protein_source_id, *transcript_location)
+
+    def _merge_staged_record_checksums(self) -> None:
+        """Replaces the entries in the 'featureprop' table holding the checksums of the GFF records of the staged
+        features. Features with unresolved references get no checksum, so that they are imported again."""
+        if not self._checksum_term:
+            return
+        self.session.execute(sqlalchemy.text("""
+            DELETE FROM featureprop p USING staged_feature f
+            WHERE p.feature_id = f.feature_id AND p.type_id = :type_id"""), {"type_id": self._checksum_term.cvterm_id})
+        self.session.execute(sqlalchemy.text("""
+            INSERT INTO featureprop (feature_id, type_id, value)
+            SELECT f.feature_id, :type_id, s.checksum
+            FROM staged_feature f JOIN staging_feature s ON s.uniquename = f.uniquename AND s.position = f.last_position
+            WHERE NOT EXISTS (SELECT 1 FROM staged_featureloc l
+                              WHERE l.feature_id = f.feature_id AND l.srcfeature_id IS NULL)
+                AND NOT EXISTS (SELECT 1 FROM staged_feature_relationship r
+                                WHERE r.subject_id = f.feature_id AND r.object_id IS NULL)"""),
+            {"type_id": self._checksum_term.cvterm_id})
+
+    def _merge_staged_entries(self, statement: str, step: int, message: Callable[..., str], **params
+                              ) -> List[Tuple[int, int, str]]:
+        """Executes an SQL statement merging staged entries into a database table, and returns a report for each
+        changed entry, together with the position of the GFF record and the processing step"""
+        result = self.session.execute(sqlalchemy.text(statement), params)
+        return [(row[0], step, message(*row[1:])) for row in result]
+
+    def _merge_staged_features(self, organism_entry: organism.Organism) -> List[Tuple[int, int, str]]:
+        """Inserts or updates entries in the 'feature' table from the staging table"""
+
+        # Combine the staged records of each feature. Values of later records take precedence.
+        self.create_temporary_table_as("staged_feature", """
+            SELECT uniquename, min(feature_id) AS feature_id,
+                (array_agg(name ORDER BY position DESC) FILTER (WHERE name IS NOT NULL))[1] AS name,
+                (array_agg(type_id ORDER BY position DESC))[1] AS type_id,
+                (array_agg(residues ORDER BY position DESC) FILTER (WHERE residues IS NOT NULL))[1] AS residues,
+                (array_agg(seqlen ORDER BY position DESC) FILTER (WHERE seqlen IS NOT NULL))[1] AS seqlen,
+                min(position) AS first_position, max(position) AS last_position
+            FROM staging_feature GROUP BY uniquename""")
+
+        # Update existing entries
+        abbreviation = organism_entry.abbreviation
+        reports = self._merge_staged_entries("""
+            UPDATE feature f SET name = COALESCE(s.name, f.name), type_id = s.type_id,
+                residues = COALESCE(s.residues, f.residues), seqlen = COALESCE(s.seqlen, f.seqlen),
+                is_analysis = FALSE, is_obsolete = FALSE
+            FROM staged_feature s
+            WHERE f.feature_id = s.feature_id
+                AND (s.name IS NOT NULL AND s.name IS DISTINCT FROM f.name OR s.type_id <> f.type_id
+                     OR s.residues IS NOT NULL AND s.residues IS DISTINCT FROM f.residues
+                     OR s.seqlen IS NOT NULL AND s.seqlen IS DISTINCT FROM f.seqlen OR f.is_analysis OR f.is_obsolete)
+            RETURNING s.last_position, f.uniquename""", 0,
+            lambda name: "Updated feature '" + name + "' for organism '" + abbreviation + "'")
+
+        # Insert new entries, and register their IDs
+        reports.extend(self._merge_staged_entries("""
+            WITH inserted AS (
+                INSERT INTO feature (organism_id, type_id, uniquename, name, residues, seqlen)
+                SELECT :organism_id, type_id, uniquename, name, residues, seqlen
+                FROM staged_feature WHERE feature_id IS NULL ORDER BY first_position
+                RETURNING feature_id, uniquename)
+            UPDATE staged_feature s SET feature_id = i.feature_id
+            FROM inserted i WHERE s.uniquename = i.uniquename
+            RETURNING s.first_position, s.uniquename""", 0,
+            lambda name: "Inserted feature '" + name + "' for organism '" + abbreviation + "'",
+            organism_id=organism_entry.organism_id))
+        return reports
+
+    def _merge_staged_featurelocs(self, organism_entry: organism.Organism) -> List[Tuple[int, int, str]]:
+        """Inserts or updates entries in the 'featureloc' table from the staging table"""
+
+        # Get the location of each feature from its last record, and the ID of the 'srcfeature'
+        self.create_temporary_table_as("staged_featureloc", """
+            SELECT DISTINCT ON (f.feature_id) s.position, s.uniquename, f.feature_id, s.srcfeature,
+                (SELECT min(feature_id) FROM feature WHERE organism_id = :organism_id AND uniquename = s.srcfeature
+                ) AS srcfeature_id, s.fmin, s.fmax, s.strand, s.phase
+            FROM staging_featureloc s JOIN staged_feature f USING (uniquename)
+            ORDER BY f.feature_id, s.position DESC""", organism_id=organism_entry.organism_id)
+
+        # Report locations on sequences that are not present
+        reports = self._merge_staged_entries("""
+            SELECT position, srcfeature FROM staged_featureloc WHERE srcfeature_id IS NULL""", 1,
+            lambda seqid: "WARNING: Parent sequence '" + seqid + "' not present in database")
+
+        # Update existing entries
+        reports.extend(self._merge_staged_entries("""
+            UPDATE featureloc l SET fmin = s.fmin, fmax = s.fmax, strand = COALESCE(s.strand, l.strand),
+                phase = COALESCE(s.phase, l.phase)
+            FROM staged_featureloc s
+            WHERE l.featureloc_id = (SELECT min(featureloc_id) FROM featureloc WHERE feature_id = s.feature_id)
+                AND s.srcfeature_id IS NOT NULL
+                AND (l.fmin IS DISTINCT FROM s.fmin OR l.fmax IS DISTINCT FROM s.fmax
+                     OR s.strand IS NOT NULL AND s.strand IS DISTINCT FROM l.strand
+                     OR s.phase IS NOT NULL AND s.phase IS DISTINCT FROM l.phase)
+            RETURNING s.position, s.uniquename""", 1,
+            lambda name: "Updated featureloc for feature '" + name + "'"))
+
+        # Insert new entries
+        reports.extend(self._merge_staged_entries("""
+            WITH staged AS (
+                SELECT * FROM staged_featureloc s
+                WHERE srcfeature_id IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM featureloc l WHERE l.feature_id = s.feature_id)),
+            inserted AS (
+                INSERT INTO featureloc (feature_id, srcfeature_id, fmin, fmax, strand, phase)
+                SELECT feature_id, srcfeature_id, fmin, fmax, strand, phase FROM staged)
+            SELECT position, uniquename FROM staged""", 1,
+            lambda name: "Inserted featureloc for feature '" + name + "'"))
+        return reports
+
+    def _merge_staged_feature_synonyms(self) -> List[Tuple[int, int, str]]:
+        """Inserts, updates and deletes entries in the 'feature_synonym' table from the staging table"""
+
+        # Insert new entries
+        reports = self._merge_staged_entries("""
+            WITH staged AS (
+                SELECT DISTINCT ON (f.feature_id, s.synonym_id) s.position, s.uniquename, f.feature_id, s.synonym_id,
+                    s.is_current
+                FROM staging_feature_synonym s JOIN staged_feature f USING (uniquename)
+                WHERE (NOT :full_attributes OR s.position = f.last_position)
+                    AND NOT EXISTS (SELECT 1 FROM feature_synonym fs
+                                    WHERE fs.feature_id = f.feature_id AND fs.synonym_id = s.synonym_id)
+                ORDER BY f.feature_id, s.synonym_id, s.position),
+            inserted AS (
+                INSERT INTO feature_synonym (synonym_id, feature_id, pub_id, is_current)
+                SELECT synonym_id, feature_id, :pub_id, COALESCE(is_current, TRUE) FROM staged)
+            SELECT s.position, y.name, s.uniquename FROM staged s JOIN synonym y USING (synonym_id)""", 2,
+            lambda synonym, name: "Inserted synonym '" + synonym + "' for feature '" + name + "'",
+            full_attributes=self.full_attributes, pub_id=self._default_pub.pub_id)
+
+        # Update existing entries
+        reports.extend(self._merge_staged_entries("""
+            UPDATE feature_synonym fs SET is_current = s.is_current
+            FROM (SELECT DISTINCT ON (f.feature_id, s.synonym_id) s.position, s.uniquename, f.feature_id,
+                      s.synonym_id, s.is_current
+                  FROM staging_feature_synonym s JOIN staged_feature f USING (uniquename)
+                  WHERE (NOT :full_attributes OR s.position = f.last_position) AND s.is_current IS NOT NULL
+                  ORDER BY f.feature_id, s.synonym_id, s.position DESC) s, synonym y
+            WHERE fs.feature_id = s.feature_id AND fs.synonym_id = s.synonym_id AND fs.is_current <> s.is_current
+                AND y.synonym_id = s.synonym_id
+            RETURNING s.position, y.name, s.uniquename""", 2,
+            lambda synonym, name: "Updated synonym '" + synonym + "' for feature '" + name + "'",
+            full_attributes=self.full_attributes))
+
+        # Delete obsolete entries
+        if self.full_attributes:
+            reports.extend(self._merge_staged_entries("""
+                DELETE FROM feature_synonym fs USING staged_feature f, synonym y
+                WHERE fs.feature_id = f.feature_id AND y.synonym_id = fs.synonym_id AND y.type_id = ANY(:type_ids)
+                    AND NOT EXISTS (SELECT 1 FROM staging_feature_synonym s
+                                    WHERE s.uniquename = f.uniquename AND s.position = f.last_position
+                                        AND s.synonym_id = fs.synonym_id)
+                RETURNING f.last_position, y.name, f.uniquename""", 3,
+                lambda synonym, name: "Deleted synonym '" + synonym + "' for feature '" + name + "'",
+                type_ids=self._synonym_type_ids))
+        return reports
+
+    def _merge_staged_featureprops(self) -> List[Tuple[int, int, str]]:
+        """Inserts and deletes entries in the 'featureprop' table from the staging table"""
+
+        # Insert new entries, ranked after the existing entries of the same type
+        reports = self._merge_staged_entries("""
+            WITH staged AS (
+                SELECT DISTINCT ON (f.feature_id, s.type_id, s.value) s.position, s.uniquename, f.feature_id,
+                    s.type_id, s.value
+                FROM staging_featureprop s JOIN staged_feature f USING (uniquename)
+                WHERE (NOT :full_attributes OR s.position = f.last_position)
+                    AND NOT EXISTS (SELECT 1 FROM featureprop p
+                                    WHERE p.feature_id = f.feature_id AND p.type_id = s.type_id AND p.value = s.value)
+                ORDER BY f.feature_id, s.type_id, s.value, s.position),
+            ranked AS (
+                SELECT s.*, COALESCE((SELECT max(rank) + 1 FROM featureprop p
+                                      WHERE p.feature_id = s.feature_id AND p.type_id = s.type_id), 0)
+                    + row_number() OVER (PARTITION BY s.feature_id, s.type_id ORDER BY s.position) - 1 AS rank
+                FROM staged s),
+            inserted AS (
+                INSERT INTO featureprop (feature_id, type_id, value, rank)
+                SELECT feature_id, type_id, value, rank FROM ranked)
+            SELECT s.position, c.name, s.value, s.uniquename FROM ranked s JOIN cvterm c ON c.cvterm_id = s.type_id
+            ORDER BY s.position, s.rank""", 4,
+            lambda prop, value, name: "Inserted property '" + prop + "' = '" + value + "' for feature '" + name + "'",
+            full_attributes=self.full_attributes)
+
+        # Delete obsolete entries
+        if self.full_attributes:
+            reports.extend(self._merge_staged_entries("""
+                DELETE FROM featureprop p USING staged_feature f, cvterm c
+                WHERE p.feature_id = f.feature_id AND p.type_id = ANY(:type_ids) AND c.cvterm_id = p.type_id
+                    AND NOT EXISTS (SELECT 1 FROM staging_featureprop s
+                                    WHERE s.uniquename = f.uniquename AND s.position = f.last_position
+                                        AND s.type_id = p.type_id AND s.value = p.value)
+                RETURNING f.last_position, c.name, COALESCE(p.value, ''), f.uniquename""", 5,
+                lambda prop, value, name: "Deleted property '" + prop + "' = '" + value + "' for feature '" + name
+                + "'", type_ids=self._feature_property_type_ids))
+        return reports
+
+    def _merge_staged_feature_dbxrefs(self) -> List[Tuple[int, int, str]]:
+        """Inserts, updates and deletes entries in the 'feature_dbxref' table from the staging table"""
+
+        # Update existing entries
+        reports = self._merge_staged_entries("""
+            UPDATE feature_dbxref fd SET is_current = TRUE
+            FROM (SELECT DISTINCT ON (f.feature_id, s.dbxref_id) s.position, s.uniquename, f.feature_id,
+                      s.dbxref_id, s.crossref
+                  FROM staging_feature_dbxref s JOIN staged_feature f USING (uniquename)
+                  WHERE NOT :full_attributes OR s.position = f.last_position
+                  ORDER BY f.feature_id, s.dbxref_id, s.position) s
+            WHERE fd.feature_id = s.feature_id AND fd.dbxref_id = s.dbxref_id AND NOT fd.is_current
+            RETURNING s.position, s.crossref, s.uniquename""", 6,
+            lambda crossref, name: "Updated cross reference '" + crossref + "' for feature '" + name + "'",
+            full_attributes=self.full_attributes)
+
+        # Insert new entries
+        reports.extend(self._merge_staged_entries("""
+            WITH staged AS (
+                SELECT DISTINCT ON (f.feature_id, s.dbxref_id) s.position, s.uniquename, f.feature_id, s.dbxref_id,
+                    s.crossref
+                FROM staging_feature_dbxref s JOIN staged_feature f USING (uniquename)
+                WHERE (NOT :full_attributes OR s.position = f.last_position)
+                    AND NOT EXISTS (SELECT 1 FROM feature_dbxref fd
+                                    WHERE fd.feature_id = f.feature_id AND fd.dbxref_id = s.dbxref_id)
+                ORDER BY f.feature_id, s.dbxref_id, s.position),
+            inserted AS (
+                INSERT INTO feature_dbxref (feature_id, dbxref_id) SELECT feature_id, dbxref_id FROM staged)
+            SELECT position, crossref, uniquename FROM staged""", 6,
+            lambda crossref, name: "Inserted cross reference '" + crossref + "' for feature '" + name + "'",
+            full_attributes=self.full_attributes))
+
+        # Delete obsolete entries
+        if self.full_attributes:
+            reports.extend(self._merge_staged_entries("""
+                DELETE FROM feature_dbxref fd USING staged_feature f, dbxref x, db d
+                WHERE fd.feature_id = f.feature_id AND x.dbxref_id = fd.dbxref_id AND d.db_id = x.db_id
+                    AND NOT EXISTS (SELECT 1 FROM staging_feature_dbxref s
+                                    WHERE s.uniquename = f.uniquename AND s.position = f.last_position
+                                        AND s.dbxref_id = fd.dbxref_id)
+                RETURNING f.last_position, d.name || ':' || x.accession, f.uniquename""", 7,
+                lambda crossref, name: "Deleted cross reference '" + crossref + "' for feature '" + name + "'"))
+        return reports
+
+    def _merge_staged_feature_cvterms(self) -> List[Tuple[int, int, str]]:
+        """Inserts and deletes entries in the 'feature_cvterm' table from the staging table"""
+
+        # Insert new entries
+        reports = self._merge_staged_entries("""
+            WITH staged AS (
+                SELECT DISTINCT ON (f.feature_id, s.cvterm_id) s.position, s.uniquename, f.feature_id, s.cvterm_id
+                FROM staging_feature_cvterm s JOIN staged_feature f USING (uniquename)
+                WHERE (NOT :full_attributes OR s.position = f.last_position)
+                    AND NOT EXISTS (SELECT 1 FROM feature_cvterm fc
+                                    WHERE fc.feature_id = f.feature_id AND fc.cvterm_id = s.cvterm_id)
+                ORDER BY f.feature_id, s.cvterm_id, s.position),
+            inserted AS (
+                INSERT INTO feature_cvterm (feature_id, cvterm_id, pub_id)
+                SELECT feature_id, cvterm_id, :pub_id FROM staged)
+            SELECT s.position, c.name, s.uniquename FROM staged s JOIN cvterm c USING (cvterm_id)""", 8,
+            lambda term, name: "Inserted CV term '" + term + "' for feature '" + name + "'",
+            full_attributes=self.full_attributes, pub_id=self._default_pub.pub_id)
+
+        # Delete obsolete entries
+        if self.full_attributes:
+            reports.extend(self._merge_staged_entries("""
+                DELETE FROM feature_cvterm fc USING staged_feature f, cvterm c, dbxref x
+                WHERE fc.feature_id = f.feature_id AND c.cvterm_id = fc.cvterm_id AND x.dbxref_id = c.dbxref_id
+                    AND x.db_id = :db_id
+                    AND NOT EXISTS (SELECT 1 FROM staging_feature_cvterm s
+                                    WHERE s.uniquename = f.uniquename AND s.position = f.last_position
+                                        AND s.cvterm_id = fc.cvterm_id)
+                RETURNING f.last_position, c.name, f.uniquename""", 9,
+                lambda term, name: "Deleted CV term '" + term + "' for feature '" + name + "'",
+                db_id=self._go_db.db_id))
+        return reports
+
+    def _merge_staged_feature_pubs(self) -> List[Tuple[int, int, str]]:
+        """Inserts and deletes entries in the 'feature_pub' table from the staging table"""
+
+        # Insert new entries
+        reports = self._merge_staged_entries("""
+            WITH staged AS (
+                SELECT DISTINCT ON (f.feature_id, s.pub_id) s.position, s.uniquename, f.feature_id, s.pub_id
+                FROM staging_feature_pub s JOIN staged_feature f USING (uniquename)
+                WHERE (NOT :full_attributes OR s.position = f.last_position)
+                    AND NOT EXISTS (SELECT 1 FROM feature_pub fp
+                                    WHERE fp.feature_id = f.feature_id AND fp.pub_id = s.pub_id)
+                ORDER BY f.feature_id, s.pub_id, s.position),
+            inserted AS (
+                INSERT INTO feature_pub (feature_id, pub_id) SELECT feature_id, pub_id FROM staged)
+            SELECT s.position, p.uniquename, s.uniquename FROM staged s JOIN pub p USING (pub_id)""", 10,
+            lambda publication, name: "Inserted publication '" + publication + "' for feature '" + name + "'",
+            full_attributes=self.full_attributes)
+
+        # Delete obsolete entries
+        if self.full_attributes:
+            reports.extend(self._merge_staged_entries("""
+                DELETE FROM feature_pub fp USING staged_feature f, pub p
+                WHERE fp.feature_id = f.feature_id AND p.pub_id = fp.pub_id
+                    AND NOT EXISTS (SELECT 1 FROM staging_feature_pub s
+                                    WHERE s.uniquename = f.uniquename AND s.position = f.last_position
+                                        AND s.pub_id = fp.pub_id)
+                RETURNING f.last_position, p.uniquename, f.uniquename""", 11,
+                lambda publication, name: "Deleted publication '" + publication + "' for feature '" + name + "'"))
+        return reports
+
+    def _merge_staged_feature_relationships(self, organism_entry: organism.Organism) -> List[Tuple[int, int, str]]:
+        """Inserts and deletes entries in the 'feature_relationship' table from the staging table"""
+
+        # Get the IDs of subjects and objects
+        self.create_temporary_table_as("staged_feature_relationship", """
+            SELECT s.position, s.uniquename, f.feature_id AS subject_id, s.object,
+                (SELECT min(feature_id) FROM feature WHERE organism_id = :organism_id AND uniquename = s.object
+                ) AS object_id, s.type_id
+            FROM staging_feature_relationship s JOIN staged_feature f USING (uniquename)
+            WHERE NOT :full_attributes OR s.position = f.last_position""",
+            organism_id=organism_entry.organism_id, full_attributes=self.full_attributes)
+
+        # Report objects that are not present
+        reports = self._merge_staged_entries("""
+            SELECT position, object FROM staged_feature_relationship WHERE object_id IS NULL""", 12,
+            lambda parent: "WARNING: Feature '" + parent + "' neither present in input file nor in database.")
+
+        # Insert new entries
+        reports.extend(self._merge_staged_entries("""
+            WITH staged AS (
+                SELECT DISTINCT ON (subject_id, object_id, type_id) * FROM staged_feature_relationship s
+                WHERE object_id IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM feature_relationship r WHERE r.subject_id = s.subject_id
+                                        AND r.object_id = s.object_id AND r.type_id = s.type_id)
+                ORDER BY subject_id, object_id, type_id, position),
+            inserted AS (
+                INSERT INTO feature_relationship (subject_id, object_id, type_id)
+                SELECT subject_id, object_id, type_id FROM staged)
+            SELECT s.position, s.uniquename, c.name, s.object FROM staged s JOIN cvterm c ON c.cvterm_id = s.type_id
+            """, 12, lambda subject, relationship, parent: "Inserted relationship: '" + subject + "', '"
+                                                            + relationship + "', '" + parent + "'"))
+
+        # Delete obsolete entries
+        if self.full_attributes:
+            reports.extend(self._merge_staged_entries("""
+                DELETE FROM feature_relationship r USING staged_feature f, cvterm c, feature o
+                WHERE r.subject_id = f.feature_id AND r.type_id = ANY(:type_ids) AND c.cvterm_id = r.type_id
+                    AND o.feature_id = r.object_id
+                    AND NOT EXISTS (SELECT 1 FROM staged_feature_relationship s WHERE s.subject_id = r.subject_id
+                                        AND s.object_id = r.object_id AND s.type_id = r.type_id)
+                RETURNING f.last_position, f.uniquename, c.name, o.uniquename""", 13,
+                lambda subject, relationship, parent: "Deleted relationship: '" + subject + "', '" + relationship
+                + "', '" + parent + "'", type_ids=self._parent_type_ids))
+        return reports
+
+    def _load_in_parallel(self, filename: str, organism_name: str, fasta_filename: str, sequence_type: str,
+                          jobs: int) -> None:
+        """Imports data from a GFF3 file with several processes, each handling the features on a subset of sequences"""
+
+        # Load an index of all features of this organism present in the database
+        default_organism = self._load_organism(organism_name)
+        self._feature_index = self._load_feature_index(default_organism)
+
+        # Import sequences from a separate FASTA file or from the FASTA section of the GFF file, if present
+        gff_reader = GFFReader(filename)
+        self._import_gff_sequences(gff_reader, fasta_filename, default_organism, sequence_type)
+
+        # Insert entries that can be shared between features on different sequences up front, so that the processes
+        # only need to read them
+        for gff_record in gff_reader.records():
+            self._handle_shared_entries(gff_record)
+
+        # Commit changes, and release the database connections before creating the processes
+        self.session.commit()
+        self.engine.dispose()
+
+        # Import the features on each subset of sequences in a separate process
+        arguments = [(self.uri, self.verbose, filename, organism_name, self.fresh_load, self.full_attributes,
+                      self.skip_unchanged, partition, jobs) for partition in range(jobs)]
+        with multiprocessing.Pool(jobs) as pool:
+            results = pool.map(import_gff_partition, arguments)
+
+        # Insert relationships between features imported by different processes
+        self._feature_index = self._load_feature_index(default_organism)
+        all_feature_names = set()
+        for feature_names, unresolved_relationships in results:
+            all_feature_names.update(feature_names)
+            self._handle_unresolved_relationships(unresolved_relationships)
+
+        # Mark obsolete features
+        if self.full_genome and not self.fresh_load:
+            top_level_entries = self._extract_gff_sequence_names(gff_reader.directives)
+            self._mark_obsolete_features(default_organism, all_feature_names, top_level_entries)
+
+        # Insert buffered entries into the database
+        self._copy_buffered_entries(attach=False)
+
+        # Commit changes
+        self.session.commit()
+        self._print_lookup_cache_statistics()
+        self._print_peak_memory_usage()
+
+    def load_partition(self, filename: str, organism_name: str, fresh_load: bool, full_attributes: bool,
+                       skip_unchanged: bool, partition: int, partitions: int
+                       ) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """Imports the features on a subset of the sequences of a GFF3 file into a Chado database, and returns the
+        names of the imported features and the relationships with features not found in this subset"""
+
+        # Update global options
+        self.fresh_load = fresh_load
+        self.full_attributes = full_attributes
+        self.skip_unchanged = skip_unchanged
+
+        # Load an index of all features of this organism present in the database
+        default_organism = self._load_organism(organism_name)
+        self._feature_index = self._load_feature_index(default_organism)
+        self._record_checksums = self._load_record_checksums(default_organism)
+
+        # Initiate global containers
+        all_feature_ids = {}
+        skipped_records = 0
+        self._unresolved_relationships = []
+
+        # Loop over all entries in the gff file located on sequences of this subset
+        gff_reader = GFFReader(filename, seqid_filter=lambda seqid: self._partition_of(seqid, partitions) == partition)
+        try:
+            for record_number, gff_record in enumerate(gff_reader.records(), 1):
+
+                # Skip records that are unchanged since the previous import, if requested
+                if self.skip_unchanged and self._is_unchanged_gff_record(gff_record):
+                    self._skip_gff_record(gff_record, all_feature_ids)
+                    skipped_records += 1
+                    continue
+
+                # Insert, update or delete entries in various tables
+                self._insert_gff_record_into_database(gff_record, default_organism, all_feature_ids)
+
+                # Remove processed entries from the session in regular intervals
+                if record_number % self.release_interval == 0:
+                    self._release_processed_features()
+        finally:
+            gff_reader.close()
+        self._transcript_locations.clear()
+        self._handle_unresolved_locations()
+
+        # Insert buffered entries into the database
+        self._copy_buffered_entries(attach=False)
+
+        # Commit changes
+        self.session.commit()
+        if self.skip_unchanged:
+            self.printer.print("Skipped " + str(skipped_records) + " unchanged records")
+        self._print_lookup_cache_statistics()
+        self._print_peak_memory_usage()
+        return list(all_feature_ids.keys()), self._unresolved_relationships
 
     @staticmethod
-    def _split_off_fasta(gff_file: str, fasta_file: str) -> None:
-        """Copies the FASTA section from a GFF file into a separate FASTA file"""
-        infile = utils.open_file_read(gff_file)
-        outfile = utils.open_file_write(fasta_file)
-        fasta_started = False
-        for line in infile:
-            if fasta_started:
-                outfile.write(line)
+    def _partition_of(seqid: str, partitions: int) -> int:
+        """Assigns a sequence to one of a given number of subsets"""
+        return zlib.crc32(seqid.encode()) % partitions
+
+    def _handle_shared_entries(self, gff_record: gffutils.Feature) -> None:
+        """Inserts or updates the entries in the 'synonym', 'pub', 'db' and 'dbxref' tables for a GFF record"""
+
+        # Insert/update entries in the 'synonym' table
+        for synonym_type, aliases in self._extract_gff_synonyms(gff_record).items():
+            if synonym_type not in self._synonym_terms:
+                continue
+            type_entry = self._synonym_terms[synonym_type]
+            for alias in aliases:
+                self._handle_synonym(sequence.Synonym(name=alias.value, type_id=type_entry.cvterm_id,
+                                                      synonym_sgml=alias.value))
+
+        # Insert/update entries in the 'pub' table
+        for publication in self._extract_gff_publications(gff_record):
+            self._handle_pub(pub.Pub(uniquename=publication, type_id=self._default_pub.type_id))
+
+        # Insert/update entries in the 'db' and 'dbxref' tables
+        for crossref in self._extract_gff_crossrefs(gff_record):
+            (db_authority, accession, version) = ontology.split_dbxref(crossref)
+            db_entry = self._handle_db(general.Db(name=db_authority))
+            self._handle_dbxref(general.DbxRef(db_id=db_entry.db_id, accession=accession, version=version),
+                                db_authority)
+
+    def _handle_unresolved_relationships(self, unresolved_relationships: List[Tuple[str, str, str]]) -> None:
+        """Inserts or updates the entries in the 'feature_relationship' table whose object was not found by the
+        process importing the subject"""
+        for subject_name, object_name, relationship in unresolved_relationships:
+
+            # Get IDs of subject and object from the feature index
+            if object_name not in self._feature_index:
+                self.printer.print("WARNING: Feature '" + object_name +
+                                   "' neither present in input file nor in database.")
+                continue
+            subject_id = self._feature_index[subject_name][0]
+            object_id = self._feature_index[object_name][0]
+            type_entry = self._parent_terms[relationship]
+
+            # Insert/update entry in the 'feature_relationship' table
+            existing_feature_relationships = self.query_all(sequence.FeatureRelationship, subject_id=subject_id)
+            new_relationship_entry = sequence.FeatureRelationship(subject_id=subject_id, object_id=object_id,
+                                                                  type_id=type_entry.cvterm_id)
+            self._handle_feature_relationship(new_relationship_entry, existing_feature_relationships, subject_name,
+                                              object_name, type_entry.name)
+
+    def _import_gff_sequences(self, gff_reader: GFFReader, fasta_filename: str, organism_entry: organism.Organism,
+                              sequence_type: str) -> None:
+        """Imports the sequences from a separate FASTA file, or from the FASTA section of a GFF file, before the GFF
+        records, so that the locations of features on them can be inserted right away"""
+        gff_sequences = gff_reader.sequences()
+        if fasta_filename:
+
+            # Read up to the FASTA section of the GFF file, if present
+            next(gff_sequences, None)
+            gff_sequences.close()
+            if gff_reader.has_fasta:
+
+                # Error message - only one file with FASTA is permitted
+                raise iobase.InputFileError("You cannot provide a GFF file with FASTA sequences "
+                                            "plus a separate FASTA file.")
+            gff_sequences = SeqIO.parse(fasta_filename, "fasta")
+
+        # The types of sequences with a record in the GFF file are taken from that record
+        self._import_sequences(gff_sequences, organism_entry, sequence_type, gff_reader.sequence_record_ids)
+
+    def _import_sequences(self, fasta_records: Iterator[SeqIO.SeqRecord], organism_entry: organism.Organism,
+                          sequence_type: str, all_feature_ids: Container[str]) -> None:
+        """Imports sequences from FASTA records into the database, together with the locations of features on them"""
+        default_type_entry = self._sequence_terms[sequence_type]
+        for fasta_record in fasta_records:
+            feature_entry = self._handle_sequence(fasta_record, organism_entry, default_type_entry,
+                                                  fasta_record.id in all_feature_ids)
+            self._mark_as_top_level_sequence(feature_entry)
+            self._handle_deferred_locations(feature_entry)
+
+    def _handle_sequence(self, fasta_record: SeqIO.SeqRecord, organism_entry: organism.Organism,
+                         default_type_entry: cv.CvTerm, is_annotated: bool) -> sequence.Feature:
+        """Inserts or updates an entry in the 'feature' table for a FASTA record and returns it"""
+
+        # Check if all dependencies are met. Use default if not.
+        sequence_type = fasta.FastaImportClient._extract_type(fasta_record)
+        if sequence_type:
+            if sequence_type not in self._sequence_terms:
+                self.printer.print("WARNING: Sequence type '" + sequence_type + "' not present in database")
+                type_entry = default_type_entry
             else:
-                if "##FASTA" in line:
-                    fasta_started = True
-        utils.close(infile)
-        utils.close(outfile)
-
-    def _create_sqlite_db(self, filename: str) -> gffutils.FeatureDB:
-        """Creates a local SQLite database containing data from a GFF file"""
-        database_name = os.path.abspath(filename) + ".sqlitedb"
-        self._sqlite_databases.append(database_name)
-        gffutils.create_db(filename, database_name, force=True, keep_order=True)
-        database = gffutils.FeatureDB(database_name)
-        return database
+                type_entry = self._sequence_terms[sequence_type]
+        else:
+            type_entry = default_type_entry
+
+        # Create a feature object. The type given in the GFF records takes precedence for existing features, and is
+        # applied to new features when their GFF record is imported.
+        new_feature_entry = fasta.FastaImportClient._create_feature(fasta_record, organism_entry.organism_id,
+                                                                    type_entry.cvterm_id)
+        if is_annotated and fasta_record.id in self._feature_index:
+            new_feature_entry.type_id = None
+
+        # Update the corresponding table. Sequences are not buffered, as they can be large.
+        self._buffer_entries = False
+        try:
+            feature_entry = self._handle_feature(new_feature_entry, organism_entry.abbreviation)
+        finally:
+            self._buffer_entries = True
+
+        # Keep the feature index up to date
+        self._feature_index[feature_entry.uniquename] = (feature_entry.feature_id, feature_entry.type_id,
+                                                         feature_entry.is_obsolete)
+        return feature_entry
+
+    def _handle_deferred_locations(self, srcfeature_entry: sequence.Feature) -> None:
+        """Inserts or updates the entries in the 'featureloc' table that were waiting for a given 'srcfeature'"""
+        for feature_name, featureloc_entry in self._deferred_locations.pop(srcfeature_entry.uniquename, []):
+            if self._deferred_featurelocs.get(featureloc_entry.feature_id) is featureloc_entry:
+                del self._deferred_featurelocs[featureloc_entry.feature_id]
+            featureloc_entry.srcfeature_id = srcfeature_entry.feature_id
+            self._handle_featureloc(featureloc_entry, feature_name)
+
+    def _handle_unresolved_locations(self) -> None:
+        """Reports the feature locations that could not be inserted because the 'srcfeature' is missing"""
+        for seqid, deferred_entries in self._deferred_locations.items():
+            for _ in deferred_entries:
+                self.printer.print("WARNING: Parent sequence '" + seqid + "' not present in database")
+
+        # Remove the checksums of the affected features, so that their GFF records are imported again
+        unresolved_feature_ids = [featureloc_entry.feature_id for deferred_entries in self._deferred_locations.values()
+                                  for _, featureloc_entry in deferred_entries]
+        self._delete_record_checksums(unresolved_feature_ids)
+        self._deferred_locations.clear()
+        self._deferred_featurelocs.clear()
 
     def _handle_existing_features(self, organism_entry: organism.Organism) -> None:
         """Checks if there are existing features for the organism, and deletes them if required"""
@@ -298,42 +1444,207 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
             self.printer.print("Deleting all features for organism '" + organism_entry.abbreviation + "'")
             existing_features_query.delete()
 
-    def _mark_obsolete_features(self, organism_entry: organism.Organism,
-                                all_features: Dict[str, sequence.Feature], top_level_features: List[str]) -> None:
-        """Marks features as obsolete"""
+    def _prefetch_window_attributes(self, gff_record: gffutils.Feature, organism_entry: organism.Organism) -> None:
+        """Loads the entries associated with the existing features in the sequence window of a GFF record from various
+        tables, when the first record in this window is imported. The entries are released in regular intervals, and
+        before a further window is loaded once their number reaches a limit."""
+        if self.fresh_load or gff_record.seqid not in self._feature_index:
+            return
+        window = (gff_record.seqid, (gff_record.start - 1) // self.prefetch_window_size)
+        if window in self._prefetched_windows:
+            return
+
+        # Release the entries loaded so far if there are too many, so that the memory usage does not grow with the
+        # size of the genome if the records of different regions are interleaved
+        if len(self._prefetched_feature_ids) >= self.prefetch_limit:
+            self._release_processed_features()
+        self._prefetched_windows.add(window)
+        window_start = window[1] * self.prefetch_window_size
+        self._prefetch_feature_attributes(organism_entry, self._feature_index[gff_record.seqid][0],
+                                          [(window_start, window_start + self.prefetch_window_size)])
+
+    def _prefetch_feature_attributes(self, organism_entry: organism.Organism, srcfeature_id: int,
+                                     regions: List[Tuple[int, int]]) -> None:
+        """Loads entries associated with the features of an organism located in given regions of a sequence from
+        various tables, grouped by feature"""
+
+        # Select the features in the regions that have not been loaded yet
+        feature_ids = [feature_id for feature_id, in self.query_feature_ids_by_regions({srcfeature_id: regions})
+                       if feature_id not in self._prefetched_feature_ids]
+        if not feature_ids:
+            return
+        self._prefetched_feature_ids.update(feature_ids)
+
+        # Load the entries associated with these features
+        organism_id = organism_entry.organism_id
+        self._prefetched_featureprops.update(utils.group_objects(self.query_featureprop_by_type_and_organism(
+            organism_id, self._feature_property_type_ids)
+            .filter(sequence.FeatureProp.feature_id.in_(feature_ids)).all(), "feature_id"))
+        self._prefetched_feature_synonyms.update(utils.group_objects(self.query_feature_synonym_by_type_and_organism(
+            organism_id, self._synonym_type_ids)
+            .filter(sequence.FeatureSynonym.feature_id.in_(feature_ids)).all(), "feature_id"))
+        self._prefetched_feature_dbxrefs.update(utils.group_objects(self.query_feature_dbxref_by_organism(
+            organism_id).filter(sequence.FeatureDbxRef.feature_id.in_(feature_ids)).all(), "feature_id"))
+        self._prefetched_feature_cvterms.update(utils.group_objects(self.query_feature_cvterm_by_ontology_and_organism(
+            organism_id, self._go_db.db_id).filter(sequence.FeatureCvTerm.feature_id.in_(feature_ids)).all(),
+            "feature_id"))
+        self._prefetched_feature_pubs.update(utils.group_objects(self.query_feature_pub_by_organism(
+            organism_id).filter(sequence.FeaturePub.feature_id.in_(feature_ids)).all(), "feature_id"))
+        self._prefetched_feature_relationships.update(utils.group_objects(
+            self.query_feature_relationship_by_type_and_organism(organism_id, self._parent_type_ids)
+            .filter(sequence.FeatureRelationship.subject_id.in_(feature_ids)).all(), "subject_id"))
+
+    def _load_feature_attributes(self, feature_id: int) -> None:
+        """Loads the entries associated with a feature from various tables, if they have not been prefetched"""
+        if feature_id in self._prefetched_feature_ids:
+            return
+        self._prefetched_feature_ids.add(feature_id)
+        self._prefetched_featureprops[feature_id] = self.query_featureprop_by_type(
+            feature_id, self._feature_property_type_ids).all()
+        self._prefetched_feature_synonyms[feature_id] = self.query_feature_synonym_by_type(
+            feature_id, self._synonym_type_ids).all()
+        self._prefetched_feature_dbxrefs[feature_id] = self.query_all(sequence.FeatureDbxRef, feature_id=feature_id)
+        self._prefetched_feature_cvterms[feature_id] = self.query_feature_cvterm_by_ontology(
+            feature_id, self._go_db.db_id).all()
+        self._prefetched_feature_pubs[feature_id] = self.query_all(sequence.FeaturePub, feature_id=feature_id)
+        self._prefetched_feature_relationships[feature_id] = self.query_feature_relationship_by_type(
+            feature_id, self._parent_type_ids).all()
+
+    def _release_processed_features(self) -> None:
+        """Removes the entries of all features processed so far from the session and discards the prefetched entries,
+        so that the memory usage does not grow with the size of the input file"""
+
+        # Write pending changes to the database
+        self._copy_buffered_entries(attach=False)
+        released_ids = set(self._processed_feature_ids)
+        self._processed_feature_ids.clear()
+
+        # Discard all prefetched entries. They are loaded again if a feature or sequence window reappears.
+        for prefetched_entries in [self._prefetched_featureprops, self._prefetched_feature_synonyms,
+                                   self._prefetched_feature_dbxrefs, self._prefetched_feature_cvterms,
+                                   self._prefetched_feature_pubs, self._prefetched_feature_relationships]:
+            prefetched_entries.clear()
+        self._prefetched_feature_ids.clear()
+        self._prefetched_windows.clear()
+
+        # Remove the entries of the processed features from the session
+        for entry in list(self.session.identity_map.values()):
+            if self._owning_feature_id(entry) in released_ids:
+                self.session.expunge(entry)
+
+    @staticmethod
+    def _owning_feature_id(entry) -> Union[None, int]:
+        """Returns the ID of the feature a database entry belongs to, without triggering a database query"""
+        if isinstance(entry, sequence.FeatureRelationship):
+            return entry.__dict__.get("subject_id")
+        return entry.__dict__.get("feature_id")
+
+    @staticmethod
+    def _update_prefetched_entries(prefetched_entries: Dict[int, list], feature_id: int, existing_entries: list,
+                                   new_entries: list, deleted_entries: list) -> None:
+        """Replaces the prefetched entries of a feature by those present in the database after an update"""
+        current_entries = [entry for entry in existing_entries if entry not in deleted_entries]
+        for entry in new_entries:
+            if entry not in current_entries:
+                current_entries.append(entry)
+        prefetched_entries[feature_id] = current_entries
+
+    @staticmethod
+    def _copied_tables() -> list:
+        """Lists the tables filled with the COPY command during a fresh load, in the order of insertion"""
+        return [sequence.Feature, sequence.FeatureLoc, sequence.FeatureProp, sequence.FeatureSynonym,
+                sequence.FeatureDbxRef, sequence.FeatureCvTerm, sequence.FeaturePub, sequence.FeatureRelationship]
+
+    def add_and_flush(self, obj):
+        """Adds an entry to a database table, or to a buffer for bulk insertion in case of a fresh load"""
+        if self.fresh_load and self._buffer_entries and type(obj) in self._copied_tables():
+            self._buffer_entry(obj)
+        else:
+            super().add_and_flush(obj)
+
+    def _buffer_entry(self, entry, batch_size=1000) -> None:
+        """Assigns a primary key to an entry and stores it for bulk insertion into the database"""
+
+        # Assign a primary key from the values reserved in the database
+        table = type(entry)
+        if not self._reserved_primary_keys.get(table):
+            self._reserved_primary_keys[table] = list(reversed(self.reserve_primary_keys(table, batch_size)))
+        primary_key = table.__table__.primary_key.columns.values()[0]
+        setattr(entry, primary_key.key, self._reserved_primary_keys[table].pop())
+
+        # Set unspecified values to the defaults the database would use
+        for column in table.__table__.columns:
+            if getattr(entry, column.key) is None and column.server_default is not None \
+                    and isinstance(column.server_default.arg, str):
+                setattr(entry, column.key, self._server_default_value(column))
+
+        # Store the entry
+        self._copy_buffers.setdefault(table, []).append(entry)
+        if table == sequence.Feature:
+            self._buffered_features[entry.feature_id] = entry
+        elif table == sequence.FeatureLoc:
+            self._buffered_featurelocs[entry.feature_id] = entry
 
-        # Loop over all features for the given organism in the database
-        for feature_name in self._load_feature_names(organism_entry):
+    @staticmethod
+    def _server_default_value(column: sqlalchemy.Column) -> Union[bool, int, str]:
+        """Converts the server-side default of a column into a python value"""
+        default = column.server_default.arg
+        if column.type.python_type == bool:
+            return default.lower() == "true"
+        return column.type.python_type(default)
+
+    def _copy_buffered_entries(self, attach: bool) -> None:
+        """Inserts all buffered entries into the database with the COPY command, optionally keeping them in the
+        session for further updates"""
+        self.session.flush()
+        for table in self._copied_tables():
+            entries = self._copy_buffers.get(table, [])
+            self.copy_into_table(table, entries)
+            if attach:
+                self.attach_copied_entries(table, entries)
+        self._copy_buffers.clear()
+        self._buffered_features.clear()
+        self._buffered_featurelocs.clear()
 
-            # Check if the feature is also present in the input file
-            if feature_name not in all_features and feature_name not in top_level_features:
+    def _mark_obsolete_features(self, organism_entry: organism.Organism,
+                                all_features: Iterable[str], top_level_features: List[str]) -> None:
+        """Marks features as obsolete"""
 
-                # Mark the feature as obsolete, if necessary
-                self._mark_feature_as_obsolete(organism_entry, feature_name)
+        # Mark all features for the given organism in the database as obsolete that are not present in the input file
+        retained_features = set(all_features)
+        retained_features.update(top_level_features)
+        self._mark_features_as_obsolete(organism_entry, retained_features)
 
     def _insert_gff_record_into_database(self, gff_record: gffutils.Feature, organism_entry: organism.Organism,
-                                         all_feature_entries: Dict[str, sequence.Feature]):
+                                         all_feature_ids: Dict[str, int]):
         """Inserts, updates or deletes entries in various tables"""
 
+        # Load existing entries associated with the features in the sequence window of this record, if not done yet
+        self._prefetch_window_attributes(gff_record, organism_entry)
+
         # Insert/update/get entry in the 'feature' tables
         feature_entry = self._handle_child_feature(gff_record, organism_entry)
         if feature_entry:
+            self._load_feature_attributes(feature_entry.feature_id)
 
             # Insert/update/delete entries connected to this 'feature' entry in various tables
             self._handle_location(gff_record, feature_entry)
+            self._register_transcript_location(gff_record)
             self._handle_synonyms(gff_record, feature_entry)
             self._handle_properties(gff_record, feature_entry)
             self._handle_cross_references(gff_record, feature_entry)
             self._handle_ontology_terms(gff_record, feature_entry)
             self._handle_publications(gff_record, feature_entry)
-            self._handle_relationships(gff_record, feature_entry, all_feature_entries)
+            self._handle_relationships(gff_record, feature_entry)
 
             # Insert/update/delete entries connected to the associated protein (if present) in various tables
-            self._handle_protein(gff_record, feature_entry, organism_entry, all_feature_entries)
+            self._handle_protein(gff_record, feature_entry, organism_entry, all_feature_ids)
 
-            # Save 'feature' entry in global array
+            # Save the ID of the 'feature' entry in global dictionary, and a checksum of the GFF record in the database
             self._check_if_gff_attributes_are_recognized(gff_record)
-            all_feature_entries[feature_entry.uniquename] = feature_entry
+            self._handle_record_checksum(gff_record, feature_entry)
+            all_feature_ids[feature_entry.uniquename] = feature_entry.feature_id
+            self._processed_feature_ids.append(feature_entry.feature_id)
 
     def _handle_child_feature(self, gff_record: gffutils.Feature, organism_entry: organism.Organism
                               ) -> Union[None, sequence.Feature]:
@@ -348,8 +1659,45 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         # Create a feature object, and update the corresponding table
         new_feature_entry = self._create_feature(gff_record, organism_entry.organism_id, type_entry.cvterm_id)
         feature_entry = self._handle_feature(new_feature_entry, organism_entry.abbreviation)
+        if feature_entry is new_feature_entry:
+            self._unlocated_new_feature_ids.add(feature_entry.feature_id)
+            self._prefetched_feature_ids.add(feature_entry.feature_id)
+
+        # Keep the feature index up to date, and insert locations of other features on this one
+        self._feature_index[feature_entry.uniquename] = (feature_entry.feature_id, feature_entry.type_id,
+                                                         feature_entry.is_obsolete)
+        self._handle_deferred_locations(feature_entry)
         return feature_entry
 
+    def _find_feature(self, organism_id: int, uniquename: str) -> Union[None, sequence.Feature]:
+        """Returns the entry of the 'feature' table with a given uniquename, if present in the feature index"""
+        if uniquename not in self._feature_index:
+            return None
+        feature_id = self._feature_index[uniquename][0]
+        if feature_id in self._buffered_features:
+            if not self.full_attributes:
+                return self._buffered_features[feature_id]
+
+            # Entries of features that are updated with deletions need to be present in the database
+            self._copy_buffered_entries(attach=True)
+        return self.session.query(sequence.Feature).get(feature_id)
+
+    def _find_featureloc(self, feature_id: int) -> Union[None, sequence.FeatureLoc]:
+        """Returns the entry of the 'featureloc' table for a given feature, if present"""
+        if feature_id in self._deferred_featurelocs:
+            return self._deferred_featurelocs[feature_id]
+        if feature_id in self._buffered_featurelocs:
+            return self._buffered_featurelocs[feature_id]
+        if feature_id in self._unlocated_new_feature_ids:
+            return None
+        return super()._find_featureloc(feature_id)
+
+    def _handle_featureloc(self, new_entry: sequence.FeatureLoc, feature_name="") -> sequence.FeatureLoc:
+        """Inserts or updates an entry in the 'featureloc' table, and returns it"""
+        featureloc_entry = super()._handle_featureloc(new_entry, feature_name)
+        self._unlocated_new_feature_ids.discard(new_entry.feature_id)
+        return featureloc_entry
+
     def _handle_location(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature
                          ) -> Union[None, sequence.FeatureLoc]:
         """Inserts or updates an entry in the 'featureloc' table and returns it"""
@@ -358,16 +1706,17 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         if gff_record.seqid == gff_record.id:
             return None
 
-        # Get entry from 'srcfeature' table
-        srcfeature_entry = self.query_first(sequence.Feature, organism_id=feature_entry.organism_id,
-                                            uniquename=gff_record.seqid)
-        if not srcfeature_entry:
-            self.printer.print("WARNING: Parent sequence '" + gff_record.seqid + "' not present in database")
+        # Get ID of the 'srcfeature' from the feature index. If it is not present yet, the 'srcfeature' might still be
+        # loaded later on, so the location is put on hold
+        if gff_record.seqid not in self._feature_index:
+            deferred_entry = self._create_featureloc(gff_record, feature_entry.feature_id, None)
+            self._deferred_locations.setdefault(gff_record.seqid, []).append((feature_entry.uniquename, deferred_entry))
+            self._deferred_featurelocs[feature_entry.feature_id] = deferred_entry
             return None
+        srcfeature_id = self._feature_index[gff_record.seqid][0]
 
         # Insert/update entry in the 'featureloc' table
-        new_featureloc_entry = self._create_featureloc(gff_record, feature_entry.feature_id,
-                                                       srcfeature_entry.feature_id)
+        new_featureloc_entry = self._create_featureloc(gff_record, feature_entry.feature_id, srcfeature_id)
         featureloc_entry = self._handle_featureloc(new_featureloc_entry, feature_entry.uniquename)
         return featureloc_entry
 
@@ -375,13 +1724,14 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
                          ) -> List[sequence.FeatureSynonym]:
         """Inserts, updates and deletes entries in the 'synonym' and 'feature_synonym' tables and returns the latter"""
 
-        # Extract existing synonyms for this feature from the database
-        existing_feature_synonyms = self.query_feature_synonym_by_type(
-            feature_entry.feature_id, self._synonym_type_ids).all()
+        # Get existing synonyms for this feature from the prefetched entries
+        existing_feature_synonyms = self._prefetched_feature_synonyms.get(feature_entry.feature_id, [])
         all_feature_synonyms = []
 
         # Loop over all synonyms for this feature in the GFF record
         synonyms = self._extract_gff_synonyms(gff_record)
+        if not synonyms and not existing_feature_synonyms:
+            return []
         for synonym_type, aliases in synonyms.items():
 
             # Get database entry for synonym type
@@ -409,20 +1759,26 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
                 all_feature_synonyms.append(feature_synonym_entry)
 
         # Delete obsolete entries
+        deleted_feature_synonyms = []
         if self.full_attributes:
-            self._delete_feature_synonym(all_feature_synonyms, existing_feature_synonyms, feature_entry.uniquename)
+            deleted_feature_synonyms = self._delete_feature_synonym(all_feature_synonyms, existing_feature_synonyms,
+                                                                    feature_entry.uniquename)
+        self._update_prefetched_entries(self._prefetched_feature_synonyms, feature_entry.feature_id,
+                                        existing_feature_synonyms, all_feature_synonyms, deleted_feature_synonyms)
         return all_feature_synonyms
 
     def _handle_publications(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature
                              ) -> List[sequence.FeaturePub]:
         """Inserts, updates and deletes entries in the 'pub' and 'feature_pub' tables and returns the latter"""
 
-        # Extract existing publications for this feature from the database
-        existing_feature_pubs = self.query_all(sequence.FeaturePub, feature_id=feature_entry.feature_id)
+        # Get existing publications for this feature from the prefetched entries
+        existing_feature_pubs = self._prefetched_feature_pubs.get(feature_entry.feature_id, [])
         all_feature_pubs = []
 
         # Loop over all publications for this feature in the GFF record
         publications = self._extract_gff_publications(gff_record)
+        if not publications and not existing_feature_pubs:
+            return []
         for publication in publications:
 
             # Insert/update entry in the 'pub' table
@@ -436,21 +1792,26 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
             all_feature_pubs.append(feature_pub_entry)
 
         # Delete obsolete entries
+        deleted_feature_pubs = []
         if self.full_attributes:
-            self._delete_feature_pub(all_feature_pubs, existing_feature_pubs, feature_entry.uniquename)
+            deleted_feature_pubs = self._delete_feature_pub(all_feature_pubs, existing_feature_pubs,
+                                                            feature_entry.uniquename)
+        self._update_prefetched_entries(self._prefetched_feature_pubs, feature_entry.feature_id,
+                                        existing_feature_pubs, all_feature_pubs, deleted_feature_pubs)
         return all_feature_pubs
 
-    def _handle_relationships(self, gff_record: gffutils.Feature, subject_entry: sequence.Feature,
-                              all_features: Dict[str, sequence.Feature]) -> List[sequence.FeatureRelationship]:
+    def _handle_relationships(self, gff_record: gffutils.Feature, subject_entry: sequence.Feature
+                              ) -> List[sequence.FeatureRelationship]:
         """Inserts, updates and deletes entries in the 'feature_relationship' table and returns them"""
 
-        # Extract existing relationships for this subject from the database
-        existing_feature_relationships = self.query_feature_relationship_by_type(
-            subject_entry.feature_id, self._parent_type_ids).all()
+        # Get existing relationships for this subject from the prefetched entries
+        existing_feature_relationships = self._prefetched_feature_relationships.get(subject_entry.feature_id, [])
         all_feature_relationships = []
 
         # Loop over all relationships for this feature in the GFF record
         relationships = self._extract_gff_relationships(gff_record)
+        if not relationships and not existing_feature_relationships:
+            return []
         for relationship, parents in relationships.items():
 
             # Get database entry for relationship type
@@ -458,43 +1819,48 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
 
             for parent in parents:
 
-                # Get database entry for object
-                if parent in all_features:
-                    object_entry = all_features[parent]
-                else:
-                    object_entry = self.query_first(sequence.Feature, organism_id=subject_entry.organism_id,
-                                                    uniquename=parent)
-                if not object_entry:
+                # Get ID of the object from the feature index. When running in parallel, the object might be imported
+                # by another process, so the relationship is put on hold
+                if parent not in self._feature_index:
+                    if self._unresolved_relationships is not None:
+                        self._unresolved_relationships.append((subject_entry.uniquename, parent, relationship))
+                        continue
                     self.printer.print("WARNING: Feature '" + parent +
                                        "' neither present in input file nor in database.")
                     continue
+                object_id = self._feature_index[parent][0]
 
                 # Insert/update entry in the 'feature_relationship' table
                 new_relationship_entry = sequence.FeatureRelationship(subject_id=subject_entry.feature_id,
-                                                                      object_id=object_entry.feature_id,
+                                                                      object_id=object_id,
                                                                       type_id=type_entry.cvterm_id)
                 feature_relationship_entry = self._handle_feature_relationship(
-                    new_relationship_entry, existing_feature_relationships, subject_entry.uniquename,
-                    object_entry.uniquename, type_entry.name)
+                    new_relationship_entry, existing_feature_relationships, subject_entry.uniquename, parent,
+                    type_entry.name)
                 all_feature_relationships.append(feature_relationship_entry)
 
         # Delete obsolete entries
+        deleted_feature_relationships = []
         if self.full_attributes:
-            self._delete_feature_relationship(all_feature_relationships, existing_feature_relationships,
-                                              subject_entry.uniquename)
+            deleted_feature_relationships = self._delete_feature_relationship(
+                all_feature_relationships, existing_feature_relationships, subject_entry.uniquename)
+        self._update_prefetched_entries(self._prefetched_feature_relationships, subject_entry.feature_id,
+                                        existing_feature_relationships, all_feature_relationships,
+                                        deleted_feature_relationships)
         return all_feature_relationships
 
     def _handle_properties(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature
                            ) -> List[sequence.FeatureProp]:
         """Inserts, updates and deletes entries in the 'featureprop' table and returns them"""
 
-        # Extract existing properties for this feature from the database
-        existing_featureprops = self.query_featureprop_by_type(
-            feature_entry.feature_id, self._feature_property_type_ids).all()
+        # Get existing properties for this feature from the prefetched entries
+        existing_featureprops = self._prefetched_featureprops.get(feature_entry.feature_id, [])
         all_featureprops = []
 
         # Loop over all properties of this feature in the GFF record
         props = self._extract_gff_properties(gff_record)
+        if not props and not existing_featureprops:
+            return []
         for prop, values in props.items():
             for value in values:
 
@@ -512,20 +1878,26 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
                 all_featureprops.append(featureprop_entry)
 
         # Delete obsolete entries
+        deleted_featureprops = []
         if self.full_attributes:
-            self._delete_featureprop(all_featureprops, existing_featureprops, feature_entry.uniquename)
+            deleted_featureprops = self._delete_featureprop(all_featureprops, existing_featureprops,
+                                                            feature_entry.uniquename)
+        self._update_prefetched_entries(self._prefetched_featureprops, feature_entry.feature_id,
+                                        existing_featureprops, all_featureprops, deleted_featureprops)
         return all_featureprops
 
     def _handle_cross_references(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature
                                  ) -> List[sequence.FeatureDbxRef]:
         """Inserts, updates and deletes entries in the 'feature_dbxref' table and returns them"""
 
-        # Extract existing cross references for this feature from the database
-        existing_feature_dbxrefs = self.query_all(sequence.FeatureDbxRef, feature_id=feature_entry.feature_id)
+        # Get existing cross references for this feature from the prefetched entries
+        existing_feature_dbxrefs = self._prefetched_feature_dbxrefs.get(feature_entry.feature_id, [])
         all_feature_dbxrefs = []
 
         # Loop over all cross references of this feature in the GFF record
         crossrefs = self._extract_gff_crossrefs(gff_record)
+        if not crossrefs and not existing_feature_dbxrefs:
+            return []
         for crossref in crossrefs:
 
             # Split database cross reference (dbxref) into db, accession, version
@@ -547,60 +1919,55 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
             all_feature_dbxrefs.append(feature_dbxref_entry)
 
         # Delete obsolete entries
+        deleted_feature_dbxrefs = []
         if self.full_attributes:
-            self._delete_feature_dbxref(all_feature_dbxrefs, existing_feature_dbxrefs, feature_entry.uniquename)
+            deleted_feature_dbxrefs = self._delete_feature_dbxref(all_feature_dbxrefs, existing_feature_dbxrefs,
+                                                                  feature_entry.uniquename)
+        self._update_prefetched_entries(self._prefetched_feature_dbxrefs, feature_entry.feature_id,
+                                        existing_feature_dbxrefs, all_feature_dbxrefs, deleted_feature_dbxrefs)
         return all_feature_dbxrefs
 
     def _handle_ontology_terms(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature
                                ) -> List[sequence.FeatureCvTerm]:
         """Inserts, updates and deletes entries in the 'feature_cvterm' table and returns them"""
 
-        # Extract existing ontology terms for this feature from the database
-        existing_feature_cvterms = self.query_feature_cvterm_by_ontology(
-            feature_entry.feature_id, self._go_db.db_id).all()
+        # Get existing ontology terms for this feature from the prefetched entries
+        existing_feature_cvterms = self._prefetched_feature_cvterms.get(feature_entry.feature_id, [])
         all_feature_cvterms = []
 
         # Loop over all ontology terms of this feature in the GFF record
         ontology_terms = self._extract_gff_ontology_terms(gff_record)
+        if not ontology_terms and not existing_feature_cvterms:
+            return []
         for ontology_term in ontology_terms:
 
             # Split database cross reference (dbxref) into db, accession, version
             (db_authority, accession, version) = ontology.split_dbxref(ontology_term)
 
-            # Get entry from 'db' table
-            db_entry = self.query_first(general.Db, name=db_authority)
-            if not db_entry:
-                self.printer.print("WARNING: Ontology '" + db_authority + "' not present in database.")
-                continue
-
-            # Get entry from 'dbxref' table
-            dbxref_entry = self.query_first(general.DbxRef, db_id=db_entry.db_id, accession=accession)
-            if not dbxref_entry:
-                self.printer.print("WARNING: Ontology term '" + ontology_term + "' not present in database.")
-                continue
-
-            # Get entry from 'cvterm' table
-            cvterm_entry = self.query_first(cv.CvTerm, dbxref_id=dbxref_entry.dbxref_id)
-            if not cvterm_entry:
-                self.printer.print("WARNING: CV term for ontology term '" + ontology_term
-                                   + "' not present in database.")
+            # Get the CV term from the terms of the ontology
+            resolved_term = self._resolve_ontology_term(db_authority, accession, ontology_term)
+            if not resolved_term:
                 continue
+            (db_entry, cvterm_id, cvterm_name) = resolved_term
 
             # Insert/update entry in the 'feature_cvterm' table
             new_feature_cvterm_entry = sequence.FeatureCvTerm(feature_id=feature_entry.feature_id,
-                                                              cvterm_id=cvterm_entry.cvterm_id,
-                                                              pub_id=self._default_pub.pub_id)
+                                                              cvterm_id=cvterm_id, pub_id=self._default_pub.pub_id)
             feature_cvterm_entry = self._handle_feature_cvterm(new_feature_cvterm_entry, existing_feature_cvterms,
-                                                               cvterm_entry.name, feature_entry.uniquename)
+                                                               cvterm_name, feature_entry.uniquename)
             all_feature_cvterms.append(feature_cvterm_entry)
 
         # Delete obsolete entries
+        deleted_feature_cvterms = []
         if self.full_attributes:
-            self._delete_feature_cvterm(all_feature_cvterms, existing_feature_cvterms, feature_entry.uniquename)
+            deleted_feature_cvterms = self._delete_feature_cvterm(all_feature_cvterms, existing_feature_cvterms,
+                                                                  feature_entry.uniquename)
+        self._update_prefetched_entries(self._prefetched_feature_cvterms, feature_entry.feature_id,
+                                        existing_feature_cvterms, all_feature_cvterms, deleted_feature_cvterms)
         return all_feature_cvterms
 
     def _handle_protein(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature,
-                        organism_entry: organism.Organism, all_feature_entries: Dict[str, sequence.Feature]):
+                        organism_entry: organism.Organism, all_feature_ids: Dict[str, int]):
         """Creates a separate feature in Chado for a protein associated with a GFF feature"""
 
         # Check if the GFF record is associated with a polypeptide, and if yes extract its name
@@ -608,28 +1975,64 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         if not protein_source_id:
             return
 
+        # Get the name and location of the transcript from the records read before, or else from the database
+        transcript_location = self._find_transcript_location(gff_record) \
+            or self._query_transcript_location(gff_record, feature_entry)
+        if not transcript_location:
+            self.printer.print("WARNING: Transcript of protein '" + protein_source_id + "' not present in database.")
+            return
+
+        # Create a new GFF record
+        protein_feature = self._create_protein_record(gff_record, protein_source_id, *transcript_location)
+
+        # Insert, update or delete entries in various tables for this GFF record (Note: recursive call)
+        self._insert_gff_record_into_database(protein_feature, organism_entry, all_feature_ids)
+
+    def _register_transcript_location(self, gff_record: gffutils.Feature) -> None:
+        """Keeps the location of a transcript in memory, so that the associated protein can be derived from it"""
+        if gff_record.featuretype.lower() in self._transcript_types() and gff_record.seqid != gff_record.id:
+            self._transcript_locations[gff_record.id] = (gff_record.start - 1, gff_record.end,
+                                                         self.convert_strand(gff_record.strand))
+
+    def _find_transcript_location(self, gff_record: gffutils.Feature
+                                  ) -> Union[None, Tuple[str, int, int, Union[None, int]]]:
+        """Returns the name and location of the transcript associated with a GFF record from the records read before"""
+        if gff_record.featuretype.lower() in self._transcript_types():
+            transcript_name = gff_record.id
+        else:
+            parents = self._extract_gff_relationships(gff_record).get("part_of", [])
+            transcript_name = next((parent for parent in parents if parent in self._transcript_locations), None)
+        if transcript_name not in self._transcript_locations:
+            return None
+        return (transcript_name, ) + self._transcript_locations[transcript_name]
+
+    def _query_transcript_location(self, gff_record: gffutils.Feature, feature_entry: sequence.Feature
+                                   ) -> Union[None, Tuple[str, int, int, Union[None, int]]]:
+        """Returns the name and location of the transcript associated with a GFF record from the database"""
+
         # Get the 'feature' and 'featureloc' entries for the transcript
         if gff_record.featuretype.lower() in self._transcript_types():
             parent_entry = feature_entry
         else:
+            if self._buffered_features:
+                self._copy_buffered_entries(attach=True)
             parent_entry = self.query_parent_features(
                 feature_entry.feature_id,
                 [self._parent_terms["part_of"].cvterm_id]).first()                          # type: sequence.Feature
-        if parent_entry:
-            loc_entry = self.query_first(sequence.FeatureLoc,
-                                         feature_id=parent_entry.feature_id)                # type: sequence.FeatureLoc
-        else:
-            loc_entry = sequence.FeatureLoc(feature_id=0, srcfeature_id=0, fmin=None, fmax=None, strand=None)
-
-        # Create a new GFF record
-        protein_feature = gffutils.Feature(seqid=gff_record.seqid, source=gff_record.source,
-                                           start=loc_entry.fmin + 1, end=loc_entry.fmax,
-                                           strand=self.back_convert_strand(loc_entry.strand),
-                                           featuretype="polypeptide", id=protein_source_id,
-                                           attributes={"Derives_from": parent_entry.uniquename})
+        if not parent_entry:
+            return None
+        loc_entry = self._find_featureloc(parent_entry.feature_id)                          # type: sequence.FeatureLoc
+        if not loc_entry:
+            return None
+        return parent_entry.uniquename, loc_entry.fmin, loc_entry.fmax, loc_entry.strand
 
-        # Insert, update or delete entries in various tables for this GFF record (Note: recursive call)
-        self._insert_gff_record_into_database(protein_feature, organism_entry, all_feature_entries)
+    def _create_protein_record(self, gff_record: gffutils.Feature, protein_source_id: str, transcript_name: str,
+                               fmin: int, fmax: int, strand: Union[None, int]) -> gffutils.Feature:
+        """Creates a GFF record for a protein associated with a GFF feature, located like its transcript
+        coordinates are converted from interbase (0-based) to base-oriented (1-based)"""
+        return gffutils.Feature(seqid=gff_record.seqid, source=gff_record.source, start=fmin + 1, end=fmax,
+                                strand=self.back_convert_strand(strand), featuretype="polypeptide",
+                                id=protein_source_id, attributes={"Derives_from": transcript_name})
 
     def _check_if_gff_attributes_are_recognized(self, gff_record: gffutils.Feature) -> bool:
         """Checks if all attributes of a GFF record can be recognized"""
@@ -794,10 +2197,10 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
         return protein_id
 
     @staticmethod
-    def _extract_gff_sequence_names(gff_db: gffutils.FeatureDB) -> List[str]:
-        """Extracts sequence names from a GFF file"""
+    def _extract_gff_sequence_names(directives: List[str]) -> List[str]:
+        """Extracts sequence names from the directives of a GFF file"""
         sequences = []
-        for directive in gff_db.directives:
+        for directive in directives:
             if directive.startswith("sequence-region"):
                 split_directive = directive.split()
                 sequence_name = split_directive[1].strip()
@@ -811,7 +2214,30 @@ class GFFImportClient(iobase.ChadoClient, GFFClient):
                "protein_source_id"]
 
 
-class GFFExportClient(iobase.ChadoClient, GFFClient):
+def import_gff_partition(arguments: tuple) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+    """Imports the features on a subset of the sequences of a GFF3 file in a separate process"""
+    (uri, verbose, filename, organism_name, fresh_load, full_attributes, skip_unchanged, partition, partitions) \
+        = arguments
+    client = GFFImportClient(uri, verbose)
+    return client.load_partition(filename, organism_name, fresh_load, full_attributes, skip_unchanged, partition,
+                                 partitions)
+
+
+def initialize_gff_export_process(uri: str, verbose: bool, snapshot: str) -> None:
+    """Connects a process exporting GFF records to the database, reading from a given snapshot"""
+    global gff_export_client
+    gff_export_client = GFFExportClient(uri, verbose)
+    gff_export_client.import_snapshot(snapshot)
+
+
+def export_gff_sequence(arguments: tuple) -> str:
+    """Exports the features on a single top-level sequence to a GFF file in a separate process"""
+    (chromosome_id, regions, include_obsolete_features, gff_filename) = arguments
+    gff_export_client.export_sequence(chromosome_id, regions, include_obsolete_features, gff_filename)
+    return gff_filename
+
+
+class GFFExportClient(iobase.ChadoClient, GFFClient, fasta.FastaClient):
     """Class for exporting genomic data from Chado to GFF files"""
 
     def __init__(self, uri: str, verbose=False, test_environment=False):
@@ -826,6 +2252,23 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
         else:
             super().__init__(self.uri, self.verbose)
 
+        # Set the number of features fetched from the database at a time
+        self.fetch_size = 1000
+
+        # Create containers for the entries associated with a batch of exported features and their descendants, keyed
+        # by feature_id
+        self._prefetched_features = {}                  # type: Dict[int, sequence.Feature]
+        self._prefetched_types = {}                     # type: Dict[int, str]
+        self._prefetched_featurelocs = {}               # type: Dict[int, sequence.FeatureLoc]
+        self._prefetched_translations = {}              # type: Dict[int, str]
+        self._prefetched_children = {}                  # type: Dict[int, Dict[int, List[int]]]
+        self._prefetched_synonyms = {}                  # type: Dict[int, Dict[str, List[str]]]
+        self._prefetched_properties = {}                # type: Dict[int, Dict[str, List[str]]]
+        self._prefetched_publications = {}              # type: Dict[int, List[str]]
+        self._prefetched_cross_references = {}          # type: Dict[int, List[str]]
+        self._prefetched_ontology_terms = {}            # type: Dict[int, List[str]]
+        self._features_with_parents = set()             # type: Set[int]
+
         # Load essential database entries
         if not self.test_environment:
             self._load_essentials()
@@ -846,8 +2289,11 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
         self._go_db = self._load_db("GO")
 
     def export(self, gff_filename: str, organism_name: str, export_fasta: bool, fasta_filename: str,
-               include_obsolete_features=False) -> None:
-        """Exports sequences from Chado to a GFF file"""
+               include_obsolete_features=False, jobs=1, regions: List[Tuple[str, int, int]] = None) -> None:
+        """Exports sequences from Chado to a GFF file, or only given regions (seqid, start, end) of them"""
+
+        # Read all data from one consistent state of the database, which is shared with the other processes, if any
+        snapshot = self.export_snapshot()
 
         # Load dependencies
         organism_entry = self._load_organism(organism_name)
@@ -858,56 +2304,361 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
         # Get top-level sequences and write a GFF header
         chromosome_entries = self.query_features_by_property_type(
             organism_entry.organism_id, self._top_level_term.cvterm_id).all()           # type: List[sequence.Feature]
+        sequence_regions = {}                                                           # type: Dict[str, List]
+        if regions:
+            sequence_regions = self.group_regions_by_sequence(regions)
+            chromosome_entries = self._filter_sequences_by_regions(chromosome_entries, sequence_regions)
         self._write_gff_header(gff_handle, chromosome_entries)
 
-        # Loop over all top-level sequences
-        for chromosome_entry in chromosome_entries:
+        # Export the features on all top-level sequences, or only in the requested regions
+        if jobs > 1:
+            self._export_in_parallel(chromosome_entries, sequence_regions, include_obsolete_features, snapshot, jobs,
+                                     gff_handle)
+        else:
+            for chromosome_entry in chromosome_entries:
+                self._export_sequence(chromosome_entry, sequence_regions.get(chromosome_entry.uniquename),
+                                      include_obsolete_features, gff_handle)
 
-            # Load all attributes associated with this sequence
-            self._export_gff_record(chromosome_entry, chromosome_entry.uniquename, {}, gff_handle)
+        # Print FASTA sequences, if required
+        if export_fasta:
+            self._export_fasta(gff_handle, fasta_filename, organism_entry, chromosome_entries)
 
-            # Get features located on this sequence
-            feature_entries = self.query_features_by_srcfeature(chromosome_entry.feature_id).all()
-            for feature_entry in feature_entries:
+        # Close GFF file
+        utils.close(gff_handle)
+        self.session.commit()
 
-                # Create a GFF record for this feature, if it fulfills certain requirements
-                if not self._has_feature_parents(feature_entry) \
-                        and (include_obsolete_features or not feature_entry.is_obsolete):
-                    self._export_gff_record(feature_entry, chromosome_entry.uniquename, {}, gff_handle)
+    def _filter_sequences_by_regions(self, chromosome_entries: List[sequence.Feature],
+                                     sequence_regions: Dict[str, List[Tuple[int, int]]]) -> List[sequence.Feature]:
+        """Selects the top-level sequences that contain requested regions"""
+        chromosome_names = set(chromosome_entry.uniquename for chromosome_entry in chromosome_entries)
+        for seqid in sequence_regions:
+            if seqid not in chromosome_names:
+                self.printer.print("WARNING: Sequence '" + seqid + "' not present in database.")
+        return [chromosome_entry for chromosome_entry in chromosome_entries
+                if chromosome_entry.uniquename in sequence_regions]
+
+    def _export_in_parallel(self, chromosome_entries: List[sequence.Feature],
+                            sequence_regions: Dict[str, List[Tuple[int, int]]], include_obsolete_features: bool,
+                            snapshot: str, jobs: int, file_handle) -> None:
+        """Exports the features on each top-level sequence in a separate process, and concatenates the results in the
+        order of the sequences"""
+
+        # Create a directory for the parts of the GFF file
+        part_directory = tempfile.mkdtemp(dir=os.getcwd())
+        arguments = [(chromosome_entry.feature_id, sequence_regions.get(chromosome_entry.uniquename),
+                      include_obsolete_features, os.path.join(part_directory, str(index) + ".gff"))
+                     for index, chromosome_entry in enumerate(chromosome_entries)]
+        try:
 
-        # Close GFF file
+            # Export the sequences with processes that all read from the snapshot of this session, and append each
+            # part to the GFF file as soon as it and all preceding parts are complete
+            with multiprocessing.Pool(jobs, initializer=initialize_gff_export_process,
+                                      initargs=(self.uri, self.verbose, snapshot)) as pool:
+                for part_filename in pool.imap(export_gff_sequence, arguments):
+                    with open(part_filename, 'r') as part_handle:
+                        shutil.copyfileobj(part_handle, file_handle)
+                    os.remove(part_filename)
+        finally:
+            shutil.rmtree(part_directory, ignore_errors=True)
+
+    def export_sequence(self, chromosome_id: int, regions: List[Tuple[int, int]], include_obsolete_features: bool,
+                        gff_filename: str) -> None:
+        """Exports the features on a single top-level sequence to a GFF file without header"""
+        chromosome_entry = self.query_first(sequence.Feature, feature_id=chromosome_id)
+        gff_handle = utils.open_file_write(gff_filename)
+        self._export_sequence(chromosome_entry, regions, include_obsolete_features, gff_handle)
         utils.close(gff_handle)
 
+    def _export_sequence(self, chromosome_entry: sequence.Feature, regions: List[Tuple[int, int]],
+                         include_obsolete_features: bool, file_handle) -> None:
+        """Exports GFF records for a top-level sequence and all features located on it, or only those overlapping given
+        regions"""
+
+        # Load all attributes associated with this sequence
+        self._prefetch_feature_attributes([chromosome_entry.feature_id])
+        self._export_gff_record(chromosome_entry, chromosome_entry.uniquename, {}, file_handle)
+
+        # Get the features on this sequence that have parents, and are hence exported together with these
+        self._features_with_parents = set(feature_id for feature_id, in self.query_child_feature_ids(
+            self.query_feature_ids_by_regions({chromosome_entry.feature_id: regions or []}), self._parent_type_ids))
+
+        # Get features located on this sequence, which are streamed from the database in the order of their
+        # locations and exported in batches
+        feature_entries = self.stream_results(
+            self.query_features_by_srcfeature(chromosome_entry.feature_id, regions), self.fetch_size)
+        for batch in iter(lambda: list(itertools.islice(feature_entries, self.fetch_size)), []):
+            self._export_feature_batch(batch, chromosome_entry.uniquename, include_obsolete_features, file_handle)
+
+    def _export_feature_batch(self, feature_entries: List[sequence.Feature], chromosome_name: str,
+                              include_obsolete_features: bool, file_handle) -> None:
+        """Exports GFF records for the top-level features in a batch of features located on a sequence, together with
+        their descendants"""
+
+        # Select the features that fulfill certain requirements
+        root_entries = [feature_entry for feature_entry in feature_entries
+                        if not self._has_feature_parents(feature_entry)
+                        and (include_obsolete_features or not feature_entry.is_obsolete)]
+        if not root_entries:
+            return
+
+        # Load all attributes associated with these features and their descendants, and create GFF records
+        self._prefetch_feature_attributes([root_entry.feature_id for root_entry in root_entries])
+        for root_entry in root_entries:
+            self._export_gff_record(root_entry, chromosome_name, {}, file_handle)
+
+    def _prefetch_feature_attributes(self, feature_ids: List[int]) -> None:
+        """Loads the entries associated with given features and all their descendants from various tables, with one
+        query per table"""
+        feature_tree = self.query_feature_tree(feature_ids, self._parent_type_ids)
+
+        # Load the entries in the 'feature' and 'featureloc' tables
+        self._prefetched_features = {}
+        self._prefetched_types = {}
+        for feature_entry, feature_type in self.query_features_by_ids(feature_tree):
+            self._prefetched_features[feature_entry.feature_id] = feature_entry
+            self._prefetched_types[feature_entry.feature_id] = feature_type
+        self._prefetched_featurelocs = {}
+        for featureloc_entry in self.query_featurelocs_by_feature_ids(feature_tree):
+            self._prefetched_featurelocs.setdefault(featureloc_entry.feature_id, featureloc_entry)
+        self._prefetched_translations = dict(self.query_polypeptide_residues_by_feature_ids(feature_tree))
+
+        # Load the relationships between the features, and to their parents
+        self._prefetched_children = {}
+        for object_id, type_id, subject_id in self.query_feature_relationships_by_feature_ids(
+                feature_tree, self._parent_type_ids):
+            self._prefetched_children.setdefault(object_id, {}).setdefault(type_id, []).append(subject_id)
+
+        # Load the attributes of the features
+        self._prefetched_synonyms = self._extract_feature_synonyms(feature_tree)
+        self._prefetched_properties = self._extract_feature_properties(feature_tree)
+        self._prefetched_publications = self._extract_feature_publications(feature_tree)
+        self._prefetched_cross_references = self._extract_feature_cross_references(feature_tree)
+        self._prefetched_ontology_terms = self._extract_feature_ontology_terms(feature_tree)
+
+    def export_incremental(self, gff_filename: str, previous_gff_filename: str, since: str, organism_name: str,
+                           export_fasta: bool, fasta_filename: str, include_obsolete_features=False) -> None:
+        """Exports sequences from Chado to a GFF file, re-creating only the records of features changed since a given
+        time, and copying all other records from the GFF file of a previous export"""
+
+        # Check that the previous export can be read while the new one is written
+        if os.path.abspath(previous_gff_filename) == os.path.abspath(gff_filename):
+            raise iobase.InputFileError("The GFF file of the previous export must not be overwritten.")
+        if not since:
+            raise iobase.InputFileError("The time of the previous export is required.")
+
+        # Read all data from one consistent state of the database
+        self.export_snapshot()
+
+        # Load dependencies
+        organism_entry = self._load_organism(organism_name)
+
+        # Open GFF file
+        gff_handle = utils.open_file_write(gff_filename)
+
+        # Get top-level sequences and write a GFF header
+        chromosome_entries = self.query_features_by_property_type(
+            organism_entry.organism_id, self._top_level_term.cvterm_id).all()           # type: List[sequence.Feature]
+        self._write_gff_header(gff_handle, chromosome_entries)
+
+        # Get the features changed since the previous export, and the names of all top-level features whose records
+        # have to be re-created
+        (changed_feature_ids, changed_feature_names) = self._extract_changed_features(since)
+        changed_tree = self.query_feature_ancestors(list(changed_feature_ids), self._parent_type_ids)
+        changed_feature_names.update(uniquename for uniquename, in self.query_table(sequence.Feature.uniquename)
+                                     .filter(sequence.Feature.feature_id.in_(changed_tree)))
+
+        # Get the changed features and their ancestors located on the top-level sequences
+        changed_features = {}                                           # type: Dict[int, List[sequence.Feature]]
+        for chromosome_id, feature_entry in self.query_located_features(
+                changed_tree, [chromosome_entry.feature_id for chromosome_entry in chromosome_entries]):
+            changed_features.setdefault(chromosome_id, []).append(feature_entry)
+
+        # Export all top-level sequences, combining the unchanged records of the previous export with re-created ones
+        previous_sections = self._read_gff_sections(previous_gff_filename)
+        skipped_sections = {}                                           # type: Dict[str, Tuple[str, List]]
+        for chromosome_entry in chromosome_entries:
+            previous_section = self._find_gff_section(chromosome_entry.uniquename, previous_sections,
+                                                      skipped_sections)
+            if previous_section is None:
+                self._export_sequence(chromosome_entry, None, include_obsolete_features, gff_handle)
+            else:
+                feature_entries = changed_features.get(chromosome_entry.feature_id, [])
+                self._export_changed_sequence(chromosome_entry, previous_section, changed_feature_ids,
+                                              changed_feature_names, feature_entries, include_obsolete_features,
+                                              gff_handle)
+        previous_sections.close()
+
         # Print FASTA sequences, if required
         if export_fasta:
-            self._export_fasta(gff_filename, fasta_filename, organism_name)
+            self._export_fasta(gff_handle, fasta_filename, organism_entry, chromosome_entries)
 
-    def _export_fasta(self, gff_file: str, fasta_file: str, organism_name: str) -> None:
-        """Exports sequences from the Chado database into a FASTA file"""
-        fasta_is_temporary = (fasta_file == "" or fasta_file is None)
-        if fasta_is_temporary:
+        # Close GFF file
+        utils.close(gff_handle)
+        self.session.commit()
 
-            # Create temporary file
-            (fasta_handle, fasta_file) = tempfile.mkstemp(dir=os.getcwd())
-            os.close(fasta_handle)
+    def _extract_changed_features(self, since: str) -> Tuple[Set[int], Set[str]]:
+        """Extracts the IDs of features that were inserted, updated or deleted since a given time, or whose
+        associated entries were, from the 'timelastmodified' column and the audit tables, together with the previous
+        names of changed features"""
+        if not self.engine.dialect.has_table(self.session.connection(), "feature", schema="audit"):
+            raise iobase.DatabaseError("Incremental exports require the audit schema. "
+                                       "Set it up with 'chado admin setup -s audit'.")
+        feature_ids = set(feature_id for feature_id, in self.session.execute(sqlalchemy.text("""
+            SELECT feature_id FROM public.feature WHERE timelastmodified >= :since
+            UNION SELECT feature_id FROM audit.feature WHERE time >= :since
+            UNION SELECT feature_id FROM audit.featureloc WHERE time >= :since
+            UNION SELECT feature_id FROM audit.featureprop WHERE time >= :since
+            UNION SELECT feature_id FROM audit.feature_synonym WHERE time >= :since
+            UNION SELECT feature_id FROM audit.feature_pub WHERE time >= :since
+            UNION SELECT feature_id FROM audit.feature_dbxref WHERE time >= :since
+            UNION SELECT feature_id FROM audit.feature_cvterm WHERE time >= :since
+            UNION SELECT subject_id FROM audit.feature_relationship WHERE time >= :since
+            UNION SELECT object_id FROM audit.feature_relationship WHERE time >= :since
+            UNION SELECT l.feature_id FROM public.feature_synonym l JOIN audit.synonym a USING (synonym_id)
+                WHERE a.time >= :since
+            UNION SELECT l.feature_id FROM public.feature_pub l JOIN audit.pub a USING (pub_id)
+                WHERE a.time >= :since
+            UNION SELECT l.feature_id FROM public.feature_dbxref l JOIN audit.dbxref a USING (dbxref_id)
+                WHERE a.time >= :since"""), {"since": since}))
+        feature_names = set(uniquename for uniquename, in self.session.execute(sqlalchemy.text(
+            "SELECT uniquename FROM audit.feature WHERE time >= :since"), {"since": since}))
+        return feature_ids, feature_names
+
+    def _export_changed_sequence(self, chromosome_entry: sequence.Feature, previous_section: Tuple[str, List],
+                                 changed_feature_ids: Container[int], changed_feature_names: Container[str],
+                                 feature_entries: List[sequence.Feature], include_obsolete_features: bool,
+                                 file_handle) -> None:
+        """Exports GFF records for a top-level sequence, re-creating those of changed features and copying all others
+        from a previous export"""
+        (sequence_record, previous_blocks) = previous_section
+
+        # Copy or re-create the GFF record of the sequence itself
+        if chromosome_entry.feature_id in changed_feature_ids:
+            self._prefetch_feature_attributes([chromosome_entry.feature_id])
+            self._export_gff_record(chromosome_entry, chromosome_entry.uniquename, {}, file_handle)
+        else:
+            file_handle.write(sequence_record)
+
+        # Select the changed top-level features
+        self._features_with_parents = set()
+        if feature_entries:
+            self._features_with_parents = set(feature_id for feature_id, in self.query_child_feature_ids(
+                [feature_entry.feature_id for feature_entry in feature_entries], self._parent_type_ids))
+        root_entries = [feature_entry for feature_entry in feature_entries
+                        if not self._has_feature_parents(feature_entry)
+                        and (include_obsolete_features or not feature_entry.is_obsolete)]
+
+        # Re-create the GFF records of these features and their descendants in batches
+        changed_blocks = []                                                 # type: List[Tuple[Tuple[int, str], str]]
+        for start in range(0, len(root_entries), self.fetch_size):
+            batch = root_entries[start:start+self.fetch_size]
+            self._prefetch_feature_attributes([root_entry.feature_id for root_entry in batch])
+            for root_entry in batch:
+                block_handle = io.StringIO()
+                self._export_gff_record(root_entry, chromosome_entry.uniquename, {}, block_handle)
+                block = block_handle.getvalue()
+                changed_blocks.append((self._gff_block_key(block), block))
+
+        # Merge them with the unchanged records of the previous export in the order of their locations
+        unchanged_blocks = [(key, block) for key, block in previous_blocks if key[1] not in changed_feature_names]
+        for key, block in heapq.merge(unchanged_blocks, changed_blocks, key=lambda keyed_block: keyed_block[0]):
+            file_handle.write(block)
+
+    def _read_gff_sections(self, filename: str) -> Iterator[Tuple[str, str, List[Tuple[Tuple[int, str], str]]]]:
+        """Reads the records of a previously exported GFF file section by section. Each section consists of the
+        record of a top-level sequence and the blocks of records of all top-level features located on it, together
+        with their descendants."""
+        file_handle = utils.open_file_read(filename)
+        seqid = None
+        sequence_record = ""
+        blocks = []                                                 # type: List[Tuple[Tuple[int, str], str]]
+        lines = []                                                  # type: List[str]
+        try:
+            for line in file_handle:
+                if line.startswith("##FASTA"):
+                    break
+                if line.startswith("#") or not line.strip():
+                    continue
+                fields = line.split("\t")
+                if fields[0] != seqid:
+
+                    # Start a new section with the record of the sequence itself
+                    if seqid is not None:
+                        self._append_gff_block(blocks, lines)
+                        yield seqid, sequence_record, blocks
+                    (seqid, sequence_record, blocks, lines) = (fields[0], line, [], [])
+                elif self._is_top_level_gff_line(fields):
+
+                    # Start a new block with the record of a top-level feature
+                    self._append_gff_block(blocks, lines)
+                    lines = [line]
+                else:
+                    lines.append(line)
+            if seqid is not None:
+                self._append_gff_block(blocks, lines)
+                yield seqid, sequence_record, blocks
+        finally:
+            utils.close(file_handle)
+
+    def _append_gff_block(self, blocks: List[Tuple[Tuple[int, str], str]], lines: List[str]) -> None:
+        """Adds a block of GFF records to a list, keyed by the location and ID of its first record"""
+        if lines:
+            blocks.append((self._gff_block_key(lines[0]), "".join(lines)))
 
-        # Export FASTA sequences to file
-        fasta_client = fasta.FastaExportClient(self.uri, self.verbose)
-        fasta_client.export(fasta_file, organism_name, "contigs", "")
-        if fasta_is_temporary:
+    @staticmethod
+    def _find_gff_section(seqid: str, sections: Iterator[Tuple[str, str, List]],
+                          skipped_sections: Dict[str, Tuple[str, List]]) -> Union[None, Tuple[str, List]]:
+        """Reads GFF sections until the one for a given sequence is found, keeping those for other sequences"""
+        if seqid in skipped_sections:
+            return skipped_sections.pop(seqid)
+        for section_seqid, sequence_record, blocks in sections:
+            if section_seqid == seqid:
+                return sequence_record, blocks
+            skipped_sections[section_seqid] = (sequence_record, blocks)
+        return None
 
-            # Append sequences to GFF and remove temporary file
-            self._append_fasta(gff_file, fasta_file)
-            os.remove(fasta_file)
+    @staticmethod
+    def _is_top_level_gff_line(fields: List[str]) -> bool:
+        """Checks if a line of a GFF file is the record of a feature without parents"""
+        attributes = fields[8].rstrip("\n").split(";") if len(fields) > 8 else []
+        return not any(attribute.startswith("Parent=") or attribute.startswith("Derives_from=")
+                       for attribute in attributes)
 
     @staticmethod
-    def _append_fasta(gff_file: str, fasta_file: str) -> None:
-        """Appends FASTA sequences to a GFF file"""
-        with open(gff_file, 'a') as gff_handle:
+    def _gff_block_key(line: str) -> Tuple[int, str]:
+        """Extracts the start and the ID from the (first) line of a block of GFF records"""
+        fields = line.split("\n", 1)[0].split("\t")
+        feature_id = ""
+        for attribute in fields[8].split(";"):
+            if attribute.startswith("ID="):
+                feature_id = urllib.parse.unquote(attribute[3:])
+        return int(fields[3]), feature_id
+
+    def _export_fasta(self, gff_handle, fasta_filename: str, organism_entry: organism.Organism,
+                      chromosome_entries: List[sequence.Feature]) -> None:
+        """Exports the sequences of given top-level sequences to a FASTA file, or to the end of the GFF file"""
+        if fasta_filename:
+            fasta_handle = utils.open_file_write(fasta_filename)
+            self._write_fasta_sequences(fasta_handle, organism_entry, chromosome_entries)
+            utils.close(fasta_handle)
+        else:
             gff_handle.write("##FASTA\n")
-            with open(fasta_file, 'r') as fasta_handle:
-                for line in fasta_handle:
-                    gff_handle.write(line)
+            self._write_fasta_sequences(gff_handle, organism_entry, chromosome_entries)
+
+    def _write_fasta_sequences(self, file_handle, organism_entry: organism.Organism,
+                               chromosome_entries: List[sequence.Feature]) -> None:
+        """Writes FASTA records for given top-level sequences to file, loading their residues one at a time"""
+        genome_version = self._extract_genome_version(organism_entry)
+        for chromosome_entry in sorted(chromosome_entries, key=lambda entry: entry.uniquename):
+            if chromosome_entry.is_obsolete:
+                continue
+            residues = self.query_feature_residues(chromosome_entry.feature_id).scalar()
+            if not self._are_residues_valid(residues, "contigs"):
+                continue
+            type_entry = self.query_first(cv.CvTerm, cvterm_id=chromosome_entry.type_id)
+            record = self._create_fasta_record(chromosome_entry, organism_entry, type_entry, residues,
+                                               genome_version, "")
+            SeqIO.write([record], file_handle, "fasta")
 
     @staticmethod
     def _write_gff_header(file_handle, chromosome_entries: List[sequence.Feature]) -> None:
@@ -920,7 +2671,7 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
             file_handle.write(seq)
 
     @staticmethod
-    def _print_gff_record(gff_record: gffutils.Feature, file_handle) -> None:
+    def _print_gff_record(gff_record: GFFRecord, file_handle) -> None:
         """Prints a GFF record to file"""
         file_handle.write(str(gff_record) + "\n")
 
@@ -931,13 +2682,14 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
         # Create GFF record
         gff_record = self._create_gff_record(feature_entry, chromosome_name)
 
-        # Query various tables to gather information related to the feature
-        feature_type = self._extract_feature_type(feature_entry)
-        feature_synonyms = self._extract_feature_synonyms(feature_entry)
-        feature_properties = self._extract_feature_properties(feature_entry)
-        feature_publications = self._extract_feature_publications(feature_entry)
-        feature_dbxrefs = self._extract_feature_cross_references(feature_entry)
-        feature_ontology_terms = self._extract_feature_ontology_terms(feature_entry)
+        # Gather information related to the feature from the prefetched entries
+        feature_id = feature_entry.feature_id
+        feature_type = self._prefetched_types[feature_id]
+        feature_synonyms = self._prefetched_synonyms.get(feature_id, {})
+        feature_properties = self._prefetched_properties.get(feature_id, {})
+        feature_publications = self._prefetched_publications.get(feature_id, [])
+        feature_dbxrefs = self._prefetched_cross_references.get(feature_id, [])
+        feature_ontology_terms = self._prefetched_ontology_terms.get(feature_id, [])
 
         # Add attributes to the GFF record
         self._add_gff_relationships(gff_record, parent_relationships)
@@ -946,7 +2698,7 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
         self._add_gff_synonyms(gff_record, feature_synonyms)
         self._add_gff_publications(gff_record, feature_publications)
         self._add_gff_properties(gff_record, feature_properties)
-        self._add_gff_featuretype(gff_record, feature_type, feature_entry.residues)
+        self._add_gff_featuretype(gff_record, feature_type, self._prefetched_translations.get(feature_id))
 
         # Write the generated GFF record to file
         self._print_gff_record(gff_record, file_handle)
@@ -956,99 +2708,86 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
 
     def _handle_child_features(self, feature_entry: sequence.Feature, chromosome_name: str, file_handle) -> None:
         """Export GFF records for all child features of a given feature"""
+        child_ids = self._prefetched_children.get(feature_entry.feature_id, {})
         for relationship_type, relationship_term in self._parent_terms.items():
-            child_entries = self.query_child_features(feature_entry.feature_id, relationship_term.cvterm_id).all()
             parent_relationships = {relationship_type: feature_entry.uniquename}
-            for child_entry in child_entries:
+            for child_id in child_ids.get(relationship_term.cvterm_id, []):
+                child_entry = self._prefetched_features[child_id]
                 if not child_entry.is_obsolete:
                     self._export_gff_record(child_entry, chromosome_name, parent_relationships, file_handle)
 
     def _has_feature_parents(self, feature_entry: sequence.Feature) -> bool:
         """Checks if a given Feature has parents in the database"""
-        parent_entry = self.query_parent_features(feature_entry.feature_id, self._parent_type_ids).first()
-        return parent_entry is not None
-
-    def _extract_feature_type(self, feature_entry: sequence.Feature) -> str:
-        """Extracts the type of a feature by a database query"""
-        cvterm_entry = self.query_first(cv.CvTerm, cvterm_id=feature_entry.type_id)
-        return cvterm_entry.name
+        return feature_entry.feature_id in self._features_with_parents
 
-    def _extract_feature_synonyms(self, feature_entry: sequence.Feature) -> Dict[str, List[str]]:
-        """Extracts synonyms of a feature by a database query"""
+    def _extract_feature_synonyms(self, feature_ids: sqlalchemy.orm.Query) -> Dict[int, Dict[str, List[str]]]:
+        """Extracts synonyms of given features by a database query"""
         synonyms = {}
-        for synonym_type, synonym_name in self.query_feature_synonyms(feature_entry.feature_id).all():
-            if synonym_type in synonyms:
-                synonyms[synonym_type].append(synonym_name)
-            else:
-                synonyms[synonym_type] = [synonym_name]
+        for feature_id, synonym_type, synonym_name in self.query_feature_synonyms_by_feature_ids(feature_ids):
+            synonyms.setdefault(feature_id, {}).setdefault(synonym_type, []).append(synonym_name)
         return synonyms
 
-    def _extract_feature_properties(self, feature_entry: sequence.Feature) -> Dict[str, List[str]]:
-        """Extracts properties of a feature by a database query"""
+    def _extract_feature_properties(self, feature_ids: sqlalchemy.orm.Query) -> Dict[int, Dict[str, List[str]]]:
+        """Extracts properties of given features by a database query"""
         properties = {}
-        for property_type, property_value in self.query_feature_properties(feature_entry.feature_id).all():
-            if property_type in properties:
-                properties[property_type].append(property_value)
-            else:
-                properties[property_type] = [property_value]
+        for feature_id, property_type, property_value in self.query_feature_properties_by_feature_ids(feature_ids):
+            properties.setdefault(feature_id, {}).setdefault(property_type, []).append(property_value)
         return properties
 
-    def _extract_feature_publications(self, feature_entry: sequence.Feature) -> List[str]:
-        """Extracts publications associated with a feature by a database query"""
-        publications = []
-        for publication, in self.query_feature_pubs(feature_entry.feature_id).all():
-            publications.append(publication)
+    def _extract_feature_publications(self, feature_ids: sqlalchemy.orm.Query) -> Dict[int, List[str]]:
+        """Extracts publications associated with given features by a database query"""
+        publications = {}
+        for feature_id, publication in self.query_feature_pubs_by_feature_ids(feature_ids):
+            publications.setdefault(feature_id, []).append(publication)
         return publications
 
-    def _extract_feature_cross_references(self, feature_entry: sequence.Feature) -> List[str]:
-        """Extracts cross references associated with a feature by a database query"""
-        cross_references = []
-        for db_authority, accession in self.query_feature_dbxrefs(feature_entry.feature_id).all():
+    def _extract_feature_cross_references(self, feature_ids: sqlalchemy.orm.Query) -> Dict[int, List[str]]:
+        """Extracts cross references associated with given features by a database query"""
+        cross_references = {}
+        for feature_id, db_authority, accession in self.query_feature_dbxrefs_by_feature_ids(feature_ids):
             crossref = ontology.create_dbxref(db_authority, accession)
-            cross_references.append(crossref)
+            cross_references.setdefault(feature_id, []).append(crossref)
         return cross_references
 
-    def _extract_feature_ontology_terms(self, feature_entry: sequence.Feature) -> List[str]:
-        """Extracts ontology terms associated with a feature by a database query"""
-        ontology_terms = []
-        for db_authority, accession in self.query_feature_ontology_terms(
-                feature_entry.feature_id, self._go_db.db_id).all():
+    def _extract_feature_ontology_terms(self, feature_ids: sqlalchemy.orm.Query) -> Dict[int, List[str]]:
+        """Extracts ontology terms associated with given features by a database query"""
+        ontology_terms = {}
+        for feature_id, db_authority, accession in self.query_feature_ontology_terms_by_feature_ids(
+                feature_ids, self._go_db.db_id):
             crossref = ontology.create_dbxref(db_authority, accession)
-            ontology_terms.append(crossref)
+            ontology_terms.setdefault(feature_id, []).append(crossref)
         return ontology_terms
 
-    def _create_gff_record(self, feature_entry: sequence.Feature, chromosome_name: str) -> gffutils.Feature:
+    def _create_gff_record(self, feature_entry: sequence.Feature, chromosome_name: str) -> GFFRecord:
         """Creates a GFF record with the fields 'seqid', 'start', 'end', 'strand' and 'phase'"""
-        featureloc_entry = self.query_first(sequence.FeatureLoc, feature_id=feature_entry.feature_id)
+        featureloc_entry = self._prefetched_featurelocs.get(feature_entry.feature_id)
         if featureloc_entry:
-            gff_record = gffutils.Feature(seqid=chromosome_name, id=feature_entry.uniquename,
-                                          start=featureloc_entry.fmin+1, end=featureloc_entry.fmax,
-                                          strand=self.back_convert_strand(featureloc_entry.strand),
-                                          frame=self.back_convert_frame(featureloc_entry.phase))
+            gff_record = GFFRecord(seqid=chromosome_name, start=featureloc_entry.fmin+1, end=featureloc_entry.fmax,
+                                   strand=self.back_convert_strand(featureloc_entry.strand),
+                                   frame=self.back_convert_frame(featureloc_entry.phase))
         else:
-            gff_record = gffutils.Feature(seqid=chromosome_name, id=feature_entry.uniquename,
-                                          start=1, end=feature_entry.seqlen)
-        gff_record.attributes["ID"] = feature_entry.uniquename
+            gff_record = GFFRecord(seqid=chromosome_name, start=1, end=feature_entry.seqlen)
+        gff_record.attributes["ID"] = [feature_entry.uniquename]
         if feature_entry.name:
-            gff_record.attributes["Name"] = feature_entry.name
+            gff_record.attributes["Name"] = [feature_entry.name]
         return gff_record
 
     @staticmethod
-    def _add_gff_featuretype(gff_record: gffutils.Feature, featuretype: str, residues: str) -> None:
+    def _add_gff_featuretype(gff_record: GFFRecord, featuretype: str, residues: str) -> None:
         """Adds the 'type' and potentially the attribute 'translation' to a GFF record"""
         gff_record.featuretype = featuretype
         if gff_record.featuretype == "polypeptide" and residues:
-            gff_record.attributes["translation"] = residues.upper()
+            gff_record.attributes["translation"] = [residues.upper()]
 
     @staticmethod
-    def _add_gff_synonyms(gff_record: gffutils.Feature, synonyms: Dict[str, List[str]]):
+    def _add_gff_synonyms(gff_record: GFFRecord, synonyms: Dict[str, List[str]]):
         """Adds the attribute 'Alias' and various other attributes to a GFF record"""
         for synonym_type in ["Alias", "synonym", "previous_systematic_id"]:
             if synonym_type.lower() in synonyms:
                 gff_record.attributes[synonym_type] = synonyms[synonym_type.lower()]
 
     @staticmethod
-    def _add_gff_properties(gff_record: gffutils.Feature, properties: Dict[str, List[str]]) -> None:
+    def _add_gff_properties(gff_record: GFFRecord, properties: Dict[str, List[str]]) -> None:
         """Adds the 'source', 'score' and various attributes to a GFF record"""
         if "score" in properties:
             gff_record.score = properties["score"][0]
@@ -1059,27 +2798,27 @@ class GFFExportClient(iobase.ChadoClient, GFFClient):
                 gff_record.attributes[property_type] = properties[property_type.lower()]
 
     @staticmethod
-    def _add_gff_publications(gff_record: gffutils.Feature, publications: List[str]):
+    def _add_gff_publications(gff_record: GFFRecord, publications: List[str]):
         """Adds the attribute 'literature' to a GFF record"""
         if publications:
             gff_record.attributes["literature"] = publications
 
     @staticmethod
-    def _add_gff_cross_references(gff_record: gffutils.Feature, cross_references: List[str]):
+    def _add_gff_cross_references(gff_record: GFFRecord, cross_references: List[str]):
         """Adds the attribute 'Dbxref' to a GFF record"""
         if cross_references:
             gff_record.attributes["Dbxref"] = cross_references
 
     @staticmethod
-    def _add_gff_ontology_terms(gff_record: gffutils.Feature, ontology_terms: List[str]):
+    def _add_gff_ontology_terms(gff_record: GFFRecord, ontology_terms: List[str]):
         """Adds the attribute 'Ontology_term' to a GFF record"""
         if ontology_terms:
             gff_record.attributes["Ontology_term"] = ontology_terms
 
     @staticmethod
-    def _add_gff_relationships(gff_record: gffutils.Feature, relationships: Dict[str, str]) -> None:
+    def _add_gff_relationships(gff_record: GFFRecord, relationships: Dict[str, str]) -> None:
         """Adds the attributes 'Parent' and 'Derives_from' to a GFF record"""
         chado_to_gff_key = {"part_of": "Parent", "derives_from": "Derives_from"}
         for chado_relationship_type, gff_relationship_type in chado_to_gff_key.items():
             if chado_relationship_type in relationships:
-                gff_record.attributes[gff_relationship_type] = relationships[chado_relationship_type]
+                gff_record.attributes[gff_relationship_type] = [relationships[chado_relationship_type]]
@@ -1,4 +1,6 @@
-from typing import List, Dict
+import io
+import os
+from typing import List, Dict, Tuple, Union, Iterable, Iterator
 import sqlalchemy.orm
 from .. import utils, ddl
 from ..orm import general, cv, pub, organism, sequence
@@ -41,6 +43,25 @@ class IOClient(ddl.DatabaseAccessClient):
         """Helper class querying a table and returning the first result"""
         return self.query_table(table, **kwargs).first()
 
+    def stream_results(self, query: sqlalchemy.orm.Query, batch_size=1000) -> Iterator:
+        """Iterates over the results of a query, which are fetched in batches from a server-side cursor, so that they
+        need not be held in memory all at once"""
+        return iter(query.execution_options(stream_results=True).yield_per(batch_size))
+
+    def export_snapshot(self) -> str:
+        """Starts a transaction with isolation level REPEATABLE READ and returns the identifier of its snapshot, with
+        which other sessions can read the same state of the database"""
+        self.session.commit()
+        self.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        return self.session.execute(sqlalchemy.text("SELECT pg_export_snapshot()")).scalar()
+
+    def import_snapshot(self, snapshot: str) -> None:
+        """Starts a transaction with isolation level REPEATABLE READ that reads the state of the database seen by the
+        session that exported a given snapshot"""
+        self.session.commit()
+        self.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        self.session.execute(sqlalchemy.text("SET TRANSACTION SNAPSHOT :snapshot"), {"snapshot": snapshot})
+
     def add_and_flush(self, obj):
         """Adds an entry to a database table"""
         self.session.add(obj)
@@ -59,6 +80,90 @@ class IOClient(ddl.DatabaseAccessClient):
             entry = self.insert_into_table(table, **kwargs)
         return entry
 
+    def reserve_primary_keys(self, table, count: int) -> List[int]:
+        """Reserves a number of values from the sequence generating the primary key of a database table"""
+        primary_key = table.__table__.primary_key.columns.values()[0]
+        statement = sqlalchemy.text("SELECT nextval(pg_get_serial_sequence(:table, :column)) "
+                                    "FROM generate_series(1, :count)")
+        result = self.session.execute(statement, {"table": table.__table__.fullname, "column": primary_key.name,
+                                                  "count": count})
+        return [row[0] for row in result]
+
+    def copy_into_table(self, table, entries: list) -> None:
+        """Inserts entries into a database table with the PostgreSQL COPY command"""
+        if not entries:
+            return
+        columns = self._copied_columns(table)
+        buffer = io.StringIO()
+        for entry in entries:
+            buffer.write("\t".join(self._copy_text(getattr(entry, column.key)) for column in columns) + "\n")
+        buffer.seek(0)
+        statement = "COPY " + table.__table__.fullname + " (" + ", ".join(column.name for column in columns) \
+                    + ") FROM STDIN"
+        cursor = self.session.connection().connection.cursor()
+        cursor.copy_expert(statement, buffer)
+        cursor.close()
+
+    def copy_into_temporary_table(self, table_name: str, column_definitions: List[str], rows: Iterable[tuple]
+                                  ) -> None:
+        """Creates a temporary table, valid for the current session, and fills it with the PostgreSQL COPY command"""
+        buffer = io.StringIO()
+        for row in rows:
+            self.write_copy_row(buffer, row)
+        self.copy_buffer_into_temporary_table(table_name, column_definitions, buffer)
+
+    def copy_buffer_into_temporary_table(self, table_name: str, column_definitions: List[str], buffer: io.StringIO
+                                         ) -> None:
+        """Creates a temporary table, valid for the current session, and fills it with rows in the text format of the
+        PostgreSQL COPY command"""
+        self.session.execute(sqlalchemy.text("CREATE TEMPORARY TABLE " + table_name + " ("
+                                             + ", ".join(column_definitions) + ")"))
+        buffer.seek(0)
+        cursor = self.session.connection().connection.cursor()
+        cursor.copy_expert("COPY " + table_name + " FROM STDIN", buffer)
+        cursor.close()
+        self.session.execute(sqlalchemy.text("ANALYZE " + table_name))
+
+    def create_temporary_table_as(self, table_name: str, statement: str, **params) -> None:
+        """Creates a temporary table, valid for the current session, and fills it with the results of an SQL query"""
+        self.session.execute(sqlalchemy.text("CREATE TEMPORARY TABLE " + table_name + " AS " + statement), params)
+        self.session.execute(sqlalchemy.text("ANALYZE " + table_name))
+
+    def drop_temporary_table(self, table_name: str) -> None:
+        """Drops a temporary table"""
+        self.session.execute(sqlalchemy.text("DROP TABLE IF EXISTS " + table_name))
+
+    def attach_copied_entries(self, table, entries: list) -> None:
+        """Makes entries inserted with the COPY command persistent in the session"""
+        expired_attributes = [column.key for column in table.__table__.columns
+                              if column not in self._copied_columns(table)]
+        for entry in entries:
+            sqlalchemy.orm.make_transient_to_detached(entry)
+            self.session.add(entry)
+            if expired_attributes:
+                self.session.expire(entry, expired_attributes)
+
+    @staticmethod
+    def _copied_columns(table) -> List[sqlalchemy.Column]:
+        """Lists the columns of a database table filled by the COPY command, i.e. all except those with a
+        server-side default that is an SQL expression"""
+        return [column for column in table.__table__.columns
+                if column.server_default is None or isinstance(column.server_default.arg, str)]
+
+    @classmethod
+    def write_copy_row(cls, buffer: io.StringIO, values: Iterable) -> None:
+        """Writes a row in the text format of the PostgreSQL COPY command into a buffer"""
+        buffer.write("\t".join(cls._copy_text(value) for value in values) + "\n")
+
+    @staticmethod
+    def _copy_text(value) -> str:
+        """Converts a value into the text format of the PostgreSQL COPY command"""
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
 
 class ChadoClient(IOClient):
     """Class for import/export operations on Chado databases"""
@@ -72,6 +177,12 @@ class ChadoClient(IOClient):
         # Set up printer
         self.printer = utils.VerbosePrinter(verbose)
 
+        # Lookup caches are disabled by default
+        self._lookup_caches = {}                                        # type: Dict[type, utils.LRUCache]
+
+        # Create a container for the CV terms of ontologies, keyed by database authority and accession
+        self._ontology_term_maps = {}               # type: Dict[str, Tuple[general.Db, Dict[str, Tuple[int, str]]]]
+
     def query_feature_relationship_by_type(self, subject_id: int, type_ids: List[int]) -> sqlalchemy.orm.Query:
         """Creates a query to select entries with specific 'type_id' from the feature_relationship table"""
         return self.session.query(sequence.FeatureRelationship)\
@@ -100,6 +211,12 @@ class ChadoClient(IOClient):
             .filter(sequence.FeatureCvTerm.feature_id == feature_id)\
             .filter(general.DbxRef.db_id == ontology_id)
 
+    def query_ontology_terms(self, ontology_id: int) -> sqlalchemy.orm.Query:
+        """Creates a query to select the accessions of all dbxrefs of an ontology, together with their CV terms"""
+        return self.session.query(general.DbxRef.accession, cv.CvTerm.cvterm_id, cv.CvTerm.name)\
+            .outerjoin(cv.CvTerm, cv.CvTerm.dbxref_id == general.DbxRef.dbxref_id)\
+            .filter(general.DbxRef.db_id == ontology_id)
+
     def query_feature_cvterm_by_ontology_and_organism(self, organism_id: int, ontology_id: int
                                                       ) -> sqlalchemy.orm.Query:
         """Creates a query to select ontology terms associated with feature of a given organism"""
@@ -110,6 +227,50 @@ class ChadoClient(IOClient):
             .filter(sequence.Feature.organism_id == organism_id)\
             .filter(general.DbxRef.db_id == ontology_id)
 
+    def query_feature_relationship_by_type_and_organism(self, organism_id: int, type_ids: List[int]
+                                                        ) -> sqlalchemy.orm.Query:
+        """Creates a query to select relationships with specific 'type_id' of features of a given organism"""
+        return self.session.query(sequence.FeatureRelationship)\
+            .join(sequence.Feature, sequence.FeatureRelationship.subject)\
+            .filter(sequence.Feature.organism_id == organism_id)\
+            .filter(sequence.FeatureRelationship.type_id.in_(type_ids))
+
+    def query_featureprop_by_type_and_organism(self, organism_id: int, type_ids: List[int]) -> sqlalchemy.orm.Query:
+        """Creates a query to select properties with specific 'type_id' of features of a given organism"""
+        return self.session.query(sequence.FeatureProp)\
+            .join(sequence.Feature, sequence.FeatureProp.feature)\
+            .filter(sequence.Feature.organism_id == organism_id)\
+            .filter(sequence.FeatureProp.type_id.in_(type_ids))
+
+    def query_featureprop_values_by_type_and_organism(self, organism_id: int, type_id: int) -> sqlalchemy.orm.Query:
+        """Creates a query to select the feature IDs and values of properties with a specific 'type_id' of features of
+        a given organism"""
+        return self.session.query(sequence.FeatureProp.feature_id, sequence.FeatureProp.value)\
+            .join(sequence.Feature, sequence.FeatureProp.feature)\
+            .filter(sequence.Feature.organism_id == organism_id)\
+            .filter(sequence.FeatureProp.type_id == type_id)
+
+    def query_feature_synonym_by_type_and_organism(self, organism_id: int, type_ids: List[int]
+                                                   ) -> sqlalchemy.orm.Query:
+        """Creates a query to select synonyms with specific 'synonym.type_id' of features of a given organism"""
+        return self.session.query(sequence.FeatureSynonym)\
+            .join(sequence.Feature, sequence.FeatureSynonym.feature)\
+            .join(sequence.Synonym, sequence.FeatureSynonym.synonym)\
+            .filter(sequence.Feature.organism_id == organism_id)\
+            .filter(sequence.Synonym.type_id.in_(type_ids))
+
+    def query_feature_dbxref_by_organism(self, organism_id: int) -> sqlalchemy.orm.Query:
+        """Creates a query to select cross references of features of a given organism"""
+        return self.session.query(sequence.FeatureDbxRef)\
+            .join(sequence.Feature, sequence.FeatureDbxRef.feature)\
+            .filter(sequence.Feature.organism_id == organism_id)
+
+    def query_feature_pub_by_organism(self, organism_id: int) -> sqlalchemy.orm.Query:
+        """Creates a query to select publications of features of a given organism"""
+        return self.session.query(sequence.FeaturePub)\
+            .join(sequence.Feature, sequence.FeaturePub.feature)\
+            .filter(sequence.Feature.organism_id == organism_id)
+
     def query_parent_features(self, subject_id: int, type_ids: List[int]) -> sqlalchemy.orm.Query:
         """Creates a query to select the parent feature(s) of a given feature"""
         return self.session.query(sequence.Feature)\
@@ -128,12 +289,88 @@ class ChadoClient(IOClient):
             .filter(sequence.FeatureRelationship.object_id == object_id)\
             .order_by(sequence.Feature.uniquename)
 
-    def query_features_by_srcfeature(self, sequence_id: int) -> sqlalchemy.orm.Query:
-        """Creates a query to select the features located on a given sequence"""
-        return self.session.query(sequence.Feature).select_from(sequence.FeatureLoc)\
+    def query_features_by_srcfeature(self, sequence_id: int, regions: List[Tuple[int, int]] = None
+                                     ) -> sqlalchemy.orm.Query:
+        """Creates a query to select the features located on a given sequence, or only those overlapping given regions
+        of it in 0-based, half-open coordinates"""
+        query = self.session.query(sequence.Feature).select_from(sequence.FeatureLoc)\
             .join(sequence.Feature, sequence.FeatureLoc.feature)\
-            .filter(sequence.FeatureLoc.srcfeature_id == sequence_id)\
-            .order_by(sequence.FeatureLoc.fmin)
+            .filter(sequence.FeatureLoc.srcfeature_id == sequence_id)
+        if regions:
+            query = query.filter(self.featureloc_overlaps_regions(sequence_id, regions))
+        return query.order_by(sequence.FeatureLoc.fmin, sequence.Feature.uniquename.collate("C"))
+
+    def query_located_features(self, feature_ids: sqlalchemy.orm.Query, sequence_ids: List[int]
+                               ) -> sqlalchemy.orm.Query:
+        """Creates a query to select the features with given IDs that are located on given sequences, together with
+        the IDs of these sequences"""
+        return self.session.query(sequence.FeatureLoc.srcfeature_id, sequence.Feature)\
+            .select_from(sequence.FeatureLoc)\
+            .join(sequence.Feature, sequence.FeatureLoc.feature)\
+            .filter(sequence.FeatureLoc.feature_id.in_(feature_ids))\
+            .filter(sequence.FeatureLoc.srcfeature_id.in_(sequence_ids))\
+            .order_by(sequence.FeatureLoc.fmin, sequence.Feature.uniquename.collate("C"))
+
+    def query_feature_ids_by_regions(self, regions: Dict[int, List[Tuple[int, int]]]) -> sqlalchemy.orm.Query:
+        """Creates a query to select the IDs of features located on given sequences, or only in given regions of them
+        in 0-based, half-open coordinates"""
+        conditions = []
+        for sequence_id, sequence_regions in regions.items():
+            if sequence_regions:
+                conditions.append(self.featureloc_overlaps_regions(sequence_id, sequence_regions))
+            else:
+                conditions.append(sequence.FeatureLoc.srcfeature_id == sequence_id)
+        return self.session.query(sequence.FeatureLoc.feature_id)\
+            .filter(sqlalchemy.or_(*conditions))
+
+    @staticmethod
+    def featureloc_overlaps_regions(sequence_id: int, regions: List[Tuple[int, int]]) -> sqlalchemy.sql.ClauseElement:
+        """Creates a condition selecting the feature locations that overlap given regions of a sequence in 0-based,
+        half-open coordinates. The overlap of boxes spanning the locations is checked first, as it is supported by a
+        GiST index on the 'featureloc' table."""
+        location_box = sqlalchemy.func.box(
+            sqlalchemy.func.point(sequence.FeatureLoc.srcfeature_id, sequence.FeatureLoc.fmin),
+            sqlalchemy.func.point(sequence.FeatureLoc.srcfeature_id, sequence.FeatureLoc.fmax))
+        conditions = []
+        for start, end in regions:
+            region_box = sqlalchemy.func.box(sqlalchemy.func.point(sequence_id, start),
+                                             sqlalchemy.func.point(sequence_id, end))
+            conditions.append(sqlalchemy.and_(location_box.op("&&")(region_box), sequence.FeatureLoc.fmin < end,
+                                              sequence.FeatureLoc.fmax > start))
+        return sqlalchemy.or_(*conditions)
+
+    @staticmethod
+    def group_regions_by_sequence(regions: List[Tuple[str, int, int]]) -> Dict[str, List[Tuple[int, int]]]:
+        """Groups genomic regions (seqid, start, end) by sequence, with an empty list for entire sequences"""
+        grouped_regions = {}
+        for seqid, start, end in regions:
+            if start is None or end is None:
+                grouped_regions[seqid] = []
+            elif seqid not in grouped_regions or grouped_regions[seqid]:
+                grouped_regions.setdefault(seqid, []).append((start, end))
+        return grouped_regions
+
+    def query_feature_residues(self, feature_id: int, start: int = None, end: int = None) -> sqlalchemy.orm.Query:
+        """Creates a query to select the sequence of a feature, or a section of it in 0-based, half-open coordinates"""
+        residues = sequence.Feature.residues
+        if start is not None and end is not None:
+            residues = sqlalchemy.func.substr(residues, start + 1, max(end - start, 0))
+        elif start is not None:
+            residues = sqlalchemy.func.substr(residues, start + 1)
+        elif end is not None:
+            residues = sqlalchemy.func.substr(residues, 1, max(end, 0))
+        return self.session.query(residues).filter(sequence.Feature.feature_id == feature_id)
+
+    def query_feature_locations(self, feature_ids: sqlalchemy.orm.Query, srcfeature_id: int) -> sqlalchemy.orm.Query:
+        """Creates a query to select the features with given IDs located on a given sequence, together with their
+        locations, ordered by the names of the features"""
+        return self.session.query(sequence.Feature, sequence.FeatureLoc.fmin, sequence.FeatureLoc.fmax,
+                                  sequence.FeatureLoc.strand)\
+            .select_from(sequence.FeatureLoc)\
+            .join(sequence.Feature, sequence.FeatureLoc.feature)\
+            .filter(sequence.FeatureLoc.srcfeature_id == srcfeature_id)\
+            .filter(sequence.FeatureLoc.feature_id.in_(feature_ids))\
+            .order_by(sequence.Feature.uniquename, sequence.FeatureLoc.locgroup, sequence.FeatureLoc.rank)
 
     def query_features_by_property_type(self, organism_id: int, type_id: int) -> sqlalchemy.orm.Query:
         """Creates a query to select features of a given organism that have certain properties"""
@@ -149,9 +386,9 @@ class ChadoClient(IOClient):
             .filter(sequence.Feature.organism_id == organism_id)\
             .filter(sequence.Feature.type_id.in_(type_ids))
 
-    def query_protein_features(self, organism_id: int, gene_type_id: int, part_of_id: int, derives_from_id: int
-                               ) -> sqlalchemy.orm.Query:
-        """Creates a query to select protein features of a given organism"""
+    def query_protein_features(self, organism_id: int, gene_type_id: int, part_of_id: int, derives_from_id: int,
+                               gene_ids: sqlalchemy.orm.Query = None) -> sqlalchemy.orm.Query:
+        """Creates a query to select protein features of a given organism, or only those of given genes"""
         transcript_feature = sqlalchemy.orm.aliased(sequence.Feature, name="transcript_feature")
         protein_feature = sqlalchemy.orm.aliased(sequence.Feature, name="protein_feature")
         gene_feature = sqlalchemy.orm.aliased(sequence.Feature, name="gene_feature")
@@ -159,7 +396,7 @@ class ChadoClient(IOClient):
             sequence.FeatureRelationship, name="transcript_gene_relationship")
         protein_transcript_relationship = sqlalchemy.orm.aliased(
             sequence.FeatureRelationship, name="protein_transcript_relationship")
-        return self.session.query(protein_feature)\
+        query = self.session.query(protein_feature)\
             .join(protein_transcript_relationship,
                   protein_transcript_relationship.subject_id == protein_feature.feature_id)\
             .join(transcript_feature, protein_transcript_relationship.object)\
@@ -170,6 +407,9 @@ class ChadoClient(IOClient):
             .filter(protein_transcript_relationship.type_id == derives_from_id)\
             .filter(transcript_gene_relationship.type_id == part_of_id)\
             .filter(gene_feature.type_id == gene_type_id)
+        if gene_ids is not None:
+            query = query.filter(gene_feature.feature_id.in_(gene_ids))
+        return query
 
     def query_feature_properties(self, feature_id: int) -> sqlalchemy.orm.Query:
         """Creates a query to select key-value pairs from the 'featureprop' table"""
@@ -211,6 +451,120 @@ class ChadoClient(IOClient):
             .filter(sequence.FeatureCvTerm.feature_id == feature_id)\
             .filter(general.Db.db_id == ontology_id)
 
+    def query_feature_tree(self, feature_ids: List[int], type_ids: List[int]) -> sqlalchemy.orm.Query:
+        """Creates a query to select the IDs of given features and of all their descendants, i.e. features linked to
+        them by a chain of relationships with specific 'type_id'"""
+        feature_tree = self.session.query(sequence.Feature.feature_id)\
+            .filter(sequence.Feature.feature_id.in_(feature_ids))\
+            .cte("feature_tree", recursive=True)
+        child_features = self.session.query(sequence.FeatureRelationship.subject_id)\
+            .join(feature_tree, sequence.FeatureRelationship.object_id == feature_tree.c.feature_id)\
+            .filter(sequence.FeatureRelationship.type_id.in_(type_ids))
+        feature_tree = feature_tree.union(child_features)
+        return self.session.query(feature_tree.c.feature_id)
+
+    def query_feature_ancestors(self, feature_ids: List[int], type_ids: List[int]) -> sqlalchemy.orm.Query:
+        """Creates a query to select the IDs of given features and of all their ancestors, i.e. features linked to
+        them by a chain of relationships with specific 'type_id'"""
+        feature_ancestors = self.session.query(sequence.Feature.feature_id)\
+            .filter(sequence.Feature.feature_id.in_(feature_ids))\
+            .cte("feature_ancestors", recursive=True)
+        parent_features = self.session.query(sequence.FeatureRelationship.object_id)\
+            .join(feature_ancestors, sequence.FeatureRelationship.subject_id == feature_ancestors.c.feature_id)\
+            .filter(sequence.FeatureRelationship.type_id.in_(type_ids))
+        feature_ancestors = feature_ancestors.union(parent_features)
+        return self.session.query(feature_ancestors.c.feature_id)
+
+    def query_features_by_ids(self, feature_ids: sqlalchemy.orm.Query) -> sqlalchemy.orm.Query:
+        """Creates a query to select the features with given IDs, together with the names of their types"""
+        return self.session.query(sequence.Feature, cv.CvTerm.name)\
+            .join(cv.CvTerm, sequence.Feature.type)\
+            .filter(sequence.Feature.feature_id.in_(feature_ids))
+
+    def query_featurelocs_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query) -> sqlalchemy.orm.Query:
+        """Creates a query to select the locations of the features with given IDs"""
+        return self.session.query(sequence.FeatureLoc)\
+            .filter(sequence.FeatureLoc.feature_id.in_(feature_ids))\
+            .order_by(sequence.FeatureLoc.featureloc_id)
+
+    def query_polypeptide_residues_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query) -> sqlalchemy.orm.Query:
+        """Creates a query to select the amino acid sequences of the polypeptides among the features with given IDs"""
+        return self.session.query(sequence.Feature.feature_id, sequence.Feature.residues)\
+            .join(cv.CvTerm, sequence.Feature.type)\
+            .filter(sequence.Feature.feature_id.in_(feature_ids))\
+            .filter(cv.CvTerm.name == "polypeptide")
+
+    def query_feature_relationships_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query, type_ids: List[int]
+                                                   ) -> sqlalchemy.orm.Query:
+        """Creates a query to select the relationships with specific 'type_id' of the features with given IDs to their
+        parents, ordered by the names of the child features"""
+        return self.session.query(sequence.FeatureRelationship.object_id, sequence.FeatureRelationship.type_id,
+                                  sequence.FeatureRelationship.subject_id)\
+            .join(sequence.Feature, sequence.FeatureRelationship.subject)\
+            .filter(sequence.FeatureRelationship.subject_id.in_(feature_ids))\
+            .filter(sequence.FeatureRelationship.type_id.in_(type_ids))\
+            .order_by(sequence.Feature.uniquename)
+
+    def query_child_feature_ids(self, feature_ids: sqlalchemy.orm.Query, type_ids: List[int]) -> sqlalchemy.orm.Query:
+        """Creates a query to select the IDs of those of given features that have parents, i.e. are subjects of
+        relationships with specific 'type_id'"""
+        return self.session.query(sequence.FeatureRelationship.subject_id)\
+            .filter(sequence.FeatureRelationship.subject_id.in_(feature_ids))\
+            .filter(sequence.FeatureRelationship.type_id.in_(type_ids))\
+            .distinct()
+
+    def query_feature_properties_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query) -> sqlalchemy.orm.Query:
+        """Creates a query to select key-value pairs from the 'featureprop' table for the features with given IDs,
+        ordered by primary key, i.e. in the order of insertion"""
+        return self.session.query(sequence.FeatureProp.feature_id, cv.CvTerm.name, sequence.FeatureProp.value)\
+            .select_from(sequence.FeatureProp)\
+            .join(cv.CvTerm, sequence.FeatureProp.type)\
+            .filter(sequence.FeatureProp.feature_id.in_(feature_ids))\
+            .order_by(sequence.FeatureProp.featureprop_id)
+
+    def query_feature_pubs_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query) -> sqlalchemy.orm.Query:
+        """Creates a query to select entries from the 'pub' table associated with the features with given IDs,
+        ordered by the primary key of the 'feature_pub' table"""
+        return self.session.query(sequence.FeaturePub.feature_id, pub.Pub.uniquename)\
+            .select_from(sequence.FeaturePub)\
+            .join(pub.Pub, sequence.FeaturePub.pub)\
+            .filter(sequence.FeaturePub.feature_id.in_(feature_ids))\
+            .order_by(sequence.FeaturePub.feature_pub_id)
+
+    def query_feature_dbxrefs_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query) -> sqlalchemy.orm.Query:
+        """Creates a query to select dbxrefs associated with the features with given IDs, ordered by the primary key
+        of the 'feature_dbxref' table"""
+        return self.session.query(sequence.FeatureDbxRef.feature_id, general.Db.name, general.DbxRef.accession)\
+            .select_from(sequence.FeatureDbxRef)\
+            .join(general.DbxRef, sequence.FeatureDbxRef.dbxref)\
+            .join(general.Db, general.DbxRef.db)\
+            .filter(sequence.FeatureDbxRef.feature_id.in_(feature_ids))\
+            .order_by(sequence.FeatureDbxRef.feature_dbxref_id)
+
+    def query_feature_synonyms_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query) -> sqlalchemy.orm.Query:
+        """Creates a query to select synonyms associated with the features with given IDs, ordered by the primary key
+        of the 'feature_synonym' table"""
+        return self.session.query(sequence.FeatureSynonym.feature_id, cv.CvTerm.name.label("type"),
+                                  sequence.Synonym.name.label("synonym"))\
+            .select_from(sequence.FeatureSynonym)\
+            .join(sequence.Synonym, sequence.FeatureSynonym.synonym)\
+            .join(cv.CvTerm, sequence.Synonym.type)\
+            .filter(sequence.FeatureSynonym.feature_id.in_(feature_ids))\
+            .order_by(sequence.FeatureSynonym.feature_synonym_id)
+
+    def query_feature_ontology_terms_by_feature_ids(self, feature_ids: sqlalchemy.orm.Query, ontology_id: int
+                                                    ) -> sqlalchemy.orm.Query:
+        """Creates a query to select ontology terms associated with the features with given IDs, ordered by the
+        primary key of the 'feature_cvterm' table"""
+        return self.session.query(sequence.FeatureCvTerm.feature_id, general.Db.name, general.DbxRef.accession)\
+            .select_from(sequence.FeatureCvTerm)\
+            .join(cv.CvTerm, sequence.FeatureCvTerm.cvterm)\
+            .join(general.DbxRef, cv.CvTerm.dbxref)\
+            .join(general.Db, general.DbxRef.db)\
+            .filter(sequence.FeatureCvTerm.feature_id.in_(feature_ids))\
+            .filter(general.Db.db_id == ontology_id)\
+            .order_by(sequence.FeatureCvTerm.feature_cvterm_id)
+
     def query_feature_cvterm_properties(self, feature_cvterm_id: int) -> sqlalchemy.orm.Query:
         """Creates a query to select key-value pairs from the 'feature_cvtermprop' table"""
         return self.session.query(cv.CvTerm.name, sequence.FeatureCvTermProp.value)\
@@ -346,6 +700,120 @@ class ChadoClient(IOClient):
             all_feature_names.append(feature_name)
         return all_feature_names
 
+    def _load_feature_index(self, organism_entry: organism.Organism) -> Dict[str, Tuple[int, int, bool]]:
+        """Returns the IDs, types and obsolete flags of all features for a given organism, keyed by uniquename"""
+        feature_index = {}
+        for feature_name, feature_id, type_id, is_obsolete in self.session.query(
+                sequence.Feature.uniquename, sequence.Feature.feature_id, sequence.Feature.type_id,
+                sequence.Feature.is_obsolete).filter_by(organism_id=organism_entry.organism_id):
+            feature_index[feature_name] = (feature_id, type_id, is_obsolete)
+        return feature_index
+
+    def enable_lookup_caches(self, max_size=10000) -> None:
+        """Caches the entries of the 'db', 'dbxref', 'pub' and 'synonym' tables by their unique keys"""
+        self._lookup_caches = {table: utils.LRUCache(max_size)
+                               for table in [general.Db, general.DbxRef, pub.Pub, sequence.Synonym]}
+
+    def _query_cached(self, table, **kwargs):
+        """Returns the entry of a table with the given unique key, served from a lookup cache if enabled"""
+        cache = self._lookup_caches.get(table)
+        if cache is None:
+            return self.query_first(table, **kwargs)
+        key = tuple(kwargs.values())
+        entry = cache.get(key)
+        if entry is None:
+            entry = self.query_first(table, **kwargs)
+            if entry:
+                cache.put(key, entry)
+        return entry
+
+    def _add_to_cache(self, entry, *key) -> None:
+        """Adds a newly inserted entry to the lookup cache of its table, if enabled"""
+        cache = self._lookup_caches.get(type(entry))
+        if cache is not None:
+            cache.put(key, entry)
+
+    def _print_lookup_cache_statistics(self) -> None:
+        """Prints the numbers of hits and misses of the lookup caches"""
+        for table, cache in self._lookup_caches.items():
+            self.printer.print("Lookup cache for table '" + table.__tablename__ + "': " + str(cache.hits)
+                               + " hits, " + str(cache.misses) + " misses")
+
+    def _print_peak_memory_usage(self) -> None:
+        """Prints the peak resident memory of the process"""
+        self.printer.print("Peak memory usage: " + str(round(utils.peak_memory_usage(), 1)) + " MB")
+
+    def _resolve_ontology_term(self, db_authority: str, accession: str, ontology_term: str
+                               ) -> Union[None, Tuple[general.Db, int, str]]:
+        """Returns the 'db' entry, and the ID and name of the CV term for an ontology term. All terms of an ontology
+        are loaded in one query when the ontology is first referenced."""
+
+        # Load the terms of the ontology, if not done yet
+        if db_authority not in self._ontology_term_maps:
+            db_entry = self.query_first(general.Db, name=db_authority)
+            term_map = {}
+            if db_entry:
+                for term_accession, cvterm_id, cvterm_name in self.query_ontology_terms(db_entry.db_id):
+                    term_map[term_accession] = (cvterm_id, cvterm_name)
+            self._ontology_term_maps[db_authority] = (db_entry, term_map)
+        (db_entry, term_map) = self._ontology_term_maps[db_authority]
+
+        # Check if all dependencies are met
+        if not db_entry:
+            self.printer.print("WARNING: Ontology '" + db_authority + "' not present in database.")
+            return None
+        if accession not in term_map:
+            self.printer.print("WARNING: Ontology term '" + ontology_term + "' not present in database.")
+            return None
+        (cvterm_id, cvterm_name) = term_map[accession]
+        if cvterm_id is None:
+            self.printer.print("WARNING: CV term for ontology term '" + ontology_term + "' not present in database.")
+            return None
+        return db_entry, cvterm_id, cvterm_name
+
+    @staticmethod
+    def _checkpoint_filename(filename: str) -> str:
+        """Returns the name of the checkpoint file for a given input file"""
+        return filename + ".checkpoint"
+
+    def _read_checkpoint(self, checkpoint_file: str) -> int:
+        """Returns the number of input records committed in a previous run, as recorded in a checkpoint file"""
+        if not os.path.exists(checkpoint_file):
+            self.printer.print("No checkpoint file '" + checkpoint_file + "' present. Starting from the beginning.")
+            return 0
+        with open(checkpoint_file) as checkpoint_handle:
+            content = checkpoint_handle.read().strip()
+        if not content.isdigit():
+            raise InputFileError("Checkpoint file '" + checkpoint_file + "' is corrupt.")
+        self.printer.print("Resuming after " + content + " records committed in a previous run")
+        return int(content)
+
+    @staticmethod
+    def _write_checkpoint(checkpoint_file: str, committed_records: int) -> None:
+        """Records the number of committed input records in a checkpoint file"""
+        temporary_file = checkpoint_file + ".tmp"
+        with open(temporary_file, "w") as checkpoint_handle:
+            checkpoint_handle.write(str(committed_records) + "\n")
+        os.replace(temporary_file, checkpoint_file)
+
+    @staticmethod
+    def _remove_checkpoint(checkpoint_file: str) -> None:
+        """Removes a checkpoint file, if present"""
+        if os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
+
+    def _commit_checkpoint(self, checkpoint_file: str, committed_records: int) -> None:
+        """Commits the changes made so far, and records the number of processed input records in a checkpoint file"""
+
+        # Entries loaded before the commit remain in use, so they are not expired
+        self.session.expire_on_commit = False
+        try:
+            self.session.commit()
+        finally:
+            self.session.expire_on_commit = True
+        self._write_checkpoint(checkpoint_file, committed_records)
+        self.printer.print("Committed the first " + str(committed_records) + " records")
+
     def _handle_organism(self, new_entry: organism.Organism) -> organism.Organism:
         """Inserts or updates an entry in the 'organism' table, and returns it"""
 
@@ -438,7 +906,7 @@ class ChadoClient(IOClient):
         """Inserts or updates an entry in the 'db' table, and returns it"""
 
         # Check if the db is already present in the database
-        existing_entry = self.query_first(general.Db, name=new_entry.name)
+        existing_entry = self._query_cached(general.Db, name=new_entry.name)
         if existing_entry:
 
             # Nothing to update, return existing entry
@@ -447,6 +915,7 @@ class ChadoClient(IOClient):
 
             # Insert new db entry
             self.add_and_flush(new_entry)
+            self._add_to_cache(new_entry, new_entry.name)
             self.printer.print("Inserted db '" + new_entry.name + "'")
             return new_entry
 
@@ -454,7 +923,7 @@ class ChadoClient(IOClient):
         """Inserts or updates an entry in the 'dbxref' table, and returns it"""
 
         # Check if the dbxref is already present in the database
-        existing_entry = self.query_first(general.DbxRef, db_id=new_entry.db_id, accession=new_entry.accession)
+        existing_entry = self._query_cached(general.DbxRef, db_id=new_entry.db_id, accession=new_entry.accession)
         if existing_entry:
 
             # Nothing to update, return existing entry
@@ -463,6 +932,7 @@ class ChadoClient(IOClient):
 
             # Insert new db entry
             self.add_and_flush(new_entry)
+            self._add_to_cache(new_entry, new_entry.db_id, new_entry.accession)
             self.printer.print("Inserted dbxref '" + db_authority + "." + new_entry.accession + "'")
             return new_entry
 
@@ -510,8 +980,7 @@ class ChadoClient(IOClient):
         """Inserts or updates an entry in the 'feature' table and returns it"""
 
         # Check if the feature is already present in the database
-        existing_entry = self.query_first(sequence.Feature, organism_id=new_entry.organism_id,
-                                          uniquename=new_entry.uniquename)
+        existing_entry = self._find_feature(new_entry.organism_id, new_entry.uniquename)
         if existing_entry:
 
             # Check if the entries in database and file have the same properties, and update if not
@@ -526,11 +995,19 @@ class ChadoClient(IOClient):
             self.printer.print("Inserted feature '" + new_entry.uniquename + "' for organism '" + organism_name + "'")
             return new_entry
 
+    def _find_feature(self, organism_id: int, uniquename: str) -> Union[None, sequence.Feature]:
+        """Returns the entry of the 'feature' table with a given uniquename, if present"""
+        return self.query_first(sequence.Feature, organism_id=organism_id, uniquename=uniquename)
+
+    def _find_featureloc(self, feature_id: int) -> Union[None, sequence.FeatureLoc]:
+        """Returns the entry of the 'featureloc' table for a given feature, if present"""
+        return self.query_first(sequence.FeatureLoc, feature_id=feature_id)
+
     def _handle_featureloc(self, new_entry: sequence.FeatureLoc, feature_name="") -> sequence.FeatureLoc:
         """Inserts or updates an entry in the 'featureloc' table, and returns it"""
 
         # Check if the featureloc is already present in the database
-        existing_entry = self.query_first(sequence.FeatureLoc, feature_id=new_entry.feature_id)
+        existing_entry = self._find_featureloc(new_entry.feature_id)
         if existing_entry:
 
             # Check if the entries in database and file have the same properties, and update if not
@@ -569,6 +1046,16 @@ class ChadoClient(IOClient):
                                + feature_name + "'")
             return new_entry
 
+    def _mark_as_top_level_sequence(self, feature_entry: sequence.Feature) -> sequence.FeatureProp:
+        """Inserts or updates an entry in the 'featureprop' table and returns it"""
+        existing_featureprops = self.query_all(sequence.FeatureProp, feature_id=feature_entry.feature_id)
+        new_featureprop_entry = sequence.FeatureProp(feature_id=feature_entry.feature_id,
+                                                     type_id=self._top_level_term.cvterm_id, value="true")
+        featureprop_entry = self._handle_featureprop(new_featureprop_entry, existing_featureprops,
+                                                     self._top_level_term.name, new_featureprop_entry.value,
+                                                     feature_entry.uniquename)
+        return featureprop_entry
+
     def _delete_featureprop(self, new_entries: List[sequence.FeatureProp],
                             existing_entries: List[sequence.FeatureProp], feature_name=""
                             ) -> List[sequence.FeatureProp]:
@@ -730,7 +1217,7 @@ class ChadoClient(IOClient):
         """Inserts or updates an entry in the 'synonym' table, and returns it"""
 
         # Check if the synonym is already present in the database
-        existing_entry = self.query_first(sequence.Synonym, name=new_entry.name, type_id=new_entry.type_id)
+        existing_entry = self._query_cached(sequence.Synonym, name=new_entry.name, type_id=new_entry.type_id)
         if existing_entry:
 
             # Check if the entries in database and file have the same properties, and update if not
@@ -741,6 +1228,7 @@ class ChadoClient(IOClient):
 
             # Insert a new synonym entry
             self.add_and_flush(new_entry)
+            self._add_to_cache(new_entry, new_entry.name, new_entry.type_id)
             self.printer.print("Inserted synonym '" + new_entry.name + "'.")
             return new_entry
 
@@ -792,7 +1280,7 @@ class ChadoClient(IOClient):
         """Inserts or updates an entry in the 'pub' table, and returns it"""
 
         # Check if the publication is already present in the database
-        existing_entry = self.query_first(pub.Pub, uniquename=new_entry.uniquename)
+        existing_entry = self._query_cached(pub.Pub, uniquename=new_entry.uniquename)
         if existing_entry:
 
             # Check if the entries in database and file have the same properties, and update if not
@@ -803,6 +1291,7 @@ class ChadoClient(IOClient):
 
             # Insert a new feature_synonym entry
             self.add_and_flush(new_entry)
+            self._add_to_cache(new_entry, new_entry.uniquename)
             self.printer.print("Inserted publication '" + new_entry.uniquename + "'")
             return new_entry
 
@@ -916,6 +1405,33 @@ class ChadoClient(IOClient):
             self.printer.print("Marked feature '" + feature_entry.uniquename + "' as obsolete")
         return feature_entry
 
+    def _mark_features_as_obsolete(self, organism_entry: organism.Organism, retained_names: Iterable[str]
+                                   ) -> List[str]:
+        """Marks all features of an organism as obsolete, except those with given uniquenames, in a single statement.
+        Returns the uniquenames of the features marked."""
+
+        # Load the uniquenames of the retained features into a temporary table
+        self.session.flush()
+        self.copy_into_temporary_table("retained_feature", ["uniquename VARCHAR PRIMARY KEY"],
+                                       ((name,) for name in retained_names))
+
+        # Mark all other features as obsolete
+        feature_table = sequence.Feature.__table__
+        retained_table = sqlalchemy.table("retained_feature", sqlalchemy.column("uniquename"))
+        statement = feature_table.update()\
+            .where(feature_table.c.organism_id == organism_entry.organism_id)\
+            .where(sqlalchemy.not_(feature_table.c.is_obsolete))\
+            .where(~sqlalchemy.exists().where(retained_table.c.uniquename == feature_table.c.uniquename))\
+            .values(is_obsolete=True)\
+            .returning(feature_table.c.uniquename)
+        obsolete_names = sorted(row[0] for row in self.session.execute(statement))
+        self.drop_temporary_table("retained_feature")
+
+        # Report the features marked as obsolete
+        for feature_name in obsolete_names:
+            self.printer.print("Marked feature '" + feature_name + "' as obsolete")
+        return obsolete_names
+
     @staticmethod
     def update_organism_properties(existing_entry: organism.Organism, new_entry: organism.Organism) -> bool:
         """Updates the properties of an organism entry in the database"""
@@ -15,7 +15,7 @@ class Feature(base.PublicBase):
         organism.Organism.organism_id, onupdate="CASCADE", ondelete="CASCADE"), nullable=False)
     name = sqlalchemy.Column(sqlalchemy.VARCHAR(255), nullable=True)
     uniquename = sqlalchemy.Column(sqlalchemy.TEXT, nullable=False)
-    residues = sqlalchemy.Column(sqlalchemy.TEXT, nullable=True)
+    residues = sqlalchemy.orm.deferred(sqlalchemy.Column(sqlalchemy.TEXT, nullable=True))
     seqlen = sqlalchemy.Column(sqlalchemy.BIGINT, nullable=True)
     md5checksum = sqlalchemy.Column(sqlalchemy.CHAR(32), nullable=True)
     type_id = sqlalchemy.Column(sqlalchemy.BIGINT, sqlalchemy.ForeignKey(
@@ -34,7 +34,8 @@ class Feature(base.PublicBase):
                       sqlalchemy.Index("feature_idx2", organism_id),
                       sqlalchemy.Index("feature_idx3", type_id),
                       sqlalchemy.Index("feature_idx4", uniquename),
-                      sqlalchemy.Index("feature_idx5", sqlalchemy.func.lower(name)))
+                      sqlalchemy.Index("feature_idx5", sqlalchemy.func.lower(name)),
+                      sqlalchemy.Index("feature_idx6", timelastmodified))
 
     # Relationships
     dbxref = sqlalchemy.orm.relationship(general.DbxRef, foreign_keys=dbxref_id, backref="feature_dbxref")
@@ -529,7 +530,10 @@ class FeatureLoc(base.PublicBase):
                       sqlalchemy.CheckConstraint("fmin <= fmax", name="featureloc_c2"),
                       sqlalchemy.Index("featureloc_idx1", feature_id),
                       sqlalchemy.Index("featureloc_idx2", srcfeature_id),
-                      sqlalchemy.Index("featureloc_idx3", srcfeature_id, fmin, fmax))
+                      sqlalchemy.Index("featureloc_idx3", srcfeature_id, fmin, fmax),
+                      sqlalchemy.Index("featureloc_idx4", sqlalchemy.func.box(
+                          sqlalchemy.func.point(srcfeature_id, fmin), sqlalchemy.func.point(srcfeature_id, fmax)),
+                                       postgresql_using="gist"))
 
     # Relationships
     feature = sqlalchemy.orm.relationship(Feature, foreign_keys=feature_id, backref="featureloc_feature")
@@ -212,15 +212,29 @@ def run_import_command(specifier: str, arguments, uri: str) -> None:
         client = ontology.OntologyClient(uri, arguments.verbose)
         client.load(file, arguments.format, arguments.database_authority)
     elif specifier == "gff":
+        if arguments.staging and not arguments.fresh_load and (arguments.jobs > 1 or arguments.commit_interval
+                                                                or arguments.commit_per_sequence or arguments.resume):
+            # Updates via staging tables are merged in a single process and transaction. Return without further action
+            print("Options '--jobs', '--commit_interval', '--commit_per_sequence' and '--resume' cannot be combined "
+                  "with option '--staging'.")
+            return
+        if arguments.jobs > 1 and (arguments.commit_interval or arguments.commit_per_sequence or arguments.resume):
+            # Parallel processes each commit their changes at the end. Return without further action
+            print("Options '--commit_interval', '--commit_per_sequence' and '--resume' cannot be combined with option "
+                  "'--jobs'.")
+            return
         client = gff.GFFImportClient(uri, arguments.verbose)
         client.load(file, arguments.organism, arguments.fasta, arguments.sequence_type, arguments.fresh_load,
-                    arguments.force, arguments.full_genome, arguments.full_attributes)
+                    arguments.force, arguments.full_genome, arguments.full_attributes, arguments.jobs,
+                    arguments.commit_interval, arguments.commit_per_sequence, arguments.resume, arguments.staging,
+                    arguments.skip_unchanged)
     elif specifier == "fasta":
         client = fasta.FastaImportClient(uri, arguments.verbose)
-        client.load(file, arguments.organism, arguments.sequence_type)
+        client.load(file, arguments.organism, arguments.sequence_type, arguments.commit_interval, arguments.resume)
     elif specifier == "gaf":
         client = gaf.GAFImportClient(uri, arguments.verbose)
-        client.load(file, arguments.organism, arguments.annotation_level)
+        client.load(file, arguments.organism, arguments.annotation_level, arguments.commit_interval,
+                    arguments.resume)
     else:
         print("Functionality 'import " + specifier + "' is not yet implemented.")
 
@@ -230,11 +244,24 @@ def run_export_command(specifier: str, arguments, uri: str) -> None:
     if specifier == "fasta":
         client = fasta.FastaExportClient(uri, arguments.verbose)
         client.export(arguments.output_file, arguments.organism, arguments.sequence_type, arguments.release,
-                      arguments.include_obsolete)
+                      arguments.include_obsolete, arguments.regions)
     elif specifier == "gff":
+        if arguments.previous_file and (arguments.jobs > 1 or arguments.regions):
+            # Incremental exports run in a single process and cover all sequences. Return without further action
+            print("Options '--jobs' and '--region' cannot be combined with option '--previous_file'.")
+            return
+        if arguments.since and not arguments.previous_file:
+            # The time of a previous export is only meaningful together with that export. Return without further action
+            print("Option '--since' requires option '--previous_file'.")
+            return
         client = gff.GFFExportClient(uri, arguments.verbose)
-        client.export(arguments.output_file, arguments.organism, arguments.export_fasta, arguments.fasta_file,
-                      arguments.include_obsolete)
+        if arguments.previous_file:
+            client.export_incremental(arguments.output_file, arguments.previous_file, arguments.since,
+                                      arguments.organism, arguments.export_fasta, arguments.fasta_file,
+                                      arguments.include_obsolete)
+        else:
+            client.export(arguments.output_file, arguments.organism, arguments.export_fasta, arguments.fasta_file,
+                          arguments.include_obsolete, arguments.jobs, arguments.regions)
     elif specifier == "gaf":
         client = gaf.GAFExportClient(uri, arguments.verbose)
         client.export(arguments.output_file, arguments.organism, arguments.database_authority,
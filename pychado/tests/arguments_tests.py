@@ -320,7 +320,9 @@ class TestArguments(unittest.TestCase):
     def test_import_gff_args(self):
         # Tests if the command line arguments for the subcommand 'chado import gff' are parsed correctly
         args = ["chado", "import", "gff", "-f", "testfile", "-a", "testorganism", "--fasta", "testfasta",
-                "-t", "contig", "--fresh_load", "--force", "--full_genome", "--full_attributes", "testdb"]
+                "-t", "contig", "--fresh_load", "--force", "--full_genome", "--full_attributes", "--jobs", "4",
+                "--commit_interval", "1000", "--commit_per_sequence", "--resume", "--staging", "--skip_unchanged",
+                "testdb"]
         parsed_args = vars(chado_tools.parse_arguments(args))
         self.assertEqual(parsed_args["input_file"], "testfile")
         self.assertEqual(parsed_args["organism"], "testorganism")
@@ -330,6 +332,12 @@ class TestArguments(unittest.TestCase):
         self.assertTrue(parsed_args["force"])
         self.assertTrue(parsed_args["full_genome"])
         self.assertTrue(parsed_args["full_attributes"])
+        self.assertEqual(parsed_args["jobs"], 4)
+        self.assertEqual(parsed_args["commit_interval"], 1000)
+        self.assertTrue(parsed_args["commit_per_sequence"])
+        self.assertTrue(parsed_args["resume"])
+        self.assertTrue(parsed_args["staging"])
+        self.assertTrue(parsed_args["skip_unchanged"])
         self.assertEqual(parsed_args["dbname"], "testdb")
 
         # Test the default values / alternatives
@@ -340,23 +348,35 @@ class TestArguments(unittest.TestCase):
         self.assertFalse(parsed_args["force"])
         self.assertFalse(parsed_args["full_genome"])
         self.assertFalse(parsed_args["full_attributes"])
+        self.assertEqual(parsed_args["jobs"], 1)
+        self.assertEqual(parsed_args["commit_interval"], 0)
+        self.assertFalse(parsed_args["commit_per_sequence"])
+        self.assertFalse(parsed_args["resume"])
+        self.assertFalse(parsed_args["staging"])
+        self.assertFalse(parsed_args["skip_unchanged"])
 
     def test_import_fasta_args(self):
         # Tests if the command line arguments for the subcommand 'chado import fasta' are parsed correctly
-        args = ["chado", "import", "fasta", "-f", "testfile", "-a", "testorganism", "-t", "contig", "testdb"]
+        args = ["chado", "import", "fasta", "-f", "testfile", "-a", "testorganism", "-t", "contig",
+                "--commit_interval", "10", "--resume", "testdb"]
         parsed_args = vars(chado_tools.parse_arguments(args))
         self.assertEqual(parsed_args["input_file"], "testfile")
         self.assertEqual(parsed_args["organism"], "testorganism")
         self.assertEqual(parsed_args["sequence_type"], "contig")
+        self.assertEqual(parsed_args["commit_interval"], 10)
+        self.assertTrue(parsed_args["resume"])
         self.assertEqual(parsed_args["dbname"], "testdb")
 
     def test_import_gaf_args(self):
         # Tests if the command line arguments for the subcommand 'chado import gaf' are parsed correctly
-        args = ["chado", "import", "gaf", "-f", "testfile", "-a", "testorganism", "-L", "protein", "testdb"]
+        args = ["chado", "import", "gaf", "-f", "testfile", "-a", "testorganism", "-L", "protein",
+                "--commit_interval", "10", "--resume", "testdb"]
         parsed_args = vars(chado_tools.parse_arguments(args))
         self.assertEqual(parsed_args["input_file"], "testfile")
         self.assertEqual(parsed_args["organism"], "testorganism")
         self.assertEqual(parsed_args["annotation_level"], "protein")
+        self.assertEqual(parsed_args["commit_interval"], 10)
+        self.assertTrue(parsed_args["resume"])
         self.assertEqual(parsed_args["dbname"], "testdb")
 
     def test_export_fasta_args(self):
@@ -369,18 +389,33 @@ class TestArguments(unittest.TestCase):
         self.assertEqual(parsed_args["sequence_type"], "proteins")
         self.assertEqual(parsed_args["release"], "testrelease")
         self.assertFalse(parsed_args["include_obsolete"])
+        self.assertIsNone(parsed_args["regions"])
         self.assertEqual(parsed_args["dbname"], "testdb")
 
     def test_export_gff_args(self):
         # Tests if the command line arguments for the subcommand 'chado export gff' are parsed correctly
         args = ["chado", "export", "gff", "-f", "testfile", "-a", "testorganism", "--export_fasta", "--fasta_file",
-                "testfasta", "testdb"]
+                "testfasta", "--jobs", "4", "--region", "chr1:101-200", "--region", "chr2", "testdb"]
         parsed_args = vars(chado_tools.parse_arguments(args))
         self.assertEqual(parsed_args["output_file"], "testfile")
         self.assertEqual(parsed_args["organism"], "testorganism")
         self.assertTrue(parsed_args["export_fasta"])
         self.assertEqual(parsed_args["fasta_file"], "testfasta")
         self.assertFalse(parsed_args["include_obsolete"])
+        self.assertEqual(parsed_args["jobs"], 4)
+        self.assertEqual(parsed_args["regions"], [("chr1", 100, 200), ("chr2", None, None)])
+        self.assertIsNone(parsed_args["previous_file"])
+        self.assertIsNone(parsed_args["since"])
+        self.assertEqual(parsed_args["dbname"], "testdb")
+
+    def test_export_gff_incremental_args(self):
+        # Tests if the command line arguments for an incremental 'chado export gff' are parsed correctly
+        args = ["chado", "export", "gff", "-f", "testfile", "-a", "testorganism", "--previous_file", "previousfile",
+                "--since", "2019-01-31 12:00", "testdb"]
+        parsed_args = vars(chado_tools.parse_arguments(args))
+        self.assertEqual(parsed_args["output_file"], "testfile")
+        self.assertEqual(parsed_args["previous_file"], "previousfile")
+        self.assertEqual(parsed_args["since"], "2019-01-31 12:00")
         self.assertEqual(parsed_args["dbname"], "testdb")
 
     def test_export_gaf_args(self):
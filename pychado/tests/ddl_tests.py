@@ -206,6 +206,17 @@ class SetupTests(unittest.TestCase):
         res = self.client.function_exists("inexistent_schema", "now")
         self.assertFalse(res)
 
+    def test_index_exists(self):
+        # Tests the function that checks if an index exists
+        sqlalchemy.schema.DDL("CREATE TABLE testtable(id INTEGER, data VARCHAR(255))").execute(self.client.engine)
+        res = self.client.index_exists("public", "testindex")
+        self.assertFalse(res)
+        sqlalchemy.schema.DDL("CREATE INDEX testindex ON testtable(id)").execute(self.client.engine)
+        res = self.client.index_exists("public", "testindex")
+        self.assertTrue(res)
+        res = self.client.index_exists("audit", "testindex")
+        self.assertFalse(res)
+
     def test_role_exists(self):
         # Tests the function that checks if a role exists
         res = self.client.role_exists("postgres")
@@ -302,6 +313,7 @@ class SetupTests(unittest.TestCase):
         self.assertEqual(len(audit_tables), 1)
         audit_table = audit_tables[0]
         self.assertEqual(len(audit_table.columns), 6)
+        self.assertEqual([index.name for index in audit_table.indexes], ["newtable_time_idx"])
         for column in audit_table.columns:
             if column.name == "idcolumn":
                 self.assertFalse(column.primary_key)
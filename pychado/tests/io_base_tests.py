@@ -1,3 +1,6 @@
+import io
+import os
+import tempfile
 import unittest
 import sqlalchemy.ext.declarative
 from .. import dbutils, utils
@@ -86,6 +89,84 @@ class TestIOClient(unittest.TestCase):
         full_table = self.client.query_all(Species)
         self.assertEqual(len(full_table), 3)
 
+    def test_stream_results(self):
+        # Tests the function iterating over the results of a query fetched in batches from a server-side cursor
+        for name in ["human", "diplodocus", "bumblebee"]:
+            self.client.insert_into_table(Species, name=name, clade="", legs=0, extinct=False)
+        names = []
+        for species in self.client.stream_results(self.client.query_table(Species).order_by(Species.name), 2):
+
+            # Other queries can be run while the results are being streamed
+            self.assertIsNotNone(self.client.query_first(Species, name=species.name))
+            names.append(species.name)
+        self.assertEqual(names, ["bumblebee", "diplodocus", "human"])
+
+    def test_copy(self):
+        # Test the functionality for inserting data into database tables in bulk
+
+        # Reserve primary keys, and assert that they are unique
+        ids = self.client.reserve_primary_keys(Species, 3)
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(len(set(ids)), 3)
+
+        # Insert entries using 'copy_into_table', and check they are in the database
+        human = Species(name="human", clade="mammals\twith\\tab", legs=2, extinct=False)
+        human.id = ids[0]
+        snake = Species(name="snake", clade=None, legs=0, extinct=False)
+        snake.id = ids[1]
+        self.client.copy_into_table(Species, [human, snake])
+        self.assertEqual(len(self.client.query_all(Species)), 2)
+        retrieved_human = self.client.session.query(Species.clade).filter_by(id=ids[0]).scalar()
+        self.assertEqual(retrieved_human, "mammals\twith\\tab")
+        retrieved_snake = self.client.session.query(Species.clade).filter_by(id=ids[1]).scalar()
+        self.assertIsNone(retrieved_snake)
+
+        # Attach the copied entries to the session, and check that updates are persisted
+        self.client.attach_copied_entries(Species, [human, snake])
+        snake.legs = 4
+        self.client.session.flush()
+        retrieved_legs = self.client.session.query(Species.legs).filter_by(id=ids[1]).scalar()
+        self.assertEqual(retrieved_legs, 4)
+
+    def test_temporary_tables(self):
+        # Test the functionality for creating and filling temporary tables
+
+        # Fill a temporary table with the COPY command from a buffer, and check the content
+        buffer = io.StringIO()
+        self.client.write_copy_row(buffer, [1, "human", True])
+        self.client.write_copy_row(buffer, [2, None, False])
+        self.client.copy_buffer_into_temporary_table("staged_species", ["id INTEGER", "name VARCHAR", "extant BOOLEAN"],
+                                                     buffer)
+        rows = self.client.session.execute(sqlalchemy.text("SELECT * FROM staged_species ORDER BY id")).fetchall()
+        self.assertEqual([tuple(row) for row in rows], [(1, "human", True), (2, None, False)])
+
+        # Create a temporary table from the results of a query, and check the content
+        self.client.create_temporary_table_as("extant_species", "SELECT id FROM staged_species WHERE extant = :extant",
+                                              extant=True)
+        rows = self.client.session.execute(sqlalchemy.text("SELECT id FROM extant_species")).fetchall()
+        self.assertEqual([row[0] for row in rows], [1])
+
+        # Drop the temporary tables
+        self.client.drop_temporary_table("extant_species")
+        self.client.drop_temporary_table("staged_species")
+        table_count = self.client.session.execute(sqlalchemy.text(
+            "SELECT count(*) FROM pg_tables WHERE tablename IN ('staged_species', 'extant_species')")).scalar()
+        self.assertEqual(table_count, 0)
+
+    def test_write_copy_row(self):
+        # Tests the function that writes a row in the text format of the COPY command into a buffer
+        buffer = io.StringIO()
+        iobase.IOClient.write_copy_row(buffer, [12, None, "a\tb"])
+        self.assertEqual(buffer.getvalue(), "12\t\\N\ta\\tb\n")
+
+    def test_copy_text(self):
+        # Tests the function that converts values into the text format of the COPY command
+        self.assertEqual(iobase.IOClient._copy_text(None), "\\N")
+        self.assertEqual(iobase.IOClient._copy_text(True), "t")
+        self.assertEqual(iobase.IOClient._copy_text(False), "f")
+        self.assertEqual(iobase.IOClient._copy_text(12), "12")
+        self.assertEqual(iobase.IOClient._copy_text("a\tb\nc\\d"), "a\\tb\\nc\\\\d")
+
 
 class TestChadoClient(unittest.TestCase):
     """Test functions for loading data into a CHADO database"""
@@ -153,6 +234,14 @@ class TestChadoClient(unittest.TestCase):
         self.assertIn("feature_cvterm.feature_id = 12", compiled_query)
         self.assertIn("dbxref.db_id = 300", compiled_query)
 
+    def test_query_ontology_terms(self):
+        # Tests the function that creates a query against the dbxref and cvterm tables
+        query = self.client.query_ontology_terms(300)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("FROM public.dbxref LEFT OUTER JOIN public.cvterm ON public.cvterm.dbxref_id = "
+                      "public.dbxref.dbxref_id", compiled_query)
+        self.assertIn("dbxref.db_id = 300", compiled_query)
+
     def test_query_feature_cvterm_by_ontology_and_organism(self):
         # Tests the function that creates a query against the feature_cvterm table
         query = self.client.query_feature_cvterm_by_ontology_and_organism(12, 300)
@@ -164,6 +253,60 @@ class TestChadoClient(unittest.TestCase):
         self.assertIn("feature.organism_id = 12", compiled_query)
         self.assertIn("dbxref.db_id = 300", compiled_query)
 
+    def test_query_feature_relationship_by_type_and_organism(self):
+        # Tests the function that creates a query against the feature_relationship table
+        query = self.client.query_feature_relationship_by_type_and_organism(12, [300, 400])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("FROM public.feature_relationship JOIN public.feature ON public.feature.feature_id = "
+                      "public.feature_relationship.subject_id", compiled_query)
+        self.assertIn("feature.organism_id = 12", compiled_query)
+        self.assertIn("feature_relationship.type_id IN (300, 400)", compiled_query)
+
+    def test_query_featureprop_by_type_and_organism(self):
+        # Tests the function that creates a query against the featureprop table
+        query = self.client.query_featureprop_by_type_and_organism(12, [300, 400])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("FROM public.featureprop JOIN public.feature ON public.feature.feature_id = "
+                      "public.featureprop.feature_id", compiled_query)
+        self.assertIn("feature.organism_id = 12", compiled_query)
+        self.assertIn("featureprop.type_id IN (300, 400)", compiled_query)
+
+    def test_query_featureprop_values_by_type_and_organism(self):
+        # Tests the function that creates a query against the featureprop table
+        query = self.client.query_featureprop_values_by_type_and_organism(12, 300)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.featureprop.feature_id, public.featureprop.value", compiled_query)
+        self.assertIn("FROM public.featureprop JOIN public.feature ON public.feature.feature_id = "
+                      "public.featureprop.feature_id", compiled_query)
+        self.assertIn("feature.organism_id = 12", compiled_query)
+        self.assertIn("featureprop.type_id = 300", compiled_query)
+
+    def test_query_feature_synonym_by_type_and_organism(self):
+        # Tests the function that creates a query against the feature_synonym table
+        query = self.client.query_feature_synonym_by_type_and_organism(12, [300, 400])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("FROM public.feature_synonym JOIN public.feature ON public.feature.feature_id = "
+                      "public.feature_synonym.feature_id JOIN public.synonym ON public.synonym.synonym_id = "
+                      "public.feature_synonym.synonym_id", compiled_query)
+        self.assertIn("feature.organism_id = 12", compiled_query)
+        self.assertIn("synonym.type_id IN (300, 400)", compiled_query)
+
+    def test_query_feature_dbxref_by_organism(self):
+        # Tests the function that creates a query against the feature_dbxref table
+        query = self.client.query_feature_dbxref_by_organism(12)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("FROM public.feature_dbxref JOIN public.feature ON public.feature.feature_id = "
+                      "public.feature_dbxref.feature_id", compiled_query)
+        self.assertIn("feature.organism_id = 12", compiled_query)
+
+    def test_query_feature_pub_by_organism(self):
+        # Tests the function that creates a query against the feature_pub table
+        query = self.client.query_feature_pub_by_organism(12)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("FROM public.feature_pub JOIN public.feature ON public.feature.feature_id = "
+                      "public.feature_pub.feature_id", compiled_query)
+        self.assertIn("feature.organism_id = 12", compiled_query)
+
     def test_query_parent_features(self):
         # Tests the function that creates a query against the feature_relationship table
         query = self.client.query_parent_features(12, [300, 400])
@@ -191,6 +334,58 @@ class TestChadoClient(unittest.TestCase):
         self.assertIn("FROM public.featureloc JOIN public.feature "
                       "ON public.feature.feature_id = public.featureloc.feature_id", compiled_query)
         self.assertIn("public.featureloc.srcfeature_id = 12", compiled_query)
+        self.assertNotIn("box(", compiled_query)
+
+        query = self.client.query_features_by_srcfeature(12, [(100, 200), (500, 600)])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("public.featureloc.srcfeature_id = 12 AND ((box(point(public.featureloc.srcfeature_id, "
+                      "public.featureloc.fmin), point(public.featureloc.srcfeature_id, public.featureloc.fmax)) "
+                      "&& box(point(12, 100), point(12, 200))) AND public.featureloc.fmin < 200 "
+                      "AND public.featureloc.fmax > 100 OR (box(", compiled_query)
+        self.assertIn("&& box(point(12, 500), point(12, 600))) AND public.featureloc.fmin < 600 "
+                      "AND public.featureloc.fmax > 500)", compiled_query)
+        self.assertIn("ORDER BY public.featureloc.fmin, public.feature.uniquename COLLATE \"C\"", compiled_query)
+
+    def test_query_feature_locations(self):
+        # Tests the function that creates a query against the featureloc table for features on a given sequence
+        feature_ids = self.client.session.query(sequence.Feature.feature_id).filter_by(organism_id=12)
+        query = self.client.query_feature_locations(feature_ids, 3)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("public.featureloc.fmin, public.featureloc.fmax, public.featureloc.strand", compiled_query)
+        self.assertIn("FROM public.featureloc JOIN public.feature "
+                      "ON public.feature.feature_id = public.featureloc.feature_id", compiled_query)
+        self.assertIn("WHERE public.featureloc.srcfeature_id = 3 AND public.featureloc.feature_id IN (SELECT",
+                      compiled_query)
+        self.assertIn("ORDER BY public.feature.uniquename, public.featureloc.locgroup, public.featureloc.rank",
+                      compiled_query)
+
+    def test_query_located_features(self):
+        # Tests the function that creates a query against the featureloc table for features with given IDs
+        feature_ids = self.client.session.query(sequence.Feature.feature_id).filter_by(organism_id=12)
+        query = self.client.query_located_features(feature_ids, [3, 4])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.featureloc.srcfeature_id, public.feature.feature_id", compiled_query)
+        self.assertIn("FROM public.featureloc JOIN public.feature "
+                      "ON public.feature.feature_id = public.featureloc.feature_id", compiled_query)
+        self.assertIn("WHERE public.featureloc.feature_id IN (SELECT public.feature.feature_id", compiled_query)
+        self.assertIn("AND public.featureloc.srcfeature_id IN (3, 4)", compiled_query)
+        self.assertIn("ORDER BY public.featureloc.fmin, public.feature.uniquename COLLATE \"C\"", compiled_query)
+        self.assertIn("ORDER BY public.featureloc.fmin", compiled_query)
+
+    def test_query_feature_ids_by_regions(self):
+        # Tests the function that creates a query against the featureloc table
+        query = self.client.query_feature_ids_by_regions({12: [(100, 200)], 13: []})
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.featureloc.feature_id", compiled_query)
+        self.assertIn("&& box(point(12, 100), point(12, 200))) AND public.featureloc.fmin < 200 "
+                      "AND public.featureloc.fmax > 100 OR public.featureloc.srcfeature_id = 13", compiled_query)
+
+    def test_group_regions_by_sequence(self):
+        # Tests the function that groups genomic regions by sequence
+        grouped_regions = self.client.group_regions_by_sequence(
+            [("chr1", 100, 200), ("chr2", None, None), ("chr1", 300, 400), ("chr2", 10, 20), ("chr3", 5, 6),
+             ("chr3", None, None)])
+        self.assertEqual(grouped_regions, {"chr1": [(100, 200), (300, 400)], "chr2": [], "chr3": []})
 
     def test_query_features_by_property_type(self):
         # Tests the function that creates a query against the feature table
@@ -226,6 +421,12 @@ class TestChadoClient(unittest.TestCase):
         self.assertIn("protein_transcript_relationship.type_id = 66", compiled_query)
         self.assertIn("transcript_gene_relationship.type_id = 55", compiled_query)
         self.assertIn("gene_feature.type_id = 222", compiled_query)
+        self.assertNotIn("gene_feature.feature_id IN", compiled_query)
+
+        gene_ids = self.client.query_feature_ids_by_regions({12: []})
+        query = self.client.query_protein_features(12, 222, 55, 66, gene_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("gene_feature.feature_id IN (SELECT public.featureloc.feature_id", compiled_query)
 
     def test_query_feature_properties(self):
         # Tests the function that creates a query against the featureprop and cvterm tables
@@ -276,6 +477,116 @@ class TestChadoClient(unittest.TestCase):
                       "ON public.db.db_id = public.dbxref.db_id", compiled_query)
         self.assertIn("WHERE public.feature_cvterm.feature_id = 44 AND public.db.db_id = 81", compiled_query)
 
+    def test_query_feature_tree(self):
+        # Tests the function that creates a recursive query against the feature_relationship table
+        query = self.client.query_feature_tree([44, 45], [62, 63])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("WITH RECURSIVE feature_tree(feature_id) AS", compiled_query)
+        self.assertIn("WHERE public.feature.feature_id IN (44, 45) UNION SELECT public.feature_relationship.subject_id",
+                      compiled_query)
+        self.assertIn("FROM public.feature_relationship JOIN feature_tree "
+                      "ON public.feature_relationship.object_id = feature_tree.feature_id", compiled_query)
+        self.assertIn("WHERE public.feature_relationship.type_id IN (62, 63)", compiled_query)
+        self.assertIn("SELECT feature_tree.feature_id", compiled_query)
+
+    def test_query_feature_ancestors(self):
+        # Tests the function that creates a recursive query against the feature_relationship table, going upwards
+        query = self.client.query_feature_ancestors([44, 45], [62, 63])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("WITH RECURSIVE feature_ancestors(feature_id) AS", compiled_query)
+        self.assertIn("WHERE public.feature.feature_id IN (44, 45) UNION SELECT public.feature_relationship.object_id",
+                      compiled_query)
+        self.assertIn("FROM public.feature_relationship JOIN feature_ancestors "
+                      "ON public.feature_relationship.subject_id = feature_ancestors.feature_id", compiled_query)
+        self.assertIn("WHERE public.feature_relationship.type_id IN (62, 63)", compiled_query)
+        self.assertIn("SELECT feature_ancestors.feature_id", compiled_query)
+
+    def test_query_features_by_ids(self):
+        # Tests the function that creates a query against the feature and cvterm tables
+        feature_ids = self.client.session.query(sequence.Feature.feature_id).filter_by(organism_id=12)
+        query = self.client.query_features_by_ids(feature_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("public.feature.is_obsolete", compiled_query)
+        self.assertIn("public.cvterm.name", compiled_query)
+        self.assertNotIn("public.feature.residues", compiled_query)
+        self.assertIn("FROM public.feature JOIN public.cvterm ON public.cvterm.cvterm_id = public.feature.type_id",
+                      compiled_query)
+        self.assertIn("WHERE public.feature.feature_id IN (SELECT public.feature.feature_id", compiled_query)
+
+    def test_query_featurelocs_by_feature_ids(self):
+        # Tests the function that creates a query against the featureloc table
+        feature_ids = self.client.session.query(sequence.Feature.feature_id).filter_by(organism_id=12)
+        query = self.client.query_featurelocs_by_feature_ids(feature_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("FROM public.featureloc", compiled_query)
+        self.assertIn("WHERE public.featureloc.feature_id IN (SELECT public.feature.feature_id", compiled_query)
+        self.assertIn("ORDER BY public.featureloc.featureloc_id", compiled_query)
+
+    def test_query_polypeptide_residues_by_feature_ids(self):
+        # Tests the function that creates a query against the feature and cvterm tables
+        feature_ids = self.client.session.query(sequence.Feature.feature_id).filter_by(organism_id=12)
+        query = self.client.query_polypeptide_residues_by_feature_ids(feature_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.feature.feature_id, public.feature.residues", compiled_query)
+        self.assertIn("FROM public.feature JOIN public.cvterm ON public.cvterm.cvterm_id = public.feature.type_id",
+                      compiled_query)
+        self.assertIn("public.cvterm.name = 'polypeptide'", compiled_query)
+
+    def test_query_feature_relationships_by_feature_ids(self):
+        # Tests the function that creates a query against the feature_relationship and feature tables
+        feature_ids = self.client.session.query(sequence.Feature.feature_id).filter_by(organism_id=12)
+        query = self.client.query_feature_relationships_by_feature_ids(feature_ids, [62, 63])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.feature_relationship.object_id, public.feature_relationship.type_id, "
+                      "public.feature_relationship.subject_id", compiled_query)
+        self.assertIn("FROM public.feature_relationship JOIN public.feature "
+                      "ON public.feature.feature_id = public.feature_relationship.subject_id", compiled_query)
+        self.assertIn("public.feature_relationship.type_id IN (62, 63)", compiled_query)
+        self.assertIn("ORDER BY public.feature.uniquename", compiled_query)
+
+    def test_query_child_feature_ids(self):
+        # Tests the function that creates a query against the feature_relationship table for features with parents
+        feature_ids = self.client.session.query(sequence.FeatureLoc.feature_id).filter_by(srcfeature_id=12)
+        query = self.client.query_child_feature_ids(feature_ids, [62, 63])
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT DISTINCT public.feature_relationship.subject_id", compiled_query)
+        self.assertIn("WHERE public.feature_relationship.subject_id IN (SELECT public.featureloc.feature_id",
+                      compiled_query)
+        self.assertIn("AND public.feature_relationship.type_id IN (62, 63)", compiled_query)
+
+    def test_query_feature_attributes_by_feature_ids(self):
+        # Tests the functions that create queries against the tables with attributes of features
+        feature_ids = self.client.session.query(sequence.Feature.feature_id).filter_by(organism_id=12)
+        query = self.client.query_feature_properties_by_feature_ids(feature_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.featureprop.feature_id, public.cvterm.name, public.featureprop.value",
+                      compiled_query)
+        self.assertIn("ORDER BY public.featureprop.featureprop_id", compiled_query)
+
+        query = self.client.query_feature_pubs_by_feature_ids(feature_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.feature_pub.feature_id, public.pub.uniquename", compiled_query)
+        self.assertIn("ORDER BY public.feature_pub.feature_pub_id", compiled_query)
+
+        query = self.client.query_feature_dbxrefs_by_feature_ids(feature_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.feature_dbxref.feature_id, public.db.name, public.dbxref.accession",
+                      compiled_query)
+        self.assertIn("ORDER BY public.feature_dbxref.feature_dbxref_id", compiled_query)
+
+        query = self.client.query_feature_synonyms_by_feature_ids(feature_ids)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.feature_synonym.feature_id, public.cvterm.name AS type, "
+                      "public.synonym.name AS synonym", compiled_query)
+        self.assertIn("ORDER BY public.feature_synonym.feature_synonym_id", compiled_query)
+
+        query = self.client.query_feature_ontology_terms_by_feature_ids(feature_ids, 81)
+        compiled_query = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("SELECT public.feature_cvterm.feature_id, public.db.name, public.dbxref.accession",
+                      compiled_query)
+        self.assertIn("public.db.db_id = 81", compiled_query)
+        self.assertIn("ORDER BY public.feature_cvterm.feature_cvterm_id", compiled_query)
+
     def test_query_feature_cvterm_properties(self):
         # Tests the function that creates a query against the feature_cvtermprop table
         query = self.client.query_feature_cvterm_properties(44)
@@ -437,6 +748,43 @@ class TestChadoClient(unittest.TestCase):
         all_uniquenames = self.client._load_feature_names(self.default_organism)
         self.assertIn("testname", all_uniquenames)
 
+    def test_load_feature_index(self):
+        # Tests the function loading an index of all existing features from a database
+        feature_entry = sequence.Feature(organism_id=self.default_organism.organism_id,
+                                         type_id=self.default_cvterm.cvterm_id, uniquename="testname")
+        self.client.add_and_flush(feature_entry)
+        feature_index = self.client._load_feature_index(self.default_organism)
+        self.assertIn("testname", feature_index)
+        self.assertEqual(feature_index["testname"], (feature_entry.feature_id, self.default_cvterm.cvterm_id, False))
+
+    def test_resolve_ontology_term(self):
+        # Tests the function resolving ontology terms from a map of all terms of an ontology
+        dbxref_without_term = general.DbxRef(db_id=self.default_db.db_id, accession="otheraccession")
+        self.client.add_and_flush(dbxref_without_term)
+        resolved_term = self.client._resolve_ontology_term("defaultdb", "defaultaccession", "defaultdb:defaultaccession")
+        self.assertEqual(resolved_term, (self.default_db, self.default_cvterm.cvterm_id, "defaultterm"))
+        self.assertIsNone(self.client._resolve_ontology_term("defaultdb", "otheraccession", "defaultdb:otheraccession"))
+        self.assertIsNone(self.client._resolve_ontology_term("defaultdb", "inexistent", "defaultdb:inexistent"))
+        self.assertIsNone(self.client._resolve_ontology_term("inexistentdb", "defaultaccession", ""))
+        self.assertIn("defaultdb", self.client._ontology_term_maps)
+        self.client._ontology_term_maps = {}
+
+    def test_checkpoint(self):
+        # Tests the functions writing, reading and removing a checkpoint file
+        input_file = tempfile.mkstemp()[1]
+        checkpoint_file = self.client._checkpoint_filename(input_file)
+        self.assertEqual(checkpoint_file, input_file + ".checkpoint")
+        self.assertEqual(self.client._read_checkpoint(checkpoint_file), 0)
+        self.client._write_checkpoint(checkpoint_file, 1500)
+        self.assertEqual(self.client._read_checkpoint(checkpoint_file), 1500)
+        with open(checkpoint_file, "w") as checkpoint_handle:
+            checkpoint_handle.write("corrupt\n")
+        with self.assertRaises(iobase.InputFileError):
+            self.client._read_checkpoint(checkpoint_file)
+        self.client._remove_checkpoint(checkpoint_file)
+        self.assertFalse(os.path.exists(checkpoint_file))
+        os.remove(input_file)
+
     def test_handle_organism(self):
         # Tests the function importing an organism to the database
         # Insert an organism and check this is successful
@@ -525,6 +873,23 @@ class TestChadoClient(unittest.TestCase):
         second_entry = self.client._handle_db(another_entry)
         self.assertIs(second_entry, first_entry)
 
+    def test_lookup_caches(self):
+        # Tests that entries of lookup tables are served from a cache, if enabled
+        self.client.enable_lookup_caches(max_size=10)
+        first_entry = self.client._handle_db(general.Db(name="testname"))
+        second_entry = self.client._handle_db(general.Db(name="testname"))
+        self.assertIs(second_entry, first_entry)
+        db_cache = self.client._lookup_caches[general.Db]
+        self.assertEqual(db_cache.hits, 1)
+        self.assertEqual(db_cache.misses, 1)
+
+        pub_entry = self.client._handle_pub(pub.Pub(uniquename=self.default_pub.uniquename,
+                                                    type_id=self.default_pub.type_id))
+        self.assertIs(pub_entry, self.default_pub)
+        self.assertIs(self.client._query_cached(pub.Pub, uniquename=self.default_pub.uniquename), self.default_pub)
+        self.assertEqual(self.client._lookup_caches[pub.Pub].hits, 1)
+        self.client._lookup_caches = {}
+
     def test_handle_dbxref(self):
         # Tests the function importing a db cross reference to the database
         new_entry = general.DbxRef(db_id=self.default_db.db_id, accession="testaccession", version="testversion")
@@ -902,6 +1267,19 @@ class TestChadoClient(unittest.TestCase):
         self.assertIs(second_entry, new_entry)
         self.assertIsNot(second_entry, another_entry)
 
+    def test_query_feature_residues(self):
+        # Tests the function that queries the sequence of a feature, or a section of it
+        feature = sequence.Feature(organism_id=self.default_organism.organism_id, type_id=self.default_cvterm.cvterm_id,
+                                   uniquename="testname", residues="ACTGGTAA")
+        self.client.add_and_flush(feature)
+        self.client.session.expunge(feature)
+        self.assertEqual(self.client.query_feature_residues(feature.feature_id).scalar(), "ACTGGTAA")
+        self.assertEqual(self.client.query_feature_residues(feature.feature_id, 2, 5).scalar(), "TGG")
+        self.assertEqual(self.client.query_feature_residues(feature.feature_id, 6).scalar(), "AA")
+        self.assertEqual(self.client.query_feature_residues(feature.feature_id, end=3).scalar(), "ACT")
+        self.assertEqual(self.client.query_feature_residues(feature.feature_id, 4, 20).scalar(), "GTAA")
+        self.assertNotIn("residues", self.client.query_first(sequence.Feature, feature_id=feature.feature_id).__dict__)
+
     def test_mark_feature_as_obsolete(self):
         # Tests the function that marks a feature as obsolete
         feature = sequence.Feature(organism_id=self.default_organism.organism_id, type_id=self.default_cvterm.cvterm_id,
@@ -911,6 +1289,22 @@ class TestChadoClient(unittest.TestCase):
         self.assertIs(obsolete_feature, feature)
         self.assertTrue(obsolete_feature.is_obsolete)
 
+    def test_mark_features_as_obsolete(self):
+        # Tests the function that marks all features of an organism as obsolete, except a given set
+        features = []
+        for name in ["testname1", "testname2", "testname3"]:
+            feature = sequence.Feature(organism_id=self.default_organism.organism_id,
+                                       type_id=self.default_cvterm.cvterm_id, uniquename=name, is_obsolete=False)
+            self.client.add_and_flush(feature)
+            features.append(feature)
+        obsolete_names = self.client._mark_features_as_obsolete(self.default_organism,
+                                                                 {"defaultfeature", "testname2", "othername"})
+        self.assertEqual(obsolete_names, ["testname1", "testname3"])
+        self.client.session.expire_all()
+        self.assertEqual([feature.is_obsolete for feature in features], [True, False, True])
+        obsolete_names = self.client._mark_features_as_obsolete(self.default_organism, {"defaultfeature", "testname2"})
+        self.assertEqual(obsolete_names, [])
+
     def test_update_organism_properties(self):
         # Tests the function that transfers properties from one organism object to another
         organism1 = organism.Organism(genus="testgenus", species="testspecies", infraspecific_name="teststrain",
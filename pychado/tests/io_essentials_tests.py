@@ -109,3 +109,5 @@ class TestEssentials(unittest.TestCase):
         top_level_seq_cvterm = self.client.query_first(cv.CvTerm, name="top_level_seq")     # type: cv.CvTerm
         self.assertIsNotNone(top_level_seq_cvterm.cvterm_id)
         self.assertEqual(top_level_seq_cvterm.cv_id, misc_cv.cv_id)
+        checksum_cvterm = self.client.query_first(cv.CvTerm, name="gff_checksum")           # type: cv.CvTerm
+        self.assertEqual(checksum_cvterm.cv_id, misc_cv.cv_id)
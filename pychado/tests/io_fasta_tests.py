@@ -1,4 +1,5 @@
 import unittest.mock
+import sqlalchemy
 from Bio import SeqIO, Seq
 from ..io import fasta
 from ..orm import cv, organism, sequence
@@ -101,22 +102,6 @@ class TestFastaExport(unittest.TestCase):
                                                   is_relationshiptype=1, cvterm_id=92)
         cls.client._top_level_term = cv.CvTerm(cv_id=11, dbxref_id=91, name="top_level_seq", cvterm_id=91)
 
-    @unittest.mock.patch("pychado.io.fasta.FastaExportClient._extract_nucleotide_sequence")
-    def test_extract_residues_by_type(self, mock_extract_nucleotides: unittest.mock.Mock):
-        # Tests the function that extracts the sequence of nucleotides/amino acids of a feature
-        self.assertIs(mock_extract_nucleotides, self.client._extract_nucleotide_sequence)
-        feature_entry = sequence.Feature(organism_id=1, type_id=2, uniquename="test", residues="CTGA", feature_id=33)
-
-        mock_extract_nucleotides.return_value = "AAGG"
-        residues = self.client._extract_residues_by_type(feature_entry, [], "genes")
-        mock_extract_nucleotides.assert_called_with(feature_entry, [])
-        self.assertEqual(residues, "AAGG")
-
-        mock_extract_nucleotides.reset_mock()
-        residues = self.client._extract_residues_by_type(feature_entry, [], "contigs")
-        mock_extract_nucleotides.assert_not_called()
-        self.assertEqual(residues, "CTGA")
-
     def test_are_residues_valid(self):
         # Tests the function that checks if a sequence of nucleotides/amino acids is composed of valid IUPAC codes
         valid = self.client._are_residues_valid("", "genes")
@@ -132,30 +117,6 @@ class TestFastaExport(unittest.TestCase):
         valid = self.client._are_residues_valid("MR*AB*", "proteins")
         self.assertFalse(valid)
 
-    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_first")
-    def test_extract_nucleotide_sequences(self, mock_query: unittest.mock.Mock):
-        # Tests the function that extracts the nucleotide sequence of a feature from the database
-        self.assertIs(mock_query, self.client.query_first)
-        feature_entry = sequence.Feature(organism_id=1, type_id=2, uniquename="test", residues="CTGA", feature_id=33)
-
-        mock_query.return_value = sequence.FeatureLoc(feature_id=33, srcfeature_id=34, fmin=1, fmax=3, strand=1)
-        residues = self.client._extract_nucleotide_sequence(feature_entry, [])
-        mock_query.assert_called_with(sequence.FeatureLoc, feature_id=33)
-        self.assertIsNone(residues)
-
-        srcfeature_entries = [sequence.Feature(organism_id=1, type_id=2, uniquename="test", residues="ACTGGTAA",
-                                               feature_id=34)]
-        residues = self.client._extract_nucleotide_sequence(feature_entry, srcfeature_entries)
-        self.assertEqual(residues, "CT")
-
-        mock_query.return_value = sequence.FeatureLoc(feature_id=33, srcfeature_id=34, fmin=0, fmax=6, strand=-1)
-        residues = self.client._extract_nucleotide_sequence(feature_entry, srcfeature_entries)
-        self.assertEqual(residues, "ACCAGT")
-
-        mock_query.return_value = sequence.FeatureLoc(feature_id=33, srcfeature_id=34, fmin=1, fmax=300)
-        residues = self.client._extract_nucleotide_sequence(feature_entry, srcfeature_entries)
-        self.assertIsNone(residues)
-
     @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_first")
     @unittest.mock.patch("pychado.io.fasta.FastaExportClient._load_cvterm")
     def test_extract_genome_version(self, mock_load: unittest.mock.Mock, mock_query: unittest.mock.Mock):
@@ -193,49 +154,118 @@ class TestFastaExport(unittest.TestCase):
         mock_sequence.assert_called_with("AGCT")
         mock_record.assert_called_with("seq", id="test", name="test", description="desc")
 
-    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_features_by_property_type")
-    def test_extract_srcfeatures_by_type(self, mock_query: unittest.mock.Mock):
-        # Tests that the feature table is only queried for certain feature types
-        self.assertIs(mock_query, self.client.query_features_by_property_type)
-
-        organism_entry = organism.Organism(genus="testgenus", species="testspecies", organism_id=44)
-        self.client._extract_srcfeatures_by_type(organism_entry, "contigs")
-        mock_query.assert_not_called()
-
-        self.client._extract_srcfeatures_by_type(organism_entry, "genes")
-        mock_query.assert_called_with(44, 91)
-
     @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_protein_features")
     @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_features_by_property_type")
-    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_features_by_type")
-    def test_extract_features_by_type(self, mock_query_genes: unittest.mock.Mock,
-                                      mock_query_contigs: unittest.mock.Mock, mock_query_proteins: unittest.mock.Mock):
+    def test_extract_features_by_type(self, mock_query_contigs: unittest.mock.Mock,
+                                      mock_query_proteins: unittest.mock.Mock):
         # Tests that the feature table is correctly queried depending on the type of features of interest
-        self.assertIs(mock_query_genes, self.client.query_features_by_type)
         self.assertIs(mock_query_contigs, self.client.query_features_by_property_type)
         self.assertIs(mock_query_proteins, self.client.query_protein_features)
 
         organism_entry = organism.Organism(genus="testgenus", species="testspecies", organism_id=44)
         self.client._extract_features_by_type(organism_entry, "contigs")
-        mock_query_genes.assert_not_called()
         mock_query_contigs.assert_called_with(44, 91)
         mock_query_proteins.assert_not_called()
 
-        mock_query_genes.reset_mock()
         mock_query_contigs.reset_mock()
         mock_query_proteins.reset_mock()
         self.client._extract_features_by_type(organism_entry, "proteins")
-        mock_query_genes.assert_not_called()
         mock_query_contigs.assert_not_called()
-        mock_query_proteins.assert_called_with(44, 41, 91, 92)
+        mock_query_proteins.assert_called_with(44, 41, 91, 92, None)
 
-        mock_query_genes.reset_mock()
-        mock_query_contigs.reset_mock()
-        mock_query_proteins.reset_mock()
-        self.client._extract_features_by_type(organism_entry, "genes")
-        mock_query_genes.assert_called_with(44, [41])
-        mock_query_contigs.assert_not_called()
-        mock_query_proteins.assert_not_called()
+        # Restrict the features to those located in certain regions
+        located_feature_ids = sqlalchemy.select([sequence.FeatureLoc.feature_id])
+        self.client._extract_features_by_type(organism_entry, "proteins", located_feature_ids)
+        mock_query_proteins.assert_called_with(44, 41, 91, 92, located_feature_ids)
+
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_features_by_property_type")
+    def test_extract_sequences_by_names(self, mock_query: unittest.mock.Mock):
+        # Tests the function that extracts top-level sequences with given names
+        self.assertIs(mock_query, self.client.query_features_by_property_type)
+        chromosome_entry = sequence.Feature(organism_id=44, type_id=100, uniquename="chr1", feature_id=1)
+        mock_query.return_value.filter.return_value.all.return_value = [chromosome_entry]
+
+        organism_entry = organism.Organism(genus="testgenus", species="testspecies", organism_id=44)
+        entries = self.client._extract_sequences_by_names(organism_entry, ["chr1", "chr2"])
+        mock_query.assert_called_with(44, 91)
+        self.assertEqual(entries, [chromosome_entry])
+
+    @unittest.mock.patch("pychado.io.fasta.SeqIO.write")
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_feature_residues")
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient._create_fasta_record")
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_first")
+    def test_export_sequence_regions(self, mock_query: unittest.mock.Mock, mock_record: unittest.mock.Mock,
+                                     mock_residues: unittest.mock.Mock, mock_write: unittest.mock.Mock):
+        # Tests the export of sections of top-level sequences
+        self.assertIs(mock_query, self.client.query_first)
+        self.assertIs(mock_record, self.client._create_fasta_record)
+        self.assertIs(mock_residues, self.client.query_feature_residues)
+        self.assertIs(mock_write, fasta.SeqIO.write)
+
+        organism_entry = organism.Organism(genus="testgenus", species="testspecies", organism_id=44)
+        chromosome_entries = [sequence.Feature(organism_id=44, type_id=100, uniquename="chr1", feature_id=1),
+                              sequence.Feature(organism_id=44, type_id=100, uniquename="chr2", feature_id=2)]
+        mock_residues.return_value.scalar.side_effect = ["ACGT", "AC", "ACGTACGT"]
+        mock_record.side_effect = lambda entry, *args: SeqIO.SeqRecord(Seq.Seq("A"), id=entry.uniquename,
+                                                                       name=entry.uniquename)
+
+        self.client._export_sequence_regions("testfile", organism_entry, chromosome_entries,
+                                             {"chr1": [(10, 14), (20, 30)], "chr2": []}, "v1", "r1", False)
+        self.assertEqual(mock_residues.mock_calls[0], unittest.mock.call(1, 10, 14))
+        self.assertEqual(mock_residues.mock_calls[2], unittest.mock.call(1, 20, 30))
+        self.assertEqual(mock_residues.mock_calls[4], unittest.mock.call(2, None, None))
+        records = mock_write.call_args[0][0]
+        self.assertEqual([record.id for record in records], ["chr1:11-14", "chr1:21-22", "chr2"])
+
+    @unittest.mock.patch("pychado.io.fasta.SeqIO.write")
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_feature_residues")
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_feature_locations")
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_features_by_property_type")
+    @unittest.mock.patch("pychado.io.fasta.FastaExportClient.query_features_by_type")
+    def test_export_gene_sequences(self, mock_genes: unittest.mock.Mock, mock_sequences: unittest.mock.Mock,
+                                   mock_locations: unittest.mock.Mock, mock_residues: unittest.mock.Mock,
+                                   mock_write: unittest.mock.Mock):
+        # Tests the export of the nucleotide sequences of genes
+        self.assertIs(mock_genes, self.client.query_features_by_type)
+        self.assertIs(mock_sequences, self.client.query_features_by_property_type)
+        self.assertIs(mock_locations, self.client.query_feature_locations)
+        self.assertIs(mock_residues, self.client.query_feature_residues)
+        self.assertIs(mock_write, fasta.SeqIO.write)
+
+        organism_entry = organism.Organism(genus="testgenus", species="testspecies", organism_id=44)
+        chromosome_entries = [sequence.Feature(organism_id=44, type_id=100, uniquename="chr" + str(i), feature_id=i)
+                              for i in range(1, 4)]
+        gene_entries = [sequence.Feature(organism_id=44, type_id=41, uniquename="gene" + str(i), feature_id=10 + i)
+                        for i in range(1, 7)]
+        gene_entries[4].is_obsolete = True
+        mock_sequences.return_value.all.return_value = chromosome_entries
+        mock_locations.side_effect = [
+            [(gene_entries[5], 0, 2, None), (gene_entries[0], 2, 6, 1), (gene_entries[0], 0, 2, 1),
+             (gene_entries[1], 1, 8, -1), (gene_entries[2], 4, 11, 1)],
+            [(gene_entries[0], 0, 4, 1), (gene_entries[4], 0, 4, 1), (gene_entries[3], 0, 4, -1)],
+            []]
+        mock_residues.return_value.scalar.side_effect = ["acgtacgtac", "TTAC"]
+
+        self.client._export_gene_sequences("testfile", organism_entry, "v1", "", False, "located_ids")
+        mock_genes.assert_called_with(44, [41])
+        mock_genes.return_value.with_entities.return_value.filter.assert_called()
+        mock_sequences.assert_called_with(44, 91)
+        gene_ids = mock_genes.return_value.with_entities.return_value.filter.return_value
+        self.assertEqual(mock_locations.mock_calls, [unittest.mock.call(gene_ids, 1), unittest.mock.call(gene_ids, 2),
+                                                     unittest.mock.call(gene_ids, 3)])
+        self.assertEqual(mock_residues.call_count, 2)
+        records = mock_write.call_args[0][0]
+        self.assertEqual([record.id for record in records], ["gene1", "gene2", "gene4", "gene6"])
+        self.assertEqual([str(record.seq) for record in records], ["GTAC", "ACGTACG", "GTAA", "AC"])
+        self.assertEqual(records[0].description, "| organism=testgenus%20testspecies | sequence_type=gene "
+                                                 "| genome_version=v1")
+
+    def test_reverse_complement(self):
+        # Tests the function computing the reverse complement of a nucleotide sequence
+        self.assertEqual(self.client._reverse_complement("AACGTTN"), "NAACGTT")
+        self.assertEqual(self.client._reverse_complement("RYKMBVDHSW"), "WSDHBVKMRY")
+        self.assertEqual(self.client._reverse_complement("GATTACA"),
+                         str(Seq.Seq("GATTACA", alphabet=Seq.IUPAC.ambiguous_dna).reverse_complement()))
 
     @unittest.mock.patch("pychado.io.fasta.FastaExportClient._release_key_value_pair")
     @unittest.mock.patch("pychado.io.fasta.FastaExportClient._genome_version_key_value_pair")
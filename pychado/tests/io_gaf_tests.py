@@ -81,16 +81,16 @@ class TestGAFImport(unittest.TestCase):
     @unittest.mock.patch("pychado.io.gaf.GAFImportClient._handle_pub")
     @unittest.mock.patch("pychado.orm.pub.Pub")
     @unittest.mock.patch("pychado.io.gaf.GAFImportClient._extract_primary_publication")
-    @unittest.mock.patch("pychado.io.gaf.GAFImportClient.query_first")
+    @unittest.mock.patch("pychado.io.gaf.GAFImportClient._resolve_ontology_term")
     @unittest.mock.patch("pychado.io.gaf.GAFImportClient.query_feature_cvterm_by_ontology")
-    def test_handle_ontology_term(self, mock_query: unittest.mock.Mock, mock_query_first: unittest.mock.Mock,
+    def test_handle_ontology_term(self, mock_query: unittest.mock.Mock, mock_resolve: unittest.mock.Mock,
                                   mock_extract: unittest.mock.Mock,
                                   mock_pub: unittest.mock.Mock, mock_insert_pub: unittest.mock.Mock,
                                   mock_feature_cvterm: unittest.mock.Mock,
                                   mock_insert_feature_cvterm: unittest.mock.Mock):
         # Tests the function transferring data from a GAF record to the 'feature_cvterm' table
         self.assertIs(mock_query, self.client.query_feature_cvterm_by_ontology)
-        self.assertIs(mock_query_first, self.client.query_first)
+        self.assertIs(mock_resolve, self.client._resolve_ontology_term)
         self.assertIs(mock_extract, self.client._extract_primary_publication)
         self.assertIs(mock_pub, pub.Pub)
         self.assertIs(mock_insert_pub, self.client._handle_pub)
@@ -99,15 +99,11 @@ class TestGAFImport(unittest.TestCase):
 
         feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testname", feature_id=12)
         mock_extract.return_value = "PMID:12345"
-        mock_query_first.side_effect = [utils.EmptyObject(db_id=33),
-                                        utils.EmptyObject(dbxref_id=44),
-                                        utils.EmptyObject(cvterm_id=55, name="")]
+        mock_resolve.return_value = (utils.EmptyObject(db_id=33), 55, "")
         mock_insert_pub.return_value = utils.EmptyObject(pub_id=66)
 
         ontology_term = self.client._handle_ontology_term(self.default_gaf_record, feature_entry)
-        mock_query_first.assert_any_call(general.DbxRef, db_id=33, accession="12345")
-        mock_query_first.assert_any_call(cv.CvTerm, dbxref_id=44)
-        self.assertEqual(mock_query_first.call_count, 3)
+        mock_resolve.assert_called_once_with("GO", "12345", "GO:12345")
         mock_pub.assert_any_call(uniquename="PMID:12345", type_id=71)
         self.assertEqual(mock_insert_pub.call_count, 1)
         mock_query.assert_called_with(12, 33)
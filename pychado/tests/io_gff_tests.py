@@ -1,10 +1,12 @@
+import io
 import os
-import shutil
 import tempfile
 import filecmp
+import itertools
 import unittest.mock
 import sqlalchemy.orm
 import gffutils
+from Bio import SeqIO, Seq
 from .. import utils
 from ..io import iobase, fasta, gff
 from ..orm import general, cv, organism, pub, sequence
@@ -55,76 +57,210 @@ class TestGFFImport(unittest.TestCase):
                 "previous_systematic_id": "testsynonym", "Parent": "testparent", "Dbxref": ["testdb:testaccession"],
                 "Ontology_term": ["GO:7890"], "Note": "testnote"})
 
-    def test_create_sqlite_db(self):
-        # Tests the function that creates a SQLite database from a GFF file
+    def test_read_gff_records(self):
+        # Tests the function that reads the records of a GFF file one by one
         gff_file = os.path.join(data_dir, 'gff_without_fasta.gff3')
         self.assertTrue(os.path.exists(gff_file))
-        gff_db = self.client._create_sqlite_db(gff_file)
-        self.assertEqual(len(self.client._sqlite_databases), 1)
-        gff_db_name = self.client._sqlite_databases[0]
-        self.assertTrue(os.path.exists(gff_db_name))
-        self.assertIn("gff-version 3", gff_db.directives)
-        os.remove(gff_db_name)
-        self.assertFalse(os.path.exists(gff_db_name))
-
-    def test_has_fasta(self):
-        # Tests the function that checks if a GFF file contains a FASTA section
-        gff_file = os.path.join(data_dir, 'gff_without_fasta.gff3')
-        self.assertFalse(self.client._has_fasta(gff_file))
+        gff_reader = gff.GFFReader(gff_file)
+        gff_records = list(gff_reader.records())
+        self.assertEqual(len(gff_records), 20)
+        self.assertEqual(gff_records[0].id, "FGSG_11579")
+        self.assertEqual(gff_records[0].start, 1517)
+        self.assertIn("gff-version 3", gff_reader.directives)
+
+        # Records stop at the FASTA section
         gff_file = os.path.join(data_dir, 'gff_with_fasta.gff3')
-        self.assertTrue(self.client._has_fasta(gff_file))
+        self.assertEqual(len(list(gff.GFFReader(gff_file).records())), 20)
+
+    def test_read_gff_records_with_forward_references(self):
+        # Tests that records referencing features further down in a GFF file are held back
+        gff_file = tempfile.mkstemp()[1]
+        with open(gff_file, "w") as gff_handle:
+            gff_handle.write("##gff-version 3\n"
+                             "chr1\tsrc\texon\t1\t10\t.\t+\t.\tParent=T1\n"
+                             "chr1\tsrc\tpolypeptide\t1\t10\t.\t+\t.\tID=P1;Derives_from=T1\n"
+                             "chr1\tsrc\tgene\t1\t20\t.\t+\t.\tID=G1\n"
+                             "chr1\tsrc\tmRNA\t1\t20\t.\t+\t.\tID=T1;Parent=G1\n"
+                             "chr1\tsrc\texon\t11\t20\t.\t+\t.\tParent=T2\n"
+                             "chr1\tsrc\tgene\t21\t30\t.\t+\t.\tID=G2;Parent=unknown\n")
+        gff_records = list(gff.GFFReader(gff_file).records())
+        self.assertEqual([record.id for record in gff_records], ["G1", "T1", "exon_1", "P1", "exon_2", "G2"])
+
+        # The number of held back records is limited
+        gff_records = list(gff.GFFReader(gff_file, max_pending_records=1).records())
+        self.assertEqual([record.id for record in gff_records], ["exon_1", "G1", "T1", "P1", "exon_2", "G2"])
+
+        # Duplicate IDs are not permitted
+        with open(gff_file, "a") as gff_handle:
+            gff_handle.write("chr1\tsrc\tgene\t1\t20\t.\t+\t.\tID=G1\n")
+        with self.assertRaises(iobase.InputFileError):
+            list(gff.GFFReader(gff_file).records())
+        os.remove(gff_file)
+
+    def test_read_gff_records_with_seqid_filter(self):
+        # Tests that only the records on selected sequences are read from a GFF file
+        gff_file = tempfile.mkstemp()[1]
+        with open(gff_file, "w") as gff_handle:
+            gff_handle.write("##gff-version 3\n"
+                             "chr2\tsrc\tmRNA\t1\t20\t.\t+\t.\tID=T2;Parent=G1\n"
+                             "chr1\tsrc\texon\t1\t10\t.\t+\t.\tParent=T1\n"
+                             "chr1\tsrc\tgene\t1\t20\t.\t+\t.\tID=G1\n"
+                             "chr1\tsrc\tmRNA\t1\t20\t.\t+\t.\tID=T1;Parent=G1\n"
+                             "chr2\tsrc\texon\t1\t10\t.\t+\t.\tParent=T2\n")
+        gff_reader = gff.GFFReader(gff_file, seqid_filter=lambda seqid: seqid == "chr2")
+        gff_records = list(gff_reader.records())
+        self.assertEqual([record.id for record in gff_records], ["T2", "exon_2"])
+        self.assertIn("gff-version 3", gff_reader.directives)
+
+        # Automatically assigned IDs do not depend on the filter
+        gff_records = list(gff.GFFReader(gff_file, seqid_filter=lambda seqid: seqid == "chr1").records())
+        self.assertEqual([record.id for record in gff_records], ["G1", "T1", "exon_1"])
+
+        # Duplicate IDs are detected on all sequences
+        with open(gff_file, "a") as gff_handle:
+            gff_handle.write("chr1\tsrc\tgene\t1\t20\t.\t+\t.\tID=T2\n")
+        with self.assertRaises(iobase.InputFileError):
+            list(gff.GFFReader(gff_file, seqid_filter=lambda seqid: seqid == "chr2").records())
+        os.remove(gff_file)
+
+    def test_read_gff_sequences(self):
+        # Tests the function that reads the sequences in the FASTA section of a GFF file
+        gff_file = os.path.join(data_dir, 'gff_without_fasta.gff3')
+        gff_reader = gff.GFFReader(gff_file)
+        list(gff_reader.records())
+        self.assertFalse(gff_reader.has_fasta)
+        self.assertEqual(len(list(gff_reader.sequences())), 0)
 
-    def test_split_off_fasta(self):
-        # Tests the function copying the FASTA section from a GFF file into a separate file
+        # The sequences can be read before the records
         gff_file = os.path.join(data_dir, 'gff_with_fasta.gff3')
-        fasta_file = tempfile.mkstemp()[1]
-        self.client._split_off_fasta(gff_file, fasta_file)
-        actual_fasta_file = os.path.join(data_dir, 'fasta_only.fa')
-        self.assertTrue(filecmp.cmp(fasta_file, actual_fasta_file))
-        os.remove(fasta_file)
+        gff_reader = gff.GFFReader(gff_file)
+        sequences = list(gff_reader.sequences())
+        self.assertTrue(gff_reader.has_fasta)
+        self.assertEqual(len(list(gff_reader.records())), 20)
+        expected_sequences = list(SeqIO.parse(os.path.join(data_dir, 'fasta_only.fa'), "fasta"))
+        self.assertEqual(len(sequences), len(expected_sequences))
+        self.assertEqual(sequences[0].id, expected_sequences[0].id)
+        self.assertEqual(sequences[0].description, expected_sequences[0].description)
+        self.assertEqual(str(sequences[0].seq), str(expected_sequences[0].seq))
+
+    def test_register_sequence_record(self):
+        # Tests the function registering the IDs of GFF records describing sequences
+        gff_reader = gff.GFFReader("testfile")
+        gff_reader._register_sequence_record("chr1\tsrc\tchromosome\t1\t100\t.\t.\t.\tID=chr1;Name=first\n")
+        gff_reader._register_sequence_record("chr1\tsrc\tgene\t1\t20\t.\t+\t.\tID=chr1_gene;Parent=chr1\n")
+        gff_reader._register_sequence_record("chr%3B2\tsrc\tcontig\t1\t100\t.\t.\t.\tName=x;ID=chr%3B2\n")
+        gff_reader._register_sequence_record("chr3\tsrc\tcontig\t1\t100\n")
+        self.assertEqual(gff_reader.sequence_record_ids, {"chr1", "chr;2"})
+
+    @unittest.mock.patch("pychado.io.gff.SeqIO.parse")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._import_sequences")
+    def test_import_gff_sequences(self, mock_import: unittest.mock.Mock, mock_parse: unittest.mock.Mock):
+        # Tests the function importing the sequences of a GFF file before its records
+        self.assertIs(mock_import, self.client._import_sequences)
+        self.assertIs(mock_parse, gff.SeqIO.parse)
+        organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
 
-    @unittest.mock.patch("pychado.io.fasta.FastaImportClient")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient._split_off_fasta")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient._has_fasta")
-    def test_import_fasta(self, mock_includes: unittest.mock.Mock, mock_copy: unittest.mock.Mock,
-                          mock_fasta: unittest.mock.Mock):
-        # Tests the function that imports the FASTA sequences for a GFF file
-        self.assertIs(mock_includes, self.client._has_fasta)
-        self.assertIs(mock_copy, self.client._split_off_fasta)
-        self.assertIs(mock_fasta, fasta.FastaImportClient)
-
-        # FASTA in GFF and separate file
-        mock_includes.return_value = True
+        # Sequences in the FASTA section of the GFF file
+        gff_reader = gff.GFFReader(os.path.join(data_dir, 'gff_with_fasta.gff3'))
+        self.client._import_gff_sequences(gff_reader, "", organism_entry, "contig")
+        mock_import.assert_called_with(unittest.mock.ANY, organism_entry, "contig", gff_reader.sequence_record_ids)
+        self.assertEqual([record.id for record in mock_import.call_args[0][0]], ["CM000574"])
+        mock_parse.assert_not_called()
+
+        # Sequences in a separate FASTA file
+        gff_reader = gff.GFFReader(os.path.join(data_dir, 'gff_without_fasta.gff3'))
+        self.client._import_gff_sequences(gff_reader, "testfasta", organism_entry, "contig")
+        mock_parse.assert_called_with("testfasta", "fasta")
+        mock_import.assert_called_with(mock_parse.return_value, organism_entry, "contig",
+                                       gff_reader.sequence_record_ids)
+
+        # Only one file with sequences is permitted
+        mock_import.reset_mock()
+        gff_reader = gff.GFFReader(os.path.join(data_dir, 'gff_with_fasta.gff3'))
         with self.assertRaises(iobase.InputFileError):
-            self.client._import_fasta("testgff", "testfasta", "testorganism", "region")
-
-        # FASTA in separate file only
-        mock_includes.return_value = False
-        mock_copy.reset_mock()
-        mock_fasta.reset_mock()
-        self.client._import_fasta("testgff", "testfasta", "testorganism", "region")
-        mock_includes.assert_called_with("testgff")
-        mock_copy.assert_not_called()
-        mock_fasta.assert_called_with("testuri", False)
-        self.assertIn(unittest.mock.call().load("testfasta", "testorganism", "region"), mock_fasta.mock_calls)
-
-        # FASTA in GFF only
-        mock_includes.return_value = True
-        mock_copy.reset_mock()
-        mock_fasta.reset_mock()
-        self.client._import_fasta("testgff", "", "testorganism", "region")
-        mock_includes.assert_called_with("testgff")
-        mock_copy.assert_called()
-        mock_fasta.assert_called()
-
-        # No FASTA
-        mock_includes.return_value = False
-        mock_copy.reset_mock()
-        mock_fasta.reset_mock()
-        self.client._import_fasta("testgff", "", "testorganism", "region")
-        mock_includes.assert_called_with("testgff")
-        mock_copy.assert_not_called()
-        mock_fasta.assert_not_called()
+            self.client._import_gff_sequences(gff_reader, "testfasta", organism_entry, "contig")
+        mock_import.assert_not_called()
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_deferred_locations")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._mark_as_top_level_sequence")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_sequence")
+    def test_import_sequences(self, mock_handle: unittest.mock.Mock, mock_mark: unittest.mock.Mock,
+                              mock_locations: unittest.mock.Mock):
+        # Tests the function that imports sequences from FASTA records
+        self.assertIs(mock_handle, self.client._handle_sequence)
+        self.assertIs(mock_mark, self.client._mark_as_top_level_sequence)
+        self.assertIs(mock_locations, self.client._handle_deferred_locations)
+
+        organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
+        fasta_record = SeqIO.SeqRecord(Seq.Seq("ACGT"), id="testseqid")
+        feature_entry = sequence.Feature(organism_id=1, type_id=43, uniquename="testseqid", feature_id=2)
+        mock_handle.return_value = feature_entry
+        self.client._import_sequences(iter([fasta_record]), organism_entry, "chromosome", {"testseqid": 12})
+        mock_handle.assert_called_with(fasta_record, organism_entry, self.client._sequence_terms["chromosome"], True)
+        mock_mark.assert_called_with(feature_entry)
+        mock_locations.assert_called_with(feature_entry)
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_feature")
+    def test_handle_sequence(self, mock_insert: unittest.mock.Mock):
+        # Tests the function transferring data from a FASTA record to the 'feature' table
+        self.assertIs(mock_insert, self.client._handle_feature)
+
+        organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
+        type_entry = self.client._sequence_terms["chromosome"]
+        fasta_record = SeqIO.SeqRecord(Seq.Seq("ACGT"), id="testseqid", description="testseqid")
+        mock_insert.return_value = sequence.Feature(organism_id=1, type_id=43, uniquename="testseqid", feature_id=2)
+        self.client._feature_index = {}
+
+        feature_entry = self.client._handle_sequence(fasta_record, organism_entry, type_entry, False)
+        new_feature_entry = mock_insert.call_args[0][0]
+        self.assertEqual(new_feature_entry.uniquename, "testseqid")
+        self.assertEqual(new_feature_entry.residues, "ACGT")
+        self.assertEqual(new_feature_entry.type_id, 43)
+        self.assertIs(feature_entry, mock_insert.return_value)
+        self.assertEqual(self.client._feature_index, {"testseqid": (2, 43, False)})
+        self.assertTrue(self.client._buffer_entries)
+
+        self.client._handle_sequence(fasta_record, organism_entry, type_entry, True)
+        new_feature_entry = mock_insert.call_args[0][0]
+        self.assertIsNone(new_feature_entry.type_id)
+        self.client._feature_index = {}
+
+        # New sequences get a type, even if their GFF record is imported later on
+        self.client._handle_sequence(fasta_record, organism_entry, type_entry, True)
+        new_feature_entry = mock_insert.call_args[0][0]
+        self.assertEqual(new_feature_entry.type_id, 43)
+        self.client._feature_index = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_featureloc")
+    def test_handle_deferred_locations(self, mock_insert: unittest.mock.Mock):
+        # Tests the function inserting feature locations that were waiting for their 'srcfeature'
+        self.assertIs(mock_insert, self.client._handle_featureloc)
+
+        featureloc_entry = sequence.FeatureLoc(feature_id=1, srcfeature_id=None, fmin=0, fmax=30)
+        self.client._deferred_locations = {"testseqid": [("testname", featureloc_entry)]}
+        self.client._deferred_featurelocs = {1: featureloc_entry}
+        srcfeature_entry = sequence.Feature(organism_id=1, type_id=43, uniquename="otherseqid", feature_id=3)
+        self.client._handle_deferred_locations(srcfeature_entry)
+        mock_insert.assert_not_called()
+
+        srcfeature_entry = sequence.Feature(organism_id=1, type_id=43, uniquename="testseqid", feature_id=2)
+        self.client._handle_deferred_locations(srcfeature_entry)
+        mock_insert.assert_called_with(featureloc_entry, "testname")
+        self.assertEqual(featureloc_entry.srcfeature_id, 2)
+        self.assertEqual(self.client._deferred_locations, {})
+        self.assertEqual(self.client._deferred_featurelocs, {})
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._delete_record_checksums")
+    def test_handle_unresolved_locations(self, mock_delete: unittest.mock.Mock):
+        # Tests the function reporting feature locations without 'srcfeature'
+        self.assertIs(mock_delete, self.client._delete_record_checksums)
+        featureloc_entry = sequence.FeatureLoc(feature_id=1, srcfeature_id=None, fmin=0, fmax=30)
+        self.client._deferred_locations = {"testseqid": [("testname", featureloc_entry)]}
+        self.client._deferred_featurelocs = {1: featureloc_entry}
+        self.client._handle_unresolved_locations()
+        mock_delete.assert_called_with([1])
+        self.assertEqual(self.client._deferred_locations, {})
+        self.assertEqual(self.client._deferred_featurelocs, {})
 
     @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_table")
     def test_handle_existing_features(self, mock_query: unittest.mock.Mock):
@@ -168,6 +304,124 @@ class TestGFFImport(unittest.TestCase):
         self.assertIn(unittest.mock.call.delete(), mock_query_object.method_calls)
         self.assertEqual(len(mock_query_object.mock_calls), 2)
 
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_relationship_by_type_and_organism")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_pub_by_organism")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_cvterm_by_ontology_and_organism")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_dbxref_by_organism")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_synonym_by_type_and_organism")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_featureprop_by_type_and_organism")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_ids_by_regions")
+    def test_prefetch_feature_attributes(self, mock_ids: unittest.mock.Mock, mock_props: unittest.mock.Mock,
+                                         mock_synonyms: unittest.mock.Mock, mock_dbxrefs: unittest.mock.Mock,
+                                         mock_cvterms: unittest.mock.Mock, mock_pubs: unittest.mock.Mock,
+                                         mock_relationships: unittest.mock.Mock):
+        # Tests the function loading existing entries associated with the features of an organism on a sequence
+        self.assertIs(mock_ids, self.client.query_feature_ids_by_regions)
+        self.assertIs(mock_props, self.client.query_featureprop_by_type_and_organism)
+        self.assertIs(mock_synonyms, self.client.query_feature_synonym_by_type_and_organism)
+        self.assertIs(mock_dbxrefs, self.client.query_feature_dbxref_by_organism)
+        self.assertIs(mock_cvterms, self.client.query_feature_cvterm_by_ontology_and_organism)
+        self.assertIs(mock_pubs, self.client.query_feature_pub_by_organism)
+        self.assertIs(mock_relationships, self.client.query_feature_relationship_by_type_and_organism)
+
+        organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
+        first_prop = sequence.FeatureProp(feature_id=12, type_id=51, value="A")
+        second_prop = sequence.FeatureProp(feature_id=12, type_id=52, value="B")
+        third_prop = sequence.FeatureProp(feature_id=13, type_id=51, value="C")
+        mock_props.return_value.filter.return_value.all.return_value = [first_prop, second_prop, third_prop]
+        relationship = sequence.FeatureRelationship(subject_id=12, object_id=13, type_id=62)
+        mock_relationships.return_value.filter.return_value.all.return_value = [relationship]
+        mock_ids.return_value.__iter__.return_value = [(12, ), (13, ), (14, )]
+
+        self.client._prefetch_feature_attributes(organism_entry, 11, [(0, 1000)])
+        mock_ids.assert_called_with({11: [(0, 1000)]})
+        mock_props.assert_called_with(1, [51, 52, 53])
+        mock_props.return_value.filter.assert_called()
+        mock_synonyms.assert_called_with(1, [31, 32, 33])
+        mock_dbxrefs.assert_called_with(1)
+        mock_cvterms.assert_called_with(1, 131)
+        mock_pubs.assert_called_with(1)
+        mock_relationships.assert_called_with(1, [62, 63])
+        self.assertEqual(self.client._prefetched_featureprops, {12: [first_prop, second_prop], 13: [third_prop]})
+        self.assertEqual(self.client._prefetched_feature_relationships, {12: [relationship]})
+        self.assertEqual(self.client._prefetched_feature_ids, {12, 13, 14})
+
+        # Features that have been loaded before are not loaded again
+        mock_props.reset_mock()
+        mock_ids.return_value.__iter__.return_value = [(13, ), (14, )]
+        self.client._prefetch_feature_attributes(organism_entry, 11, [(1000, 2000)])
+        mock_props.assert_not_called()
+        self.assertEqual(self.client._prefetched_featureprops, {12: [first_prop, second_prop], 13: [third_prop]})
+        for prefetched_entries in [self.client._prefetched_featureprops, self.client._prefetched_feature_synonyms,
+                                   self.client._prefetched_feature_dbxrefs, self.client._prefetched_feature_cvterms,
+                                   self.client._prefetched_feature_pubs,
+                                   self.client._prefetched_feature_relationships,
+                                   self.client._prefetched_feature_ids]:
+            prefetched_entries.clear()
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._release_processed_features")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._prefetch_feature_attributes")
+    def test_prefetch_window_attributes(self, mock_prefetch: unittest.mock.Mock, mock_release: unittest.mock.Mock):
+        # Tests the function loading existing entries associated with the features in a sequence window once
+        self.assertIs(mock_prefetch, self.client._prefetch_feature_attributes)
+        self.assertIs(mock_release, self.client._release_processed_features)
+        organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
+        self.client._feature_index = {"testseqid": (11, 42, False)}
+        self.client._prefetched_windows = set()
+        self.client.prefetch_window_size = 1000
+        self.client.fresh_load = False
+        self.client._prefetch_window_attributes(
+            gffutils.Feature(seqid="testseqid", featuretype="gene", start=1001, end=3000), organism_entry)
+        mock_prefetch.assert_called_with(organism_entry, 11, [(1000, 2000)])
+        self.assertEqual(self.client._prefetched_windows, {("testseqid", 1)})
+
+        # Only the first record in a window triggers the prefetch
+        mock_prefetch.reset_mock()
+        self.client._prefetch_window_attributes(
+            gffutils.Feature(seqid="testseqid", featuretype="exon", start=2000, end=2100), organism_entry)
+        mock_prefetch.assert_not_called()
+        self.client._prefetch_window_attributes(
+            gffutils.Feature(seqid="testseqid", featuretype="exon", start=1, end=100), organism_entry)
+        mock_prefetch.assert_called_with(organism_entry, 11, [(0, 1000)])
+        mock_release.assert_not_called()
+
+        # Entries loaded before are released once their number reaches the limit
+        self.client.prefetch_limit = 2
+        self.client._prefetched_feature_ids = {12, 13}
+        self.client._prefetch_window_attributes(
+            gffutils.Feature(seqid="testseqid", featuretype="gene", start=5001, end=5100), organism_entry)
+        mock_release.assert_called()
+        mock_prefetch.assert_called_with(organism_entry, 11, [(5000, 6000)])
+        self.client.prefetch_limit = 10000
+        self.client._prefetched_feature_ids = set()
+
+        # Sequences not present in the database have no features yet
+        mock_prefetch.reset_mock()
+        self.client._prefetch_window_attributes(
+            gffutils.Feature(seqid="otherseqid", featuretype="gene", start=1, end=100), organism_entry)
+        mock_prefetch.assert_not_called()
+
+        # No existing features during a fresh load
+        self.client.fresh_load = True
+        self.client._prefetched_windows = set()
+        self.client._prefetch_window_attributes(
+            gffutils.Feature(seqid="testseqid", featuretype="gene", start=1, end=100), organism_entry)
+        mock_prefetch.assert_not_called()
+        self.client.fresh_load = False
+        self.client.prefetch_window_size = 10000
+        self.client._feature_index = {}
+
+    def test_update_prefetched_entries(self):
+        # Tests the function keeping prefetched entries up to date
+        existing_entries = [utils.EmptyObject(value="A"), utils.EmptyObject(value="B")]
+        new_entries = [existing_entries[0], utils.EmptyObject(value="C")]
+        deleted_entries = [existing_entries[1]]
+        prefetched_entries = {}
+        self.client._update_prefetched_entries(prefetched_entries, 12, existing_entries, new_entries,
+                                               deleted_entries)
+        self.assertEqual(prefetched_entries, {12: [existing_entries[0], new_entries[1]]})
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_record_checksum")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._check_if_gff_attributes_are_recognized")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_protein")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_relationships")
@@ -177,14 +431,20 @@ class TestGFFImport(unittest.TestCase):
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_properties")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_synonyms")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_location")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._load_feature_attributes")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_child_feature")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._prefetch_window_attributes")
     def test_insert_gff_record_into_database(
-            self, mock_handle_child: unittest.mock.Mock, mock_handle_location: unittest.mock.Mock,
+            self, mock_prefetch: unittest.mock.Mock, mock_handle_child: unittest.mock.Mock,
+            mock_load: unittest.mock.Mock, mock_handle_location: unittest.mock.Mock,
             mock_handle_synonyms: unittest.mock.Mock, mock_handle_properties: unittest.mock.Mock,
             mock_handle_cross_references: unittest.mock.Mock, mock_handle_ontology_terms: unittest.mock.Mock,
             mock_handle_publications: unittest.mock.Mock, mock_handle_relationships: unittest.mock.Mock,
-            mock_handle_protein: unittest.mock.Mock, mock_check_recognized: unittest.mock.Mock):
+            mock_handle_protein: unittest.mock.Mock, mock_check_recognized: unittest.mock.Mock,
+            mock_handle_checksum: unittest.mock.Mock):
         # Tests the main function updating database tables according to the information in a GFF record
+        self.assertIs(mock_prefetch, self.client._prefetch_window_attributes)
+        self.assertIs(mock_load, self.client._load_feature_attributes)
         self.assertIs(mock_handle_child, self.client._handle_child_feature)
         self.assertIs(mock_handle_location, self.client._handle_location)
         self.assertIs(mock_handle_synonyms, self.client._handle_synonyms)
@@ -195,12 +455,15 @@ class TestGFFImport(unittest.TestCase):
         self.assertIs(mock_handle_relationships, self.client._handle_relationships)
         self.assertIs(mock_handle_protein, self.client._handle_protein)
         self.assertIs(mock_check_recognized, self.client._check_if_gff_attributes_are_recognized)
+        self.assertIs(mock_handle_checksum, self.client._handle_record_checksum)
 
         organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
         all_features = {}
         mock_handle_child.return_value = None
         self.client._insert_gff_record_into_database(self.default_gff_record, organism_entry, all_features)
+        mock_prefetch.assert_called_with(self.default_gff_record, organism_entry)
         mock_handle_child.assert_called_with(self.default_gff_record, organism_entry)
+        mock_load.assert_not_called()
         mock_handle_location.assert_not_called()
         self.assertEqual(len(all_features), 0)
 
@@ -208,23 +471,30 @@ class TestGFFImport(unittest.TestCase):
         mock_handle_child.return_value = feature_entry
         self.client._insert_gff_record_into_database(self.default_gff_record, organism_entry, all_features)
         mock_handle_child.assert_called_with(self.default_gff_record, organism_entry)
+        mock_load.assert_called_with(1)
         mock_handle_location.assert_called_with(self.default_gff_record, feature_entry)
         mock_handle_synonyms.assert_called_with(self.default_gff_record, feature_entry)
         mock_handle_properties.assert_called_with(self.default_gff_record, feature_entry)
         mock_handle_cross_references.assert_called_with(self.default_gff_record, feature_entry)
         mock_handle_ontology_terms.assert_called_with(self.default_gff_record, feature_entry)
         mock_handle_publications.assert_called_with(self.default_gff_record, feature_entry)
-        mock_handle_relationships.assert_called_with(self.default_gff_record, feature_entry, all_features)
+        mock_handle_relationships.assert_called_with(self.default_gff_record, feature_entry)
         mock_handle_protein.assert_called_with(self.default_gff_record, feature_entry, organism_entry, all_features)
         mock_check_recognized.assert_called_with(self.default_gff_record)
-        self.assertEqual(len(all_features), 1)
+        mock_handle_checksum.assert_called_with(self.default_gff_record, feature_entry)
+        self.assertEqual(all_features, {"testname": 1})
+        self.assertEqual(self.client._processed_feature_ids, [1])
+        self.client._processed_feature_ids.clear()
 
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_deferred_locations")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_feature")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._create_feature")
-    def test_handle_child_feature(self, mock_create: unittest.mock.Mock, mock_insert: unittest.mock.Mock):
+    def test_handle_child_feature(self, mock_create: unittest.mock.Mock, mock_insert: unittest.mock.Mock,
+                                  mock_locations: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'feature' table
         self.assertIs(mock_create, self.client._create_feature)
         self.assertIs(mock_insert, self.client._handle_feature)
+        self.assertIs(mock_locations, self.client._handle_deferred_locations)
         organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
         feature_entry = self.client._handle_child_feature(self.default_gff_record, organism_entry)
         self.assertIsNone(feature_entry)
@@ -232,50 +502,210 @@ class TestGFFImport(unittest.TestCase):
 
         self.default_gff_record.featuretype = "gene"
         mock_create.return_value = "AAA"
+        mock_insert.return_value = sequence.Feature(organism_id=1, type_id=41, uniquename="testid", feature_id=12)
+        self.client._feature_index = {}
         self.client._handle_child_feature(self.default_gff_record, organism_entry)
         mock_create.assert_called_with(self.default_gff_record, 1, 41)
         mock_insert.assert_called_with("AAA", "testorganism")
+        mock_locations.assert_called_with(mock_insert.return_value)
+        self.assertEqual(self.client._feature_index, {"testid": (12, 41, False)})
+        self.assertEqual(self.client._unlocated_new_feature_ids, set())
+
+        mock_create.return_value = sequence.Feature(organism_id=1, type_id=41, uniquename="testid", feature_id=13)
+        mock_insert.return_value = mock_create.return_value
+        self.client._handle_child_feature(self.default_gff_record, organism_entry)
+        self.assertEqual(self.client._unlocated_new_feature_ids, {13})
+        self.client._unlocated_new_feature_ids = set()
+
+    def test_find_feature(self):
+        # Tests the function looking up a feature in the feature index
+        self.client._feature_index = {"testname": (12, 41, False)}
+        with unittest.mock.patch.object(self.client, "session", create=True) as mock_session:
+            feature_entry = self.client._find_feature(1, "othername")
+            self.assertIsNone(feature_entry)
+            mock_session.query.assert_not_called()
+
+            self.client._find_feature(1, "testname")
+            mock_session.query.assert_called_with(sequence.Feature)
+            mock_session.query.return_value.get.assert_called_with(12)
+
+            buffered_entry = sequence.Feature(organism_id=1, type_id=41, uniquename="testname", feature_id=12)
+            self.client._buffered_features = {12: buffered_entry}
+            self.client.full_attributes = False
+            mock_session.reset_mock()
+            feature_entry = self.client._find_feature(1, "testname")
+            self.assertIs(feature_entry, buffered_entry)
+            mock_session.query.assert_not_called()
+        self.client.full_attributes = True
+        self.client._buffered_features = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_first")
+    def test_find_featureloc(self, mock_query_first: unittest.mock.Mock):
+        # Tests the function looking up the featureloc of a feature
+        self.assertIs(mock_query_first, self.client.query_first)
+
+        buffered_entry = sequence.FeatureLoc(feature_id=12, srcfeature_id=1)
+        self.client._buffered_featurelocs = {12: buffered_entry}
+        featureloc_entry = self.client._find_featureloc(12)
+        self.assertIs(featureloc_entry, buffered_entry)
+        mock_query_first.assert_not_called()
+
+        self.client._find_featureloc(13)
+        mock_query_first.assert_called_with(sequence.FeatureLoc, feature_id=13)
+        self.client._buffered_featurelocs = {}
+
+        mock_query_first.reset_mock()
+        self.client._unlocated_new_feature_ids = {14}
+        featureloc_entry = self.client._find_featureloc(14)
+        self.assertIsNone(featureloc_entry)
+        mock_query_first.assert_not_called()
+        self.client._unlocated_new_feature_ids = set()
+
+    @unittest.mock.patch("pychado.io.iobase.ChadoClient._handle_featureloc")
+    def test_handle_featureloc(self, mock_handle: unittest.mock.Mock):
+        # Tests the function inserting or updating a featureloc, which keeps track of new features without location
+        featureloc_entry = sequence.FeatureLoc(feature_id=14, srcfeature_id=1)
+        self.client._unlocated_new_feature_ids = {14, 15}
+        self.client._handle_featureloc(featureloc_entry, "testname")
+        mock_handle.assert_called_with(featureloc_entry, "testname")
+        self.assertEqual(self.client._unlocated_new_feature_ids, {15})
+        self.client._unlocated_new_feature_ids = set()
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.reserve_primary_keys")
+    @unittest.mock.patch("pychado.io.iobase.IOClient.add_and_flush")
+    def test_add_and_flush(self, mock_add: unittest.mock.Mock, mock_reserve: unittest.mock.Mock):
+        # Tests the function adding entries to the database or to the buffers for bulk insertion
+        self.assertIs(mock_reserve, self.client.reserve_primary_keys)
+
+        feature_entry = sequence.Feature(organism_id=1, type_id=41, uniquename="testname")
+        self.client.add_and_flush(feature_entry)
+        mock_add.assert_called_with(feature_entry)
+        mock_reserve.assert_not_called()
+
+        self.client.fresh_load = True
+        mock_add.reset_mock()
+        mock_reserve.return_value = [7, 8]
+        self.client.add_and_flush(feature_entry)
+        synonym_entry = sequence.FeatureSynonym(synonym_id=1, feature_id=7, pub_id=1)
+        self.client.add_and_flush(synonym_entry)
+        mock_add.assert_not_called()
+        mock_reserve.assert_any_call(sequence.Feature, 1000)
+        mock_reserve.assert_any_call(sequence.FeatureSynonym, 1000)
+        self.assertEqual(feature_entry.feature_id, 7)
+        self.assertEqual(synonym_entry.feature_synonym_id, 7)
+        self.assertTrue(synonym_entry.is_current)
+        self.assertFalse(synonym_entry.is_internal)
+        self.assertEqual(self.client._copy_buffers, {sequence.Feature: [feature_entry],
+                                                     sequence.FeatureSynonym: [synonym_entry]})
+        self.assertEqual(self.client._buffered_features, {7: feature_entry})
+
+        self.client.add_and_flush(pub.Pub(uniquename="testpub", type_id=1))
+        mock_add.assert_called()
+
+        self.client.fresh_load = False
+        self.client._copy_buffers = {}
+        self.client._reserved_primary_keys = {}
+        self.client._buffered_features = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.attach_copied_entries")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.copy_into_table")
+    def test_copy_buffered_entries(self, mock_copy: unittest.mock.Mock, mock_attach: unittest.mock.Mock):
+        # Tests the function inserting buffered entries into the database
+        self.assertIs(mock_copy, self.client.copy_into_table)
+        self.assertIs(mock_attach, self.client.attach_copied_entries)
+
+        feature_entry = sequence.Feature(organism_id=1, type_id=41, uniquename="testname", feature_id=7)
+        featureloc_entry = sequence.FeatureLoc(feature_id=7, srcfeature_id=1, featureloc_id=8)
+        self.client._copy_buffers = {sequence.FeatureLoc: [featureloc_entry], sequence.Feature: [feature_entry]}
+        self.client._buffered_features = {7: feature_entry}
+        self.client._buffered_featurelocs = {7: featureloc_entry}
+        with unittest.mock.patch.object(self.client, "session", create=True) as mock_session:
+            self.client._copy_buffered_entries(attach=False)
+            mock_session.flush.assert_called()
+        self.assertEqual(mock_copy.call_args_list[0], unittest.mock.call(sequence.Feature, [feature_entry]))
+        self.assertEqual(mock_copy.call_args_list[1], unittest.mock.call(sequence.FeatureLoc, [featureloc_entry]))
+        mock_attach.assert_not_called()
+        self.assertEqual(self.client._copy_buffers, {})
+        self.assertEqual(self.client._buffered_features, {})
+        self.assertEqual(self.client._buffered_featurelocs, {})
+
+        self.client._copy_buffers = {sequence.Feature: [feature_entry]}
+        with unittest.mock.patch.object(self.client, "session", create=True):
+            self.client._copy_buffered_entries(attach=True)
+        mock_attach.assert_any_call(sequence.Feature, [feature_entry])
 
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_featureloc")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._create_featureloc")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_first")
-    def test_handle_location(self, mock_query: unittest.mock.Mock, mock_create: unittest.mock.Mock,
-                             mock_insert: unittest.mock.Mock):
+    def test_handle_location(self, mock_create: unittest.mock.Mock, mock_insert: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'feature' table
-        self.assertIs(mock_query, self.client.query_first)
         self.assertIs(mock_create, self.client._create_featureloc)
         self.assertIs(mock_insert, self.client._handle_featureloc)
 
         feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testname", feature_id=1)
-        mock_query.return_value = sequence.Feature(organism_id=11, type_id=300, uniquename="chromname", feature_id=2)
+        self.client._feature_index = {"testseqid": (2, 300, False)}
 
         featureloc_entry = self.client._handle_location(self.default_gff_record, feature_entry)
-        mock_query.assert_called_with(sequence.Feature, organism_id=11, uniquename="testseqid")
         mock_create.assert_called_with(self.default_gff_record, 1, 2)
         mock_insert.assert_called()
         self.assertIsNotNone(featureloc_entry)
 
-        mock_query.return_value = None
+        self.client._feature_index = {}
+        mock_insert.reset_mock()
         featureloc_entry = self.client._handle_location(self.default_gff_record, feature_entry)
         self.assertIsNone(featureloc_entry)
+        mock_insert.assert_not_called()
+        self.assertIn("testseqid", self.client._deferred_locations)
+        self.assertIn(1, self.client._deferred_featurelocs)
+        self.client._deferred_locations = {}
+        self.client._deferred_featurelocs = {}
 
-        mock_query.return_value = sequence.Feature(organism_id=11, type_id=300, uniquename="chromname", feature_id=2)
+        self.client._feature_index = {"testseqid": (2, 300, False)}
         self.default_gff_record.seqid = self.default_gff_record.id
         featureloc_entry = self.client._handle_location(self.default_gff_record, feature_entry)
         self.assertIsNone(featureloc_entry)
 
+    def test_partition_of(self):
+        # Tests the function assigning sequences to subsets
+        partitions = [self.client._partition_of(seqid, 3) for seqid in ["chr1", "chr2", "chr1"]]
+        self.assertEqual(partitions[0], partitions[2])
+        self.assertTrue(all(0 <= partition < 3 for partition in partitions))
+        self.assertEqual(self.client._partition_of("chr1", 1), 0)
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_dbxref")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_db")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_pub")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_synonym")
+    def test_handle_shared_entries(self, mock_insert_synonym: unittest.mock.Mock, mock_insert_pub: unittest.mock.Mock,
+                                   mock_insert_db: unittest.mock.Mock, mock_insert_dbxref: unittest.mock.Mock):
+        # Tests the function inserting entries that can be shared between features before a parallel import
+        self.assertIs(mock_insert_synonym, self.client._handle_synonym)
+        self.assertIs(mock_insert_pub, self.client._handle_pub)
+        self.assertIs(mock_insert_db, self.client._handle_db)
+        self.assertIs(mock_insert_dbxref, self.client._handle_dbxref)
+
+        mock_insert_db.return_value = general.Db(name="testdb", db_id=44)
+        self.client._handle_shared_entries(self.default_gff_record)
+        self.assertEqual(mock_insert_synonym.call_count, 2)
+        self.assertEqual(mock_insert_synonym.call_args[0][0].name, "testsynonym")
+        self.assertEqual(mock_insert_synonym.call_args[0][0].type_id, 32)
+        mock_insert_pub.assert_called_once()
+        self.assertEqual(mock_insert_pub.call_args[0][0].uniquename, "PMID:12334")
+        self.assertEqual(mock_insert_pub.call_args[0][0].type_id, 71)
+        self.assertEqual(mock_insert_db.call_args[0][0].name, "testdb")
+        self.assertEqual(mock_insert_dbxref.call_args[0][0].db_id, 44)
+        self.assertEqual(mock_insert_dbxref.call_args[0][0].accession, "testaccession")
+        self.assertEqual(mock_insert_dbxref.call_args[0][1], "testdb")
+
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._delete_feature_synonym")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_feature_synonym")
     @unittest.mock.patch("pychado.orm.sequence.FeatureSynonym")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_synonym")
     @unittest.mock.patch("pychado.orm.sequence.Synonym")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_synonym_by_type")
-    def test_handle_synonyms(self, mock_query: unittest.mock.Mock, mock_synonym: unittest.mock.Mock,
+    def test_handle_synonyms(self, mock_synonym: unittest.mock.Mock,
                              mock_insert_synonym: unittest.mock.Mock, mock_feature_synonym: unittest.mock.Mock,
                              mock_insert_feature_synonym: unittest.mock.Mock,
                              mock_delete_feature_synonym: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'feature_synonym' table
-        self.assertIs(mock_query, self.client.query_feature_synonym_by_type)
         self.assertIs(mock_synonym, sequence.Synonym)
         self.assertIs(mock_insert_synonym, self.client._handle_synonym)
         self.assertIs(mock_feature_synonym, sequence.FeatureSynonym)
@@ -284,9 +714,15 @@ class TestGFFImport(unittest.TestCase):
 
         feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testname", feature_id=1)
         mock_insert_synonym.return_value = utils.EmptyObject(synonym_id=12)
+        existing_synonyms = [utils.EmptyObject(synonym_id=13)]
+        self.client._prefetched_feature_synonyms = {1: existing_synonyms}
+        mock_delete_feature_synonym.return_value = []
 
         all_synonyms = self.client._handle_synonyms(self.default_gff_record, feature_entry)
-        mock_query.assert_called_with(1, [31, 32, 33])
+        mock_insert_feature_synonym.assert_any_call(mock_feature_synonym.return_value, existing_synonyms,
+                                                    "testalias", "testname")
+        self.assertIn(mock_insert_feature_synonym.return_value, self.client._prefetched_feature_synonyms[1])
+        self.assertIn(existing_synonyms[0], self.client._prefetched_feature_synonyms[1])
         mock_synonym.assert_any_call(name="testalias", type_id=33, synonym_sgml="testalias")
         self.assertEqual(mock_insert_synonym.call_count, 2)
         mock_feature_synonym.assert_any_call(synonym_id=12, feature_id=1, pub_id=33, is_current=None)
@@ -300,18 +736,24 @@ class TestGFFImport(unittest.TestCase):
         mock_feature_synonym.assert_any_call(synonym_id=12, feature_id=1, pub_id=33, is_current=False)
         self.assertEqual(len(all_synonyms), 3)
 
+        mock_delete_feature_synonym.reset_mock()
+        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="othername", feature_id=2)
+        gff_record = gffutils.Feature(id="othername", seqid="testseqid", featuretype="exon", start=1, end=30)
+        all_synonyms = self.client._handle_synonyms(gff_record, feature_entry)
+        self.assertEqual(all_synonyms, [])
+        mock_delete_feature_synonym.assert_not_called()
+        self.assertNotIn(2, self.client._prefetched_feature_synonyms)
+
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._delete_feature_pub")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_feature_pub")
     @unittest.mock.patch("pychado.orm.sequence.FeaturePub")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_pub")
     @unittest.mock.patch("pychado.orm.pub.Pub")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_all")
-    def test_handle_publications(self, mock_query: unittest.mock.Mock, mock_pub: unittest.mock.Mock,
+    def test_handle_publications(self, mock_pub: unittest.mock.Mock,
                                  mock_insert_pub: unittest.mock.Mock, mock_featurepub: unittest.mock.Mock,
                                  mock_insert_feature_pub: unittest.mock.Mock,
                                  mock_delete_feature_pub: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'feature_pub' table
-        self.assertIs(mock_query, self.client.query_all)
         self.assertIs(mock_pub, pub.Pub)
         self.assertIs(mock_insert_pub, self.client._handle_pub)
         self.assertIs(mock_featurepub, sequence.FeaturePub)
@@ -320,9 +762,14 @@ class TestGFFImport(unittest.TestCase):
 
         feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testname", feature_id=12)
         mock_insert_pub.return_value = utils.EmptyObject(pub_id=32, uniquename="")
+        existing_feature_pub = utils.EmptyObject(pub_id=31)
+        self.client._prefetched_feature_pubs = {12: [existing_feature_pub]}
+        mock_delete_feature_pub.return_value = [existing_feature_pub]
 
         all_pubs = self.client._handle_publications(self.default_gff_record, feature_entry)
-        mock_query.assert_called_with(sequence.FeaturePub, feature_id=12)
+        mock_insert_feature_pub.assert_called_with(mock_featurepub.return_value, [existing_feature_pub],
+                                                   "testname", "")
+        self.assertEqual(self.client._prefetched_feature_pubs[12], [mock_insert_feature_pub.return_value])
         mock_pub.assert_any_call(uniquename="PMID:12334", type_id=71)
         self.assertEqual(mock_insert_pub.call_count, 1)
         mock_featurepub.assert_any_call(feature_id=12, pub_id=32)
@@ -333,27 +780,24 @@ class TestGFFImport(unittest.TestCase):
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._delete_feature_relationship")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_feature_relationship")
     @unittest.mock.patch("pychado.orm.sequence.FeatureRelationship")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_first")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_relationship_by_type")
-    def test_handle_relationships(self, mock_query: unittest.mock.Mock, mock_query_first: unittest.mock.Mock,
-                                  mock_relationship: unittest.mock.Mock,
+    def test_handle_relationships(self, mock_relationship: unittest.mock.Mock,
                                   mock_insert_relationship: unittest.mock.Mock,
                                   mock_delete_relationship: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'feature_relationship' table
-        self.assertIs(mock_query, self.client.query_feature_relationship_by_type)
-        self.assertIs(mock_query_first, self.client.query_first)
         self.assertIs(mock_relationship, sequence.FeatureRelationship)
         self.assertIs(mock_insert_relationship, self.client._handle_feature_relationship)
         self.assertIs(mock_delete_relationship, self.client._delete_feature_relationship)
 
         subject_entry = sequence.Feature(organism_id=11, type_id=300, uniquename="testid", feature_id=33)
-        object_entry = sequence.Feature(organism_id=11, type_id=400, uniquename="testparent", feature_id=44)
-        mock_query_first.return_value = object_entry
-
-        all_features = {object_entry.uniquename: object_entry}
-        all_relationships = self.client._handle_relationships(self.default_gff_record, subject_entry, all_features)
-        mock_query.assert_called_with(33, [62, 63])
-        mock_query_first.assert_not_called()
+        self.client._feature_index = {"testparent": (44, 400, False)}
+        self.client._prefetched_feature_relationships = {}
+        mock_delete_relationship.return_value = []
+
+        all_relationships = self.client._handle_relationships(self.default_gff_record, subject_entry)
+        mock_insert_relationship.assert_called_with(mock_relationship.return_value, [], "testid", "testparent",
+                                                    "part_of")
+        self.assertEqual(self.client._prefetched_feature_relationships[33],
+                         [mock_insert_relationship.return_value])
         mock_relationship.assert_any_call(subject_id=33, object_id=44, type_id=62)
         self.assertEqual(mock_insert_relationship.call_count, 1)
         mock_delete_relationship.assert_called()
@@ -362,30 +806,60 @@ class TestGFFImport(unittest.TestCase):
         mock_relationship.reset_mock()
         mock_insert_relationship.reset_mock()
         mock_delete_relationship.reset_mock()
-        all_features = {}
-        all_relationships = self.client._handle_relationships(self.default_gff_record, subject_entry, all_features)
-        mock_query.assert_called_with(33, [62, 63])
-        mock_query_first.assert_called_with(sequence.Feature, organism_id=11, uniquename="testparent")
-        mock_relationship.assert_any_call(subject_id=33, object_id=44, type_id=62)
-        self.assertEqual(mock_insert_relationship.call_count, 1)
+        self.client._feature_index = {}
+        all_relationships = self.client._handle_relationships(self.default_gff_record, subject_entry)
+        mock_relationship.assert_not_called()
+        mock_insert_relationship.assert_not_called()
         mock_delete_relationship.assert_called()
-        self.assertEqual(len(all_relationships), 1)
+        self.assertEqual(len(all_relationships), 0)
+
+        # When running in parallel, relationships with missing objects are put on hold
+        self.client._unresolved_relationships = []
+        all_relationships = self.client._handle_relationships(self.default_gff_record, subject_entry)
+        mock_insert_relationship.assert_not_called()
+        self.assertEqual(len(all_relationships), 0)
+        self.assertEqual(self.client._unresolved_relationships, [("testid", "testparent", "part_of")])
+        self.client._unresolved_relationships = None
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_all")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_feature_relationship")
+    @unittest.mock.patch("pychado.orm.sequence.FeatureRelationship")
+    def test_handle_unresolved_relationships(self, mock_relationship: unittest.mock.Mock,
+                                             mock_insert_relationship: unittest.mock.Mock,
+                                             mock_query: unittest.mock.Mock):
+        # Tests the function inserting relationships between features imported by different processes
+        self.assertIs(mock_relationship, sequence.FeatureRelationship)
+        self.assertIs(mock_insert_relationship, self.client._handle_feature_relationship)
+        self.assertIs(mock_query, self.client.query_all)
+
+        self.client._feature_index = {"testid": (33, 300, False), "testparent": (44, 400, False)}
+        mock_query.return_value = []
+        self.client._handle_unresolved_relationships([("testid", "testparent", "derives_from"),
+                                                      ("testid", "unknown", "part_of")])
+        mock_query.assert_called_with(sequence.FeatureRelationship, subject_id=33)
+        mock_relationship.assert_called_with(subject_id=33, object_id=44, type_id=63)
+        mock_insert_relationship.assert_called_with(mock_relationship.return_value, [], "testid", "testparent",
+                                                    "derives_from")
+        self.assertEqual(mock_insert_relationship.call_count, 1)
 
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._delete_featureprop")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_featureprop")
     @unittest.mock.patch("pychado.orm.sequence.FeatureProp")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_featureprop_by_type")
-    def test_handle_properties(self, mock_query: unittest.mock.Mock, mock_prop: unittest.mock.Mock,
-                               mock_insert_prop: unittest.mock.Mock, mock_delete_prop: unittest.mock.Mock):
+    def test_handle_properties(self, mock_prop: unittest.mock.Mock, mock_insert_prop: unittest.mock.Mock,
+                               mock_delete_prop: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'featureprop' table
-        self.assertIs(mock_query, self.client.query_featureprop_by_type)
         self.assertIs(mock_prop, sequence.FeatureProp)
         self.assertIs(mock_insert_prop, self.client._handle_featureprop)
         self.assertIs(mock_delete_prop, self.client._delete_featureprop)
 
         feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testname", feature_id=12)
+        existing_properties = [utils.EmptyObject(type_id=53, value="oldnote", rank=0)]
+        self.client._prefetched_featureprops = {12: existing_properties}
+        mock_delete_prop.return_value = []
         all_properties = self.client._handle_properties(self.default_gff_record, feature_entry)
-        mock_query.assert_called_with(12, [51, 52, 53])
+        mock_insert_prop.assert_any_call(mock_prop.return_value, existing_properties, "comment", "testnote",
+                                         "testname")
+        self.assertEqual(len(self.client._prefetched_featureprops[12]), 2)
         mock_prop.assert_any_call(feature_id=12, type_id=51, value="3.5")
         mock_prop.assert_any_call(feature_id=12, type_id=52, value="testsource")
         mock_prop.assert_any_call(feature_id=12, type_id=53, value="testnote")
@@ -400,14 +874,12 @@ class TestGFFImport(unittest.TestCase):
     @unittest.mock.patch("pychado.orm.general.DbxRef")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_db")
     @unittest.mock.patch("pychado.orm.general.Db")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_all")
-    def test_handle_crossrefs(self, mock_query: unittest.mock.Mock, mock_db: unittest.mock.Mock,
+    def test_handle_crossrefs(self, mock_db: unittest.mock.Mock,
                               mock_insert_db: unittest.mock.Mock, mock_dbxref: unittest.mock.Mock,
                               mock_insert_dbxref: unittest.mock.Mock, mock_feature_dbxref: unittest.mock.Mock,
                               mock_insert_feature_dbxref: unittest.mock.Mock,
                               mock_delete_feature_dbxref: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'feature_dbxref' table
-        self.assertIs(mock_query, self.client.query_all)
         self.assertIs(mock_db, general.Db)
         self.assertIs(mock_insert_db, self.client._handle_db)
         self.assertIs(mock_dbxref, general.DbxRef)
@@ -420,8 +892,12 @@ class TestGFFImport(unittest.TestCase):
         mock_insert_db.return_value = utils.EmptyObject(db_id=44, name="")
         mock_insert_dbxref.return_value = utils.EmptyObject(dbxref_id=55, accession="", version="")
 
+        self.client._prefetched_feature_dbxrefs = {}
+        mock_delete_feature_dbxref.return_value = []
         all_crossrefs = self.client._handle_cross_references(self.default_gff_record, feature_entry)
-        mock_query.assert_called_with(sequence.FeatureDbxRef, feature_id=12)
+        mock_insert_feature_dbxref.assert_called_with(mock_feature_dbxref.return_value, [],
+                                                      "testdb:testaccession", "testname")
+        self.assertEqual(self.client._prefetched_feature_dbxrefs[12], [mock_insert_feature_dbxref.return_value])
         mock_db.assert_any_call(name="testdb")
         mock_dbxref.assert_any_call(db_id=44, accession="testaccession", version="")
         mock_feature_dbxref.assert_any_call(feature_id=12, dbxref_id=55)
@@ -434,30 +910,28 @@ class TestGFFImport(unittest.TestCase):
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._delete_feature_cvterm")
     @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_feature_cvterm")
     @unittest.mock.patch("pychado.orm.sequence.FeatureCvTerm")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_first")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_feature_cvterm_by_ontology")
-    def test_handle_ontology_terms(self, mock_query: unittest.mock.Mock, mock_query_first: unittest.mock.Mock,
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._resolve_ontology_term")
+    def test_handle_ontology_terms(self, mock_resolve: unittest.mock.Mock,
                                    mock_feature_cvterm: unittest.mock.Mock,
                                    mock_insert_feature_cvterm: unittest.mock.Mock,
                                    mock_delete_feature_cvterm: unittest.mock.Mock):
         # Tests the function transferring data from a GFF record to the 'feature_cvterm' table
-        self.assertIs(mock_query, self.client.query_feature_cvterm_by_ontology)
-        self.assertIs(mock_query_first, self.client.query_first)
+        self.assertIs(mock_resolve, self.client._resolve_ontology_term)
         self.assertIs(mock_feature_cvterm, sequence.FeatureCvTerm)
         self.assertIs(mock_insert_feature_cvterm, self.client._handle_feature_cvterm)
         self.assertIs(mock_delete_feature_cvterm, self.client._delete_feature_cvterm)
 
         feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testname", feature_id=12)
-        mock_query_first.side_effect = [utils.EmptyObject(db_id=33),
-                                        utils.EmptyObject(dbxref_id=44),
-                                        utils.EmptyObject(cvterm_id=55, name="")]
+        mock_resolve.return_value = (utils.EmptyObject(db_id=33), 55, "")
 
+        existing_feature_cvterm = utils.EmptyObject(cvterm_id=56)
+        self.client._prefetched_feature_cvterms = {12: [existing_feature_cvterm]}
+        mock_delete_feature_cvterm.return_value = [existing_feature_cvterm]
         all_ontology_terms = self.client._handle_ontology_terms(self.default_gff_record, feature_entry)
-        mock_query.assert_called_with(12, 131)
-        mock_query_first.assert_any_call(general.Db, name="GO")
-        mock_query_first.assert_any_call(general.DbxRef, db_id=33, accession="7890")
-        mock_query_first.assert_any_call(cv.CvTerm, dbxref_id=44)
-        self.assertEqual(mock_query_first.call_count, 3)
+        mock_insert_feature_cvterm.assert_called_with(mock_feature_cvterm.return_value, [existing_feature_cvterm],
+                                                      "", "testname")
+        self.assertEqual(self.client._prefetched_feature_cvterms[12], [mock_insert_feature_cvterm.return_value])
+        mock_resolve.assert_called_once_with("GO", "7890", "GO:7890")
         mock_feature_cvterm.assert_any_call(feature_id=12, cvterm_id=55, pub_id=33)
         self.assertEqual(mock_insert_feature_cvterm.call_count, 1)
         mock_delete_feature_cvterm.assert_called()
@@ -486,7 +960,7 @@ class TestGFFImport(unittest.TestCase):
         mock_record.assert_not_called()
         mock_insert.assert_not_called()
 
-        # Attribute "protein_source_id" present; GFF record is mRNA
+        # Attribute "protein_source_id" present; GFF record is mRNA not read before
         self.default_gff_record.featuretype = "mRNA"
         self.default_gff_record.attributes["protein_source_id"] = "testid"
         mock_query_first.return_value = sequence.FeatureLoc(feature_id=1, srcfeature_id=2, fmin=300, fmax=400, strand=1)
@@ -497,7 +971,7 @@ class TestGFFImport(unittest.TestCase):
                                        featuretype="polypeptide", id="testid", attributes={"Derives_from": "testname"})
         mock_insert.assert_called()
 
-        # Attribute "protein_source_id" present; GFF record is not mRNA
+        # Attribute "protein_source_id" present; GFF record is not mRNA, and its parent was not read before
         self.default_gff_record.featuretype = "CDS"
         mock_query_object = mock_query.return_value
         mock_query_object.configure_mock(**{"first.return_value": sequence.Feature(
@@ -509,19 +983,380 @@ class TestGFFImport(unittest.TestCase):
                                        featuretype="polypeptide", id="testid", attributes={"Derives_from": "othername"})
         mock_insert.assert_called()
 
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient._mark_feature_as_obsolete")
-    @unittest.mock.patch("pychado.io.gff.GFFImportClient._load_feature_names")
-    def test_mark_obsolete_features(self, mock_load: unittest.mock.Mock, mock_mark: unittest.mock.Mock):
+        # Attribute "protein_source_id" present; parent of the GFF record read before
+        mock_query.reset_mock()
+        mock_query_first.reset_mock()
+        mock_insert.reset_mock()
+        self.client._transcript_locations = {"testparent": (500, 600, -1)}
+        self.client._handle_protein(self.default_gff_record, feature_entry, organism_entry, all_features)
+        mock_query.assert_not_called()
+        mock_query_first.assert_not_called()
+        mock_record.assert_called_with(seqid="testseqid", source="testsource", start=501, end=600, strand="-",
+                                       featuretype="polypeptide", id="testid", attributes={"Derives_from": "testparent"})
+        mock_insert.assert_called()
+
+        # Attribute "protein_source_id" present; parent of the GFF record not present
+        mock_insert.reset_mock()
+        self.client._transcript_locations = {}
+        mock_query_object.configure_mock(**{"first.return_value": None})
+        self.client._handle_protein(self.default_gff_record, feature_entry, organism_entry, all_features)
+        mock_insert.assert_not_called()
+
+    def test_register_transcript_location(self):
+        # Tests the function keeping the locations of transcripts in memory
+        self.client._register_transcript_location(self.default_gff_record)
+        self.assertEqual(self.client._transcript_locations, {})
+
+        self.default_gff_record.featuretype = "mRNA"
+        self.client._register_transcript_location(self.default_gff_record)
+        self.assertEqual(self.client._transcript_locations, {"testid": (0, 30, 1)})
+        self.client._transcript_locations = {}
+
+    def test_find_transcript_location(self):
+        # Tests the function returning the location of the transcript associated with a GFF record
+        self.client._transcript_locations = {"testparent": (300, 400, -1)}
+        self.assertEqual(self.client._find_transcript_location(self.default_gff_record),
+                         ("testparent", 300, 400, -1))
+
+        self.default_gff_record.featuretype = "mRNA"
+        self.assertIsNone(self.client._find_transcript_location(self.default_gff_record))
+
+        self.client._transcript_locations["testid"] = (0, 30, 1)
+        self.assertEqual(self.client._find_transcript_location(self.default_gff_record), ("testid", 0, 30, 1))
+        self.client._transcript_locations = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._stage_row")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._resolve_ontology_term")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_pub")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_dbxref")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_db")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_synonym")
+    def test_stage_gff_record(self, mock_synonym: unittest.mock.Mock, mock_db: unittest.mock.Mock,
+                              mock_dbxref: unittest.mock.Mock, mock_pub: unittest.mock.Mock,
+                              mock_resolve: unittest.mock.Mock, mock_stage: unittest.mock.Mock):
+        # Tests the function writing the entries of a GFF record into the buffers for the staging tables
+        self.assertIs(mock_synonym, self.client._handle_synonym)
+        self.assertIs(mock_db, self.client._handle_db)
+        self.assertIs(mock_dbxref, self.client._handle_dbxref)
+        self.assertIs(mock_pub, self.client._handle_pub)
+        self.assertIs(mock_resolve, self.client._resolve_ontology_term)
+        self.assertIs(mock_stage, self.client._stage_row)
+
+        organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
+        mock_synonym.return_value = utils.EmptyObject(synonym_id=34)
+        mock_db.return_value = utils.EmptyObject(db_id=44)
+        mock_dbxref.return_value = utils.EmptyObject(dbxref_id=55)
+        mock_pub.return_value = utils.EmptyObject(pub_id=66)
+        mock_resolve.return_value = (utils.EmptyObject(db_id=131), 77, "testterm")
+        self.client._feature_index = {}
+        staged_feature_names = set()
+
+        # Feature type not present in database
+        self.client._stage_gff_record(self.default_gff_record, organism_entry, itertools.count(5),
+                                      staged_feature_names)
+        mock_stage.assert_not_called()
+        self.assertEqual(staged_feature_names, set())
+
+        # Feature type present in database; feature not present yet
+        self.default_gff_record.featuretype = "mRNA"
+        self.client._stage_gff_record(self.default_gff_record, organism_entry, itertools.count(5),
+                                      staged_feature_names)
+        mock_stage.assert_has_calls([
+            unittest.mock.call("staging_feature", 5, "testid", None, "testname", 42, "MCRA", 4,
+                               self.client._gff_record_checksum(self.default_gff_record)),
+            unittest.mock.call("staging_featureloc", 5, "testid", "testseqid", 0, 30, 1, 2),
+            unittest.mock.call("staging_feature_synonym", 5, "testid", 34, None),
+            unittest.mock.call("staging_feature_synonym", 5, "testid", 34, None),
+            unittest.mock.call("staging_featureprop", 5, "testid", 51, "3.5"),
+            unittest.mock.call("staging_featureprop", 5, "testid", 52, "testsource"),
+            unittest.mock.call("staging_featureprop", 5, "testid", 53, "testnote"),
+            unittest.mock.call("staging_feature_dbxref", 5, "testid", 55, "testdb:testaccession"),
+            unittest.mock.call("staging_feature_cvterm", 5, "testid", 77),
+            unittest.mock.call("staging_feature_pub", 5, "testid", 66),
+            unittest.mock.call("staging_feature_relationship", 5, "testid", "testparent", 62)], any_order=True)
+        self.assertEqual(mock_stage.call_count, 11)
+        mock_resolve.assert_called_with("GO", "7890", "GO:7890")
+        mock_db.assert_called_once()
+        mock_pub.assert_called_once()
+        self.assertEqual(staged_feature_names, {"testid"})
+        self.assertEqual(self.client._transcript_locations, {"testid": (0, 30, 1)})
+
+        # Feature present in database
+        mock_stage.reset_mock()
+        self.client._feature_index = {"testid": (12, 42, False)}
+        self.client._stage_gff_record(self.default_gff_record, organism_entry, itertools.count(6),
+                                      staged_feature_names)
+        mock_stage.assert_any_call("staging_feature", 6, "testid", 12, "testname", 42, "MCRA", 4,
+                                   self.client._gff_record_checksum(self.default_gff_record))
+        self.client._feature_index = {}
+        self.client._transcript_locations = {}
+
+    def test_stage_row(self):
+        # Tests the function writing a row into the buffer for a staging table
+        self.client._stage_row("staging_feature_pub", 1, "testname", 66)
+        self.client._stage_row("staging_feature_pub", 2, "othername", None)
+        self.assertEqual(self.client._staging_buffers["staging_feature_pub"].getvalue(),
+                         "1\ttestname\t66\n2\tothername\t\\N\n")
+        self.client._staging_buffers = {}
+
+    def test_create_staged_protein_record(self):
+        # Tests the function creating a GFF record for a polypeptide, located like a staged transcript
+        self.client._transcript_locations = {"testparent": (300, 400, -1)}
+
+        # No attribute "protein_source_id"
+        self.assertIsNone(self.client._create_staged_protein_record(self.default_gff_record))
+
+        # Attribute "protein_source_id" present; GFF record is not a transcript
+        self.default_gff_record.attributes["protein_source_id"] = "testprotein"
+        protein_record = self.client._create_staged_protein_record(self.default_gff_record)
+        self.assertEqual(protein_record.id, "testprotein")
+        self.assertEqual(protein_record.featuretype, "polypeptide")
+        self.assertEqual(protein_record.seqid, "testseqid")
+        self.assertEqual(protein_record.start, 301)
+        self.assertEqual(protein_record.end, 400)
+        self.assertEqual(protein_record.strand, "-")
+        self.assertEqual(protein_record.attributes["Derives_from"], "testparent")
+
+        # Attribute "protein_source_id" present; GFF record is a transcript that has not been staged
+        self.default_gff_record.featuretype = "mRNA"
+        self.assertIsNone(self.client._create_staged_protein_record(self.default_gff_record))
+        self.client._transcript_locations = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._mark_features_as_obsolete")
+    def test_mark_obsolete_features(self, mock_mark: unittest.mock.Mock):
         # Tests the function that marks features as obsolete if they are not present in a given dictionary
-        self.assertIs(mock_load, self.client._load_feature_names)
-        self.assertIs(mock_mark, self.client._mark_feature_as_obsolete)
+        self.assertIs(mock_mark, self.client._mark_features_as_obsolete)
         organism_entry = organism.Organism(genus="", species="", abbreviation="testorganism", organism_id=1)
-        mock_load.return_value = ["id1", "id2", "id3", "seq"]
         self.client._mark_obsolete_features(
             organism_entry, {"id3": sequence.Feature(organism_id=1, type_id=1, uniquename="")}, ["seq"])
-        mock_load.assert_called_with(organism_entry)
-        mock_mark.assert_any_call(organism_entry, "id2")
-        self.assertEqual(mock_mark.call_count, 2)
+        mock_mark.assert_called_with(organism_entry, {"id3", "seq"})
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._copy_buffered_entries")
+    def test_release_processed_features(self, mock_copy: unittest.mock.Mock):
+        # Tests the function that removes the entries of processed features from the session and discards the
+        # prefetched entries
+        self.assertIs(mock_copy, self.client._copy_buffered_entries)
+        feature_entry = sequence.Feature(organism_id=1, type_id=1, uniquename="testname", feature_id=12)
+        featureprop_entry = sequence.FeatureProp(feature_id=12, type_id=51, value="testvalue")
+        relationship_entry = sequence.FeatureRelationship(subject_id=12, object_id=13, type_id=62)
+        other_entry = sequence.FeatureProp(feature_id=13, type_id=51, value="othervalue")
+        self.client._processed_feature_ids = [12]
+        self.client._prefetched_feature_ids = {12, 13}
+        self.client._prefetched_featureprops = {12: [featureprop_entry], 13: [other_entry]}
+        self.client._prefetched_windows = {("testseqid", 0)}
+        with unittest.mock.patch.object(self.client, "session", create=True) as mock_session:
+            mock_session.identity_map.values.return_value = [feature_entry, featureprop_entry, relationship_entry,
+                                                             other_entry]
+            self.client._release_processed_features()
+            mock_copy.assert_called_with(attach=False)
+            self.assertEqual(mock_session.expunge.call_count, 3)
+            mock_session.expunge.assert_any_call(relationship_entry)
+        self.assertEqual(self.client._prefetched_featureprops, {})
+        self.assertEqual(self.client._processed_feature_ids, [])
+        self.assertEqual(self.client._prefetched_feature_ids, set())
+        self.assertEqual(self.client._prefetched_windows, set())
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_all")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_featureprop_by_type")
+    def test_load_feature_attributes(self, mock_query_props: unittest.mock.Mock, mock_query_all: unittest.mock.Mock):
+        # Tests the function that loads the entries associated with a feature that have not been prefetched
+        self.assertIs(mock_query_props, self.client.query_featureprop_by_type)
+        self.assertIs(mock_query_all, self.client.query_all)
+        self.client._prefetched_feature_ids = {12}
+        self.client._load_feature_attributes(12)
+        mock_query_props.assert_not_called()
+
+        self.client._prefetched_feature_ids = set()
+        featureprop_entry = sequence.FeatureProp(feature_id=12, type_id=51, value="testvalue")
+        mock_query_props.return_value.all.return_value = [featureprop_entry]
+        with unittest.mock.patch.object(self.client, "session", create=True):
+            self.client._load_feature_attributes(12)
+        mock_query_props.assert_called_with(12, [51, 52, 53])
+        mock_query_all.assert_any_call(sequence.FeaturePub, feature_id=12)
+        self.assertEqual(self.client._prefetched_featureprops[12], [featureprop_entry])
+        self.assertEqual(self.client._prefetched_feature_ids, {12})
+        self.client._prefetched_feature_ids = set()
+        for prefetched_entries in [self.client._prefetched_featureprops, self.client._prefetched_feature_synonyms,
+                                   self.client._prefetched_feature_dbxrefs, self.client._prefetched_feature_cvterms,
+                                   self.client._prefetched_feature_pubs,
+                                   self.client._prefetched_feature_relationships]:
+            prefetched_entries.clear()
+
+    def test_skip_gff_record(self):
+        # Tests the function registering the features of a GFF record imported in a previous run
+        self.client._feature_index = {"testid": (12, 300, False), "testid:pep": (13, 400, False)}
+        all_feature_ids = {}
+        self.client._skip_gff_record(self.default_gff_record, all_feature_ids)
+        self.assertEqual(all_feature_ids, {"testid": 12})
+
+        self.default_gff_record.attributes["protein_source_id"] = ["testid:pep"]
+        self.client._skip_gff_record(self.default_gff_record, all_feature_ids)
+        self.assertEqual(all_feature_ids, {"testid": 12, "testid:pep": 13})
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_cvterm")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_dbxref")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_cv")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._handle_db")
+    def test_create_checksum_term(self, mock_db: unittest.mock.Mock, mock_cv: unittest.mock.Mock,
+                                  mock_dbxref: unittest.mock.Mock, mock_cvterm: unittest.mock.Mock):
+        # Tests the function inserting the CV term for the checksums of GFF records
+        self.assertIs(mock_db, self.client._handle_db)
+        self.assertIs(mock_cv, self.client._handle_cv)
+        self.assertIs(mock_dbxref, self.client._handle_dbxref)
+        self.assertIs(mock_cvterm, self.client._handle_cvterm)
+        mock_db.return_value = general.Db(name="genedb_misc", db_id=5)
+        mock_cv.return_value = cv.Cv(name="genedb_misc", cv_id=6)
+        mock_dbxref.return_value = general.DbxRef(db_id=5, accession="gff_checksum", dbxref_id=7)
+        checksum_term = cv.CvTerm(cv_id=6, dbxref_id=7, name="gff_checksum", cvterm_id=90)
+        mock_cvterm.return_value = checksum_term
+
+        self.assertIs(self.client._create_checksum_term(), checksum_term)
+        self.assertEqual(mock_db.call_args[0][0].name, "genedb_misc")
+        self.assertEqual(mock_cv.call_args[0][0].name, "genedb_misc")
+        self.assertEqual(mock_dbxref.call_args[0][0].db_id, 5)
+        self.assertEqual(mock_dbxref.call_args[0][0].accession, "gff_checksum")
+        self.assertEqual(mock_cvterm.call_args[0][0].cv_id, 6)
+        self.assertEqual(mock_cvterm.call_args[0][0].dbxref_id, 7)
+        self.assertEqual(mock_cvterm.call_args[0][0].name, "gff_checksum")
+
+    def test_gff_record_checksum(self):
+        # Tests the function computing a checksum of a GFF record
+        checksum = self.client._gff_record_checksum(self.default_gff_record)
+        self.assertEqual(len(checksum), 32)
+        self.assertEqual(self.client._gff_record_checksum(self.default_gff_record), checksum)
+
+        attributes = dict(reversed(list(self.default_gff_record.attributes.items())))
+        reordered_record = gffutils.Feature(
+            seqid="testseqid", source="testsource", featuretype="testtype", start=1, end=30, score="3.5", strand="+",
+            frame="2", id="testid", attributes=attributes)
+        self.assertEqual(self.client._gff_record_checksum(reordered_record), checksum)
+
+        self.client.full_attributes = False
+        self.assertNotEqual(self.client._gff_record_checksum(self.default_gff_record), checksum)
+        self.client.full_attributes = True
+
+        self.default_gff_record.end = 31
+        self.assertNotEqual(self.client._gff_record_checksum(self.default_gff_record), checksum)
+
+    def test_is_unchanged_gff_record(self):
+        # Tests the function checking if a GFF record is identical to the one imported previously
+        checksum = self.client._gff_record_checksum(self.default_gff_record)
+        self.client._feature_index = {}
+        self.client._record_checksums = {12: checksum}
+        self.assertFalse(self.client._is_unchanged_gff_record(self.default_gff_record))
+
+        self.client._feature_index = {"testid": (12, 42, True)}
+        self.assertFalse(self.client._is_unchanged_gff_record(self.default_gff_record))
+
+        self.client._feature_index = {"testid": (12, 42, False)}
+        self.assertTrue(self.client._is_unchanged_gff_record(self.default_gff_record))
+
+        # A record imported without the option 'full_attributes' is imported again with this option, as stale
+        # entries associated with the feature may be left in the database
+        self.client.full_attributes = False
+        self.client._record_checksums = {12: self.client._gff_record_checksum(self.default_gff_record)}
+        self.assertTrue(self.client._is_unchanged_gff_record(self.default_gff_record))
+        self.client.full_attributes = True
+        self.assertFalse(self.client._is_unchanged_gff_record(self.default_gff_record))
+
+        self.client._record_checksums = {12: "otherchecksum"}
+        self.assertFalse(self.client._is_unchanged_gff_record(self.default_gff_record))
+        self.client._feature_index = {}
+        self.client._record_checksums = {}
+
+    def test_has_unresolved_references(self):
+        # Tests the function checking if a GFF record refers to parent features not present in the database
+        self.client._feature_index = {"testseqid": (11, 42, False)}
+        self.assertTrue(self.client._has_unresolved_references(self.default_gff_record))
+
+        self.client._feature_index = {"testparent": (12, 42, False)}
+        self.assertFalse(self.client._has_unresolved_references(self.default_gff_record))
+        self.client._feature_index = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_table")
+    def test_delete_record_checksums(self, mock_query: unittest.mock.Mock):
+        # Tests the function deleting the checksums of the GFF records of given features
+        self.assertIs(mock_query, self.client.query_table)
+        self.client._checksum_term = cv.CvTerm(cv_id=1, dbxref_id=2, name="gff_checksum", cvterm_id=90)
+        self.client._record_checksums = {12: "testchecksum", 13: "otherchecksum"}
+        self.client._delete_record_checksums([14])
+        mock_query.assert_not_called()
+
+        self.client._delete_record_checksums([12, 14])
+        mock_query.assert_called_with(sequence.FeatureProp, type_id=90)
+        mock_query.return_value.filter.return_value.delete.assert_called_with(synchronize_session=False)
+        self.assertEqual(self.client._record_checksums, {13: "otherchecksum"})
+        self.client._record_checksums = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.query_table")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient.add_and_flush")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._has_unresolved_references")
+    def test_handle_record_checksum(self, mock_unresolved: unittest.mock.Mock, mock_add: unittest.mock.Mock,
+                                    mock_query: unittest.mock.Mock):
+        # Tests the function storing the checksum of a GFF record in the 'featureprop' table
+        self.assertIs(mock_unresolved, self.client._has_unresolved_references)
+        self.assertIs(mock_add, self.client.add_and_flush)
+        self.assertIs(mock_query, self.client.query_table)
+        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=12)
+        checksum = self.client._gff_record_checksum(self.default_gff_record)
+        self.client._checksum_term = cv.CvTerm(cv_id=1, dbxref_id=2, name="gff_checksum", cvterm_id=90)
+        self.client._record_checksums = {}
+
+        # New checksum
+        mock_unresolved.return_value = False
+        self.client._handle_record_checksum(self.default_gff_record, feature_entry)
+        mock_add.assert_called_once()
+        added_entry = mock_add.call_args[0][0]
+        self.assertEqual((added_entry.feature_id, added_entry.type_id, added_entry.value), (12, 90, checksum))
+        self.assertEqual(self.client._record_checksums, {12: checksum})
+
+        # Unchanged checksum
+        mock_add.reset_mock()
+        self.client._handle_record_checksum(self.default_gff_record, feature_entry)
+        mock_add.assert_not_called()
+        mock_query.assert_not_called()
+
+        # Changed checksum
+        self.client._record_checksums = {12: "otherchecksum"}
+        self.client._handle_record_checksum(self.default_gff_record, feature_entry)
+        mock_query.assert_called_with(sequence.FeatureProp, feature_id=12, type_id=90)
+        mock_query.return_value.update.assert_called_with({"value": checksum}, synchronize_session=False)
+        self.assertEqual(self.client._record_checksums, {12: checksum})
+
+        # Unresolved references
+        mock_unresolved.return_value = True
+        self.client._handle_record_checksum(self.default_gff_record, feature_entry)
+        mock_query.return_value.delete.assert_called_with(synchronize_session=False)
+        self.assertEqual(self.client._record_checksums, {})
+        mock_add.assert_not_called()
+
+        # No CV term for checksums
+        self.client._checksum_term = None
+        mock_unresolved.return_value = False
+        self.client._handle_record_checksum(self.default_gff_record, feature_entry)
+        mock_add.assert_not_called()
+
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._commit_checkpoint")
+    @unittest.mock.patch("pychado.io.gff.GFFImportClient._copy_buffered_entries")
+    def test_commit_gff_checkpoint(self, mock_copy: unittest.mock.Mock, mock_commit: unittest.mock.Mock):
+        # Tests the function committing the changes made so far during a GFF import
+        self.assertIs(mock_copy, self.client._copy_buffered_entries)
+        self.assertIs(mock_commit, self.client._commit_checkpoint)
+
+        # Locations waiting for their sequence postpone the commit, which is reported once
+        self.client._deferred_locations = {"testseqid": []}
+        with unittest.mock.patch.object(self.client.printer, "print") as mock_print:
+            self.assertFalse(self.client._commit_gff_checkpoint("testfile.checkpoint", 100))
+            self.assertFalse(self.client._commit_gff_checkpoint("testfile.checkpoint", 200))
+            self.assertEqual(mock_print.call_count, 1)
+            self.assertIn("WARNING", mock_print.call_args[0][0])
+        mock_copy.assert_not_called()
+        mock_commit.assert_not_called()
+
+        self.client._deferred_locations = {}
+        self.assertTrue(self.client._commit_gff_checkpoint("testfile.checkpoint", 100))
+        mock_copy.assert_called_with(attach=False)
+        mock_commit.assert_called_with("testfile.checkpoint", 100)
 
     def test_check_if_gff_attributes_are_recognized(self):
         # Tests the function that checks if all attributes of a GFF record are recognized
@@ -649,12 +1484,10 @@ class TestGFFImport(unittest.TestCase):
         # Tests the function that extracts sequence names from a GFF file
         gff_file = os.path.join(data_dir, 'gff_without_fasta.gff3')
         self.assertTrue(os.path.exists(gff_file))
-        gff_db = self.client._create_sqlite_db(gff_file)
-        sequence_names = self.client._extract_gff_sequence_names(gff_db)
+        gff_reader = gff.GFFReader(gff_file)
+        list(gff_reader.records())
+        sequence_names = self.client._extract_gff_sequence_names(gff_reader.directives)
         self.assertIn("CM000574", sequence_names)
-        gff_db_name = self.client._sqlite_databases[0]
-        os.remove(gff_db_name)
-        self.assertFalse(os.path.exists(gff_db_name))
 
 
 class TestGFFExport(unittest.TestCase):
@@ -673,23 +1506,20 @@ class TestGFFExport(unittest.TestCase):
         cls.client._go_db = general.Db(db_id=131, name="GO")
 
     @unittest.mock.patch("pychado.io.gff.GFFExportClient._export_gff_record")
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_child_features")
-    def test_handle_child_features(self, mock_query: unittest.mock.Mock, mock_export: unittest.mock.Mock):
+    def test_handle_child_features(self, mock_export: unittest.mock.Mock):
         # Tests the function that exports GFF records for the child features of a given feature
-        self.assertIs(mock_query, self.client.query_child_features)
         self.assertIs(mock_export, self.client._export_gff_record)
 
         feature_entry = sequence.Feature(feature_id=77, organism_id=11, type_id=200, uniquename="parentid")
         childfeature_entry = sequence.Feature(feature_id=78, organism_id=11, type_id=300, uniquename="childid")
         derivedfeature_entry = sequence.Feature(feature_id=79, organism_id=11, type_id=400, uniquename="derivedid")
-        mock_query_obj = mock_query.return_value
-        mock_query_obj.configure_mock(**{"all.side_effect": [[childfeature_entry],
-                                                             [childfeature_entry, derivedfeature_entry]]})
+        obsoletefeature_entry = sequence.Feature(feature_id=80, organism_id=11, type_id=400, uniquename="obsoleteid",
+                                                 is_obsolete=True)
+        self.client._prefetched_features = {78: childfeature_entry, 79: derivedfeature_entry,
+                                            80: obsoletefeature_entry}
+        self.client._prefetched_children = {77: {62: [78], 63: [78, 79, 80]}}
 
         self.client._handle_child_features(feature_entry, "testsequence", None)
-        self.assertIn(unittest.mock.call(77, 62), mock_query.mock_calls)
-        self.assertIn(unittest.mock.call(77, 63), mock_query.mock_calls)
-        self.assertEqual(mock_query.call_count, 2)
         self.assertIn(unittest.mock.call(childfeature_entry, "testsequence", {"part_of": "parentid"}, None),
                       mock_export.mock_calls)
         self.assertIn(unittest.mock.call(childfeature_entry, "testsequence", {"derives_from": "parentid"}, None),
@@ -697,37 +1527,293 @@ class TestGFFExport(unittest.TestCase):
         self.assertIn(unittest.mock.call(derivedfeature_entry, "testsequence", {"derives_from": "parentid"}, None),
                       mock_export.mock_calls)
         self.assertEqual(mock_export.call_count, 3)
+        self.client._prefetched_features = {}
+        self.client._prefetched_children = {}
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._export_feature_batch")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.stream_results")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_features_by_srcfeature")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_child_feature_ids")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_ids_by_regions")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._export_gff_record")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._prefetch_feature_attributes")
+    def test_export_sequence(self, mock_prefetch: unittest.mock.Mock, mock_export: unittest.mock.Mock,
+                             mock_located: unittest.mock.Mock, mock_children: unittest.mock.Mock,
+                             mock_query: unittest.mock.Mock, mock_stream: unittest.mock.Mock,
+                             mock_batch: unittest.mock.Mock):
+        # Tests the function that exports GFF records for a top-level sequence and the features located on it
+        self.assertIs(mock_prefetch, self.client._prefetch_feature_attributes)
+        self.assertIs(mock_export, self.client._export_gff_record)
+        self.assertIs(mock_located, self.client.query_feature_ids_by_regions)
+        self.assertIs(mock_children, self.client.query_child_feature_ids)
+        self.assertIs(mock_query, self.client.query_features_by_srcfeature)
+        self.assertIs(mock_stream, self.client.stream_results)
+        self.assertIs(mock_batch, self.client._export_feature_batch)
+        mock_children.return_value = [(3,), (4,)]
+
+        chromosome_entry = sequence.Feature(feature_id=1, organism_id=11, type_id=100, uniquename="testsequence")
+        feature_entries = [sequence.Feature(feature_id=i, organism_id=11, type_id=200, uniquename="id" + str(i))
+                           for i in range(2, 5)]
+        mock_stream.return_value = iter(feature_entries)
+        self.client.fetch_size = 2
+
+        self.client._export_sequence(chromosome_entry, [(100, 200)], False, None)
+        mock_prefetch.assert_called_with([1])
+        mock_export.assert_called_with(chromosome_entry, "testsequence", {}, None)
+        mock_located.assert_called_with({1: [(100, 200)]})
+        mock_children.assert_called_with(mock_located.return_value, [62, 63])
+        self.assertEqual(self.client._features_with_parents, {3, 4})
+        mock_query.assert_called_with(1, [(100, 200)])
+        mock_stream.assert_called_with(mock_query.return_value, 2)
+        self.assertEqual(mock_batch.mock_calls, [
+            unittest.mock.call(feature_entries[:2], "testsequence", False, None),
+            unittest.mock.call(feature_entries[2:], "testsequence", False, None)])
+
+        self.client._export_sequence(chromosome_entry, None, False, None)
+        mock_located.assert_called_with({1: []})
+        self.client.fetch_size = 1000
+        self.client._features_with_parents = set()
+
+    def test_filter_sequences_by_regions(self):
+        # Tests the function that selects the top-level sequences containing requested regions
+        chromosome_entries = [sequence.Feature(feature_id=i, organism_id=11, type_id=100, uniquename="chr" + str(i))
+                              for i in range(1, 4)]
+        entries = self.client._filter_sequences_by_regions(chromosome_entries,
+                                                           {"chr3": [], "chr1": [(0, 10)], "chr5": []})
+        self.assertEqual(entries, [chromosome_entries[0], chromosome_entries[2]])
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._export_gff_record")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._prefetch_feature_attributes")
+    def test_export_feature_batch(self, mock_prefetch: unittest.mock.Mock, mock_export: unittest.mock.Mock):
+        # Tests the function that exports GFF records for a batch of features located on a sequence
+        self.assertIs(mock_prefetch, self.client._prefetch_feature_attributes)
+        self.assertIs(mock_export, self.client._export_gff_record)
 
-    @unittest.mock.patch("pychado.io.fasta.FastaExportClient")
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient._append_fasta")
-    def test_export_fasta(self, mock_append: unittest.mock.Mock, mock_fasta: unittest.mock.Mock):
+        root_entry = sequence.Feature(feature_id=77, organism_id=11, type_id=200, uniquename="rootid")
+        child_entry = sequence.Feature(feature_id=78, organism_id=11, type_id=300, uniquename="childid")
+        obsolete_entry = sequence.Feature(feature_id=79, organism_id=11, type_id=200, uniquename="obsoleteid",
+                                          is_obsolete=True)
+        self.client._features_with_parents = {78}
+
+        self.client._export_feature_batch([root_entry, child_entry, obsolete_entry], "testsequence", False, None)
+        mock_prefetch.assert_called_with([77])
+        mock_export.assert_called_once_with(root_entry, "testsequence", {}, None)
+
+        # Nothing is loaded for batches without top-level features
+        mock_prefetch.reset_mock()
+        mock_export.reset_mock()
+        self.client._export_feature_batch([child_entry], "testsequence", False, None)
+        mock_prefetch.assert_not_called()
+        mock_export.assert_not_called()
+
+        mock_export.reset_mock()
+        self.client._export_feature_batch([root_entry, child_entry, obsolete_entry], "testsequence", True, None)
+        mock_prefetch.assert_called_with([77, 79])
+        self.assertEqual(mock_export.mock_calls, [unittest.mock.call(root_entry, "testsequence", {}, None),
+                                                  unittest.mock.call(obsolete_entry, "testsequence", {}, None)])
+        self.client._features_with_parents = set()
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._extract_feature_ontology_terms")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._extract_feature_cross_references")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._extract_feature_publications")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._extract_feature_properties")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._extract_feature_synonyms")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_relationships_by_feature_ids")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_polypeptide_residues_by_feature_ids")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_featurelocs_by_feature_ids")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_features_by_ids")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_tree")
+    def test_prefetch_feature_attributes(
+            self, mock_tree: unittest.mock.Mock, mock_features: unittest.mock.Mock,
+            mock_featurelocs: unittest.mock.Mock, mock_residues: unittest.mock.Mock,
+            mock_relationships: unittest.mock.Mock, mock_synonyms: unittest.mock.Mock,
+            mock_properties: unittest.mock.Mock, mock_publications: unittest.mock.Mock,
+            mock_cross_references: unittest.mock.Mock, mock_ontology_terms: unittest.mock.Mock):
+        # Tests the function loading the entries associated with a batch of features and their descendants
+        self.assertIs(mock_tree, self.client.query_feature_tree)
+        self.assertIs(mock_features, self.client.query_features_by_ids)
+        self.assertIs(mock_featurelocs, self.client.query_featurelocs_by_feature_ids)
+        self.assertIs(mock_residues, self.client.query_polypeptide_residues_by_feature_ids)
+        self.assertIs(mock_relationships, self.client.query_feature_relationships_by_feature_ids)
+        self.assertIs(mock_synonyms, self.client._extract_feature_synonyms)
+        self.assertIs(mock_properties, self.client._extract_feature_properties)
+        self.assertIs(mock_publications, self.client._extract_feature_publications)
+        self.assertIs(mock_cross_references, self.client._extract_feature_cross_references)
+        self.assertIs(mock_ontology_terms, self.client._extract_feature_ontology_terms)
+
+        gene_entry = sequence.Feature(feature_id=77, organism_id=11, type_id=200, uniquename="geneid")
+        protein_entry = sequence.Feature(feature_id=78, organism_id=11, type_id=300, uniquename="proteinid")
+        first_featureloc = sequence.FeatureLoc(feature_id=77, srcfeature_id=1, fmin=10, fmax=100)
+        second_featureloc = sequence.FeatureLoc(feature_id=77, srcfeature_id=2, fmin=20, fmax=200)
+        mock_features.return_value = [(gene_entry, "gene"), (protein_entry, "polypeptide")]
+        mock_featurelocs.return_value = [first_featureloc, second_featureloc]
+        mock_residues.return_value = [(78, "MCRA")]
+        mock_relationships.return_value = [(77, 63, 78), (76, 62, 77)]
+        mock_synonyms.return_value = {77: {"alias": ["genealias"]}}
+
+        self.client._prefetch_feature_attributes([77])
+        mock_tree.assert_called_with([77], [62, 63])
+        mock_features.assert_called_with(mock_tree.return_value)
+        mock_relationships.assert_called_with(mock_tree.return_value, [62, 63])
+        mock_ontology_terms.assert_called_with(mock_tree.return_value)
+        self.assertEqual(self.client._prefetched_features, {77: gene_entry, 78: protein_entry})
+        self.assertEqual(self.client._prefetched_types, {77: "gene", 78: "polypeptide"})
+        self.assertEqual(self.client._prefetched_featurelocs, {77: first_featureloc})
+        self.assertEqual(self.client._prefetched_translations, {78: "MCRA"})
+        self.assertEqual(self.client._prefetched_children, {77: {63: [78]}, 76: {62: [77]}})
+        self.assertEqual(self.client._prefetched_synonyms, {77: {"alias": ["genealias"]}})
+        self.assertIs(self.client._prefetched_properties, mock_properties.return_value)
+
+        # Reset the prefetched entries
+        for attribute in ["_prefetched_features", "_prefetched_types", "_prefetched_featurelocs",
+                          "_prefetched_translations", "_prefetched_children", "_prefetched_synonyms",
+                          "_prefetched_properties", "_prefetched_publications", "_prefetched_cross_references",
+                          "_prefetched_ontology_terms"]:
+            setattr(self.client, attribute, {})
+
+    def test_read_gff_sections(self):
+        # Tests the function reading a previously exported GFF file section by section
+        gff_file = tempfile.mkstemp()[1]
+        with open(gff_file, "w") as gff_handle:
+            gff_handle.write("##gff-version 3\n"
+                             "##sequence-region chr1 1 1000\n"
+                             "chr1\tchado\tchromosome\t1\t1000\t.\t+\t.\tID=chr1\n"
+                             "chr1\tchado\tgene\t11\t100\t.\t+\t.\tID=gene%3B1\n"
+                             "chr1\tchado\tmRNA\t11\t100\t.\t+\t.\tID=mRNA1;Parent=gene%3B1\n"
+                             "chr1\tchado\tpolypeptide\t11\t100\t.\t+\t.\tID=pep1;Derives_from=mRNA1\n"
+                             "chr1\tchado\tgene\t51\t80\t.\t-\t.\tID=gene2;Name=genename\n"
+                             "chr2\tchado\tchromosome\t1\t500\t.\t+\t.\tID=chr2\n"
+                             "##FASTA\n"
+                             ">chr1\n"
+                             "ACGT\n")
+        sections = list(self.client._read_gff_sections(gff_file))
+        self.assertEqual(sections, [
+            ("chr1", "chr1\tchado\tchromosome\t1\t1000\t.\t+\t.\tID=chr1\n", [
+                ((11, "gene;1"), "chr1\tchado\tgene\t11\t100\t.\t+\t.\tID=gene%3B1\n"
+                                 "chr1\tchado\tmRNA\t11\t100\t.\t+\t.\tID=mRNA1;Parent=gene%3B1\n"
+                                 "chr1\tchado\tpolypeptide\t11\t100\t.\t+\t.\tID=pep1;Derives_from=mRNA1\n"),
+                ((51, "gene2"), "chr1\tchado\tgene\t51\t80\t.\t-\t.\tID=gene2;Name=genename\n")]),
+            ("chr2", "chr2\tchado\tchromosome\t1\t500\t.\t+\t.\tID=chr2\n", [])])
+        os.remove(gff_file)
+
+    def test_find_gff_section(self):
+        # Tests the function finding the section of a previously exported GFF file for a given sequence
+        sections = iter([("chr1", "chr1record", []), ("chr2", "chr2record", [((1, "gene"), "generecord")])])
+        skipped_sections = {}
+        self.assertEqual(self.client._find_gff_section("chr2", sections, skipped_sections),
+                         ("chr2record", [((1, "gene"), "generecord")]))
+        self.assertEqual(skipped_sections, {"chr1": ("chr1record", [])})
+        self.assertIsNone(self.client._find_gff_section("chr3", sections, skipped_sections))
+        self.assertEqual(self.client._find_gff_section("chr1", sections, skipped_sections), ("chr1record", []))
+        self.assertEqual(skipped_sections, {})
+
+    def test_is_top_level_gff_line(self):
+        # Tests the function checking if a line of a GFF file is the record of a feature without parents
+        self.assertTrue(self.client._is_top_level_gff_line(["chr1", "chado", "gene", "1", "9", ".", "+", ".",
+                                                            "ID=gene1;Name=Parent=x\n"]))
+        self.assertFalse(self.client._is_top_level_gff_line(["chr1", "chado", "mRNA", "1", "9", ".", "+", ".",
+                                                             "ID=mRNA1;Parent=gene1\n"]))
+        self.assertFalse(self.client._is_top_level_gff_line(["chr1", "chado", "polypeptide", "1", "9", ".", "+", ".",
+                                                             "ID=pep1;Derives_from=mRNA1\n"]))
+
+    def test_gff_block_key(self):
+        # Tests the function extracting the start and the ID from a block of GFF records
+        block = "chr1\tchado\tgene\t11\t100\t.\t+\t.\tName=x;ID=gene%3B1\nchr1\tchado\tmRNA\t5\t9\t.\t+\t.\tID=mRNA1\n"
+        self.assertEqual(self.client._gff_block_key(block), (11, "gene;1"))
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_child_feature_ids")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._export_gff_record")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._prefetch_feature_attributes")
+    def test_export_changed_sequence(self, mock_prefetch: unittest.mock.Mock, mock_export: unittest.mock.Mock,
+                                     mock_children: unittest.mock.Mock):
+        # Tests the function that merges re-created GFF records with those of a previous export
+        self.assertIs(mock_prefetch, self.client._prefetch_feature_attributes)
+        self.assertIs(mock_export, self.client._export_gff_record)
+        self.assertIs(mock_children, self.client.query_child_feature_ids)
+
+        def export_gff_record(feature_entry, chromosome_name, parent_relationships, file_handle):
+            file_handle.write("\t".join([chromosome_name, "chado", "gene", str(feature_entry.feature_id), "200", ".",
+                                         "+", ".", "ID=" + feature_entry.uniquename]) + "\n")
+        mock_export.side_effect = export_gff_record
+
+        chromosome_entry = sequence.Feature(feature_id=1, organism_id=11, type_id=100, uniquename="chr1")
+        changed_entry = sequence.Feature(feature_id=20, organism_id=11, type_id=200, uniquename="gene2")
+        new_entry = sequence.Feature(feature_id=40, organism_id=11, type_id=200, uniquename="gene4")
+        child_entry = sequence.Feature(feature_id=50, organism_id=11, type_id=300, uniquename="mRNA5")
+        previous_section = ("chr1record\n", [((10, "gene1"), "gene1record\n"), ((20, "gene2"), "gene2record\n"),
+                                             ((30, "gene3"), "gene3record\n"), ((40, "deleted"), "deletedrecord\n")])
+        mock_children.return_value = [(50,)]
+        self.client.fetch_size = 1
+
+        file_handle = io.StringIO()
+        self.client._export_changed_sequence(chromosome_entry, previous_section, {20, 40, 50}, {"gene2", "deleted"},
+                                             [changed_entry, new_entry, child_entry], False, file_handle)
+        mock_children.assert_called_with([20, 40, 50], [62, 63])
+        self.assertEqual(mock_prefetch.mock_calls, [unittest.mock.call([20]), unittest.mock.call([40])])
+        self.assertEqual(file_handle.getvalue(),
+                         "chr1record\ngene1record\n"
+                         "chr1\tchado\tgene\t20\t200\t.\t+\t.\tID=gene2\n"
+                         "gene3record\n"
+                         "chr1\tchado\tgene\t40\t200\t.\t+\t.\tID=gene4\n")
+
+        # Re-create the record of the sequence itself, if it changed
+        mock_prefetch.reset_mock()
+        file_handle = io.StringIO()
+        self.client._export_changed_sequence(chromosome_entry, previous_section, {1}, set(), [], False, file_handle)
+        mock_prefetch.assert_called_once_with([1])
+        self.assertTrue(file_handle.getvalue().startswith("chr1\tchado\tgene\t1\t200"))
+        self.assertEqual(self.client._features_with_parents, set())
+        self.client.fetch_size = 1000
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._write_fasta_sequences")
+    def test_export_fasta(self, mock_write: unittest.mock.Mock):
         # Tests the export of FASTA sequences along with a GFF file
-        self.assertIs(mock_append, self.client._append_fasta)
-        self.assertIs(mock_fasta, fasta.FastaExportClient)
+        self.assertIs(mock_write, self.client._write_fasta_sequences)
+        organism_entry = organism.Organism(genus="testgenus", species="testspecies", abbreviation="testorganism")
+        chromosome_entries = [sequence.Feature(feature_id=1, organism_id=11, type_id=100, uniquename="chr1")]
 
         # Output FASTA in separate file
-        self.client._export_fasta("testgff", "testfasta", "testorganism")
-        mock_fasta.assert_called_with("testuri", False)
-        self.assertIn(unittest.mock.call().export("testfasta", "testorganism", "contigs", ""), mock_fasta.mock_calls)
-        mock_append.assert_not_called()
+        fasta_file = tempfile.mkstemp()[1]
+        gff_handle = io.StringIO()
+        self.client._export_fasta(gff_handle, fasta_file, organism_entry, chromosome_entries)
+        mock_write.assert_called_once()
+        self.assertEqual(mock_write.call_args[0][0].name, fasta_file)
+        self.assertEqual(mock_write.call_args[0][1:], (organism_entry, chromosome_entries))
+        self.assertEqual(gff_handle.getvalue(), "")
+        os.remove(fasta_file)
 
         # Append FASTA to GFF file
-        mock_fasta.reset_mock()
-        mock_append.reset_mock()
-        self.client._export_fasta("testgff", "", "testorganism")
-        mock_fasta.assert_called_with("testuri", False)
-        mock_append.assert_called()
-
-    def test_append_fasta(self):
-        # Tests the function joining a GFF file with a FASTA file
-        gff_file = os.path.join(data_dir, 'gff_without_fasta.gff3')
-        fasta_file = os.path.join(data_dir, 'fasta_only.fa')
-        joined_file = tempfile.mkstemp()[1]
-        shutil.copy(gff_file, joined_file)
-        actual_joined_file = os.path.join(data_dir, 'gff_with_fasta.gff3')
-        self.client._append_fasta(joined_file, fasta_file)
-        self.assertTrue(filecmp.cmp(joined_file, actual_joined_file))
-        os.remove(joined_file)
+        mock_write.reset_mock()
+        self.client._export_fasta(gff_handle, "", organism_entry, chromosome_entries)
+        mock_write.assert_called_once_with(gff_handle, organism_entry, chromosome_entries)
+        self.assertEqual(gff_handle.getvalue(), "##FASTA\n")
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_first")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_residues")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient._extract_genome_version")
+    def test_write_fasta_sequences(self, mock_version: unittest.mock.Mock, mock_residues: unittest.mock.Mock,
+                                   mock_query: unittest.mock.Mock):
+        # Tests the function writing the sequences of top-level features in FASTA format
+        self.assertIs(mock_version, self.client._extract_genome_version)
+        self.assertIs(mock_residues, self.client.query_feature_residues)
+        self.assertIs(mock_query, self.client.query_first)
+        organism_entry = organism.Organism(genus="testgenus", species="testspecies", abbreviation="testorganism")
+        chromosome_entries = [
+            sequence.Feature(feature_id=2, organism_id=11, type_id=100, uniquename="chr2"),
+            sequence.Feature(feature_id=3, organism_id=11, type_id=100, uniquename="chr3", is_obsolete=True),
+            sequence.Feature(feature_id=1, organism_id=11, type_id=100, uniquename="chr1"),
+            sequence.Feature(feature_id=4, organism_id=11, type_id=100, uniquename="chr4")]
+        mock_version.return_value = "v1"
+        mock_residues.return_value.scalar.side_effect = ["ACGT", "AC" * 40, "ZZZ"]
+        mock_query.return_value = cv.CvTerm(cv_id=1, dbxref_id=2, name="chromosome")
+
+        file_handle = io.StringIO()
+        self.client._write_fasta_sequences(file_handle, organism_entry, chromosome_entries)
+        self.assertEqual(mock_residues.mock_calls[0], unittest.mock.call(1))
+        mock_query.assert_called_with(cv.CvTerm, cvterm_id=100)
+        header = " | organism=testgenus%20testspecies | sequence_type=chromosome | genome_version=v1\n"
+        self.assertEqual(file_handle.getvalue(), ">chr1" + header + "ACGT\n"
+                                                 ">chr2" + header + "AC" * 30 + "\n" + "AC" * 10 + "\n")
 
     def test_write_gff_header(self):
         # Tests the correct creation of GFF file headers
@@ -740,10 +1826,26 @@ class TestGFFExport(unittest.TestCase):
         self.assertTrue(filecmp.cmp(header_file, actual_header_file))
         os.remove(header_file)
 
+    def test_gff_record(self):
+        # Tests the conversion of a GFF record to a line of a GFF file, which is the same as with gffutils
+        gff_record = gff.GFFRecord(seqid="chr1", featuretype="mRNA", start=11, end=100, strand="-", frame="0")
+        reference_record = gffutils.Feature(seqid="chr1", featuretype="mRNA", start=11, end=100, strand="-", frame="0")
+        for record in [gff_record, reference_record]:
+            record.attributes["ID"] = ["mRNA1"]
+            record.attributes["Parent"] = ["gene;1"]
+            record.attributes["product"] = ["term=hypothetical, protein%", "other\tproduct"]
+            record.attributes["empty"] = [""]
+            record.attributes["ID"] = ["mRNA=1"]
+        self.assertEqual(str(gff_record), "chr1\t.\tmRNA\t11\t100\t.\t-\t0\tID=mRNA%3D1;Parent=gene%3B1;"
+                                          "product=term%3Dhypothetical%2C protein%25,other%09product;empty")
+        self.assertEqual(str(gff_record), str(reference_record))
+        self.assertEqual(str(gff.GFFRecord(seqid="chr1", start=1)), "chr1\t.\t.\t1\t.\t.\t.\t.\t")
+
     def test_print_gff_record(self):
         # Tests the correct printing of GFF records to file
-        gff_record = gffutils.Feature(seqid="CM000574", id="FGSG_11579", source="chado", featuretype="gene",
-                                      start=1517, end=2509, strand="+", attributes={"ID": ["FGSG_11579"]})
+        gff_record = gff.GFFRecord(seqid="CM000574", source="chado", featuretype="gene", start=1517, end=2509,
+                                   strand="+")
+        gff_record.attributes["ID"] = ["FGSG_11579"]
         file = tempfile.mkstemp()[1]
         file_handle = utils.open_file_write(file)
         self.client._print_gff_record(gff_record, file_handle)
@@ -752,18 +1854,15 @@ class TestGFFExport(unittest.TestCase):
         self.assertTrue(filecmp.cmp(file, actual_file))
         os.remove(file)
 
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_first")
-    def test_create_gff_record(self, mock_query: unittest.mock.Mock):
+    def test_create_gff_record(self):
         # Tests the function that creates a GFF record
-        self.assertIs(mock_query, self.client.query_first)
         feature_entry = sequence.Feature(feature_id=77, organism_id=11, type_id=200, seqlen=66, uniquename="testid",
                                          name="testname")
 
         # Create GFF record for top-level feature
-        mock_query.return_value = None
+        self.client._prefetched_featurelocs = {}
         gff_record = self.client._create_gff_record(feature_entry, "testsequence")
         self.assertEqual(gff_record.seqid, "testsequence")
-        self.assertEqual(gff_record.id, "testid")
         self.assertEqual(gff_record.start, 1)
         self.assertEqual(gff_record.end, 66)
         self.assertEqual(gff_record.strand, ".")
@@ -772,100 +1871,75 @@ class TestGFFExport(unittest.TestCase):
         self.assertEqual(gff_record.attributes["Name"], ["testname"])
 
         # Create GFF record for feature located on a sequence
-        mock_query.return_value = sequence.FeatureLoc(feature_id=1, srcfeature_id=2, fmin=10, fmax=100, strand=1,
-                                                      phase=2)
+        self.client._prefetched_featurelocs = {77: sequence.FeatureLoc(feature_id=77, srcfeature_id=2, fmin=10,
+                                                                       fmax=100, strand=1, phase=2)}
         gff_record = self.client._create_gff_record(feature_entry, "testsequence")
         self.assertEqual(gff_record.seqid, "testsequence")
-        self.assertEqual(gff_record.id, "testid")
         self.assertEqual(gff_record.start, 11)
         self.assertEqual(gff_record.end, 100)
         self.assertEqual(gff_record.strand, "+")
         self.assertEqual(gff_record.frame, "2")
+        self.client._prefetched_featurelocs = {}
 
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_parent_features")
-    def test_has_feature_parents(self, mock_query: unittest.mock.Mock):
+    def test_has_feature_parents(self):
         # Tests the function that checks if a feature entry has parents
-        self.assertIs(mock_query, self.client.query_parent_features)
         feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=77)
-        mock_query_obj = mock_query.return_value
-        mock_query_obj.configure_mock(**{"first.return_value": None})
-        has_parents = self.client._has_feature_parents(feature_entry)
-        mock_query.assert_called_with(77, [62, 63])
-        self.assertFalse(has_parents)
-        mock_query_obj.configure_mock(**{"first.return_value": sequence.Feature(
-            organism_id=11, type_id=300, uniquename="parentid", feature_id=88)})
-        has_parents = self.client._has_feature_parents(feature_entry)
-        self.assertTrue(has_parents)
+        self.client._features_with_parents = {78}
+        self.assertFalse(self.client._has_feature_parents(feature_entry))
+        self.client._features_with_parents = {77, 78}
+        self.assertTrue(self.client._has_feature_parents(feature_entry))
+        self.client._features_with_parents = set()
 
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_first")
-    def test_extract_feature_type(self, mock_query: unittest.mock.Mock):
-        # Tests the function that extracts the type of a feature entry from the relevant database table
-        self.assertIs(mock_query, self.client.query_first)
-        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=77)
-        mock_query.return_value = cv.CvTerm(cv_id=1, dbxref_id=2, name="testtype")
-        featuretype = self.client._extract_feature_type(feature_entry)
-        mock_query.assert_called_with(cv.CvTerm, cvterm_id=200)
-        self.assertEqual(featuretype, "testtype")
-
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_synonyms")
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_synonyms_by_feature_ids")
     def test_extract_feature_synonyms(self, mock_query: unittest.mock.Mock):
-        # Tests the function that extracts the synonyms of a feature entry from the relevant database table
-        self.assertIs(mock_query, self.client.query_feature_synonyms)
-        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=77)
-        mock_query_obj = mock_query.return_value
-        mock_query_obj.configure_mock(**{"all.return_value": [("sometype", "somename"), ("sometype", "othername")]})
-        synonyms = self.client._extract_feature_synonyms(feature_entry)
-        mock_query.assert_called_with(77)
-        self.assertEqual(synonyms, {"sometype": ["somename", "othername"]})
-
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_properties")
+        # Tests the function that extracts the synonyms of features from the relevant database table
+        self.assertIs(mock_query, self.client.query_feature_synonyms_by_feature_ids)
+        mock_query.return_value = [(77, "sometype", "somename"), (77, "sometype", "othername"),
+                                   (78, "sometype", "yetanothername")]
+        synonyms = self.client._extract_feature_synonyms("testfeatures")
+        mock_query.assert_called_with("testfeatures")
+        self.assertEqual(synonyms, {77: {"sometype": ["somename", "othername"]}, 78: {"sometype": ["yetanothername"]}})
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_properties_by_feature_ids")
     def test_extract_feature_properties(self, mock_query: unittest.mock.Mock):
-        # Tests the function that extracts the synonyms of a feature entry from the relevant database table
-        self.assertIs(mock_query, self.client.query_feature_properties)
-        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=77)
-        mock_query_obj = mock_query.return_value
-        mock_query_obj.configure_mock(**{"all.return_value": [("somekey", "somevalue"), ("somekey", "othervalue"),
-                                                              ("otherkey", "yetanothervalue")]})
-        properties = self.client._extract_feature_properties(feature_entry)
-        mock_query.assert_called_with(77)
-        self.assertEqual(properties, {"somekey": ["somevalue", "othervalue"], "otherkey": ["yetanothervalue"]})
-
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_pubs")
+        # Tests the function that extracts the properties of features from the relevant database table
+        self.assertIs(mock_query, self.client.query_feature_properties_by_feature_ids)
+        mock_query.return_value = [(77, "somekey", "somevalue"), (77, "somekey", "othervalue"),
+                                   (77, "otherkey", "yetanothervalue")]
+        properties = self.client._extract_feature_properties("testfeatures")
+        mock_query.assert_called_with("testfeatures")
+        self.assertEqual(properties, {77: {"somekey": ["somevalue", "othervalue"], "otherkey": ["yetanothervalue"]}})
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_pubs_by_feature_ids")
     def test_extract_feature_publications(self, mock_query: unittest.mock.Mock):
-        # Tests the function that extracts the publications of a feature entry from the relevant database table
-        self.assertIs(mock_query, self.client.query_feature_pubs)
-        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=77)
-        mock_query_obj = mock_query.return_value
-        mock_query_obj.configure_mock(**{"all.return_value": [("somepublication", ), ("otherpublication", )]})
-        publications = self.client._extract_feature_publications(feature_entry)
-        mock_query.assert_called_with(77)
-        self.assertEqual(publications, ["somepublication", "otherpublication"])
-
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_dbxrefs")
+        # Tests the function that extracts the publications of features from the relevant database table
+        self.assertIs(mock_query, self.client.query_feature_pubs_by_feature_ids)
+        mock_query.return_value = [(77, "somepublication"), (78, "otherpublication")]
+        publications = self.client._extract_feature_publications("testfeatures")
+        mock_query.assert_called_with("testfeatures")
+        self.assertEqual(publications, {77: ["somepublication"], 78: ["otherpublication"]})
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_dbxrefs_by_feature_ids")
     def test_extract_feature_dbxrefs(self, mock_query: unittest.mock.Mock):
-        # Tests the function that extracts the cross references of a feature entry from the relevant database table
-        self.assertIs(mock_query, self.client.query_feature_dbxrefs)
-        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=77)
-        mock_query_obj = mock_query.return_value
-        mock_query_obj.configure_mock(**{"all.return_value": [("somedb", "someacc",), ("otherdb", "otheracc")]})
-        dbxrefs = self.client._extract_feature_cross_references(feature_entry)
-        mock_query.assert_called_with(77)
-        self.assertEqual(dbxrefs, ["somedb:someacc", "otherdb:otheracc"])
-
-    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_ontology_terms")
+        # Tests the function that extracts the cross references of features from the relevant database table
+        self.assertIs(mock_query, self.client.query_feature_dbxrefs_by_feature_ids)
+        mock_query.return_value = [(77, "somedb", "someacc"), (77, "otherdb", "otheracc")]
+        dbxrefs = self.client._extract_feature_cross_references("testfeatures")
+        mock_query.assert_called_with("testfeatures")
+        self.assertEqual(dbxrefs, {77: ["somedb:someacc", "otherdb:otheracc"]})
+
+    @unittest.mock.patch("pychado.io.gff.GFFExportClient.query_feature_ontology_terms_by_feature_ids")
     def test_extract_feature_ontology_terms(self, mock_query: unittest.mock.Mock):
-        # Tests the function that extracts the ontology terms of a feature entry from the relevant database table
-        self.assertIs(mock_query, self.client.query_feature_ontology_terms)
-        feature_entry = sequence.Feature(organism_id=11, type_id=200, uniquename="testid", feature_id=77)
-        mock_query_obj = mock_query.return_value
-        mock_query_obj.configure_mock(**{"all.return_value": [("GO", "12345"), ("SO", "54321")]})
-        ontology_terms = self.client._extract_feature_ontology_terms(feature_entry)
-        mock_query.assert_called_with(77, 131)
-        self.assertEqual(ontology_terms, ["GO:12345", "SO:54321"])
+        # Tests the function that extracts the ontology terms of features from the relevant database table
+        self.assertIs(mock_query, self.client.query_feature_ontology_terms_by_feature_ids)
+        mock_query.return_value = [(77, "GO", "12345"), (77, "SO", "54321"), (77, "GO", "00027"), (77, "GO", "00013")]
+        ontology_terms = self.client._extract_feature_ontology_terms("testfeatures")
+        mock_query.assert_called_with("testfeatures", 131)
+        self.assertEqual(ontology_terms, {77: ["GO:12345", "SO:54321", "GO:00027", "GO:00013"]})
 
     def test_add_gff_featuretype(self):
         # Tests the function that adds the 'type' and the attribute 'translation' to a GFF record
-        gff_record = gffutils.Feature()
+        gff_record = gff.GFFRecord()
         self.client._add_gff_featuretype(gff_record, "gene", "MKGHU")
         self.assertEqual(gff_record.featuretype, "gene")
         self.assertNotIn("translation", gff_record.attributes)
@@ -875,7 +1949,7 @@ class TestGFFExport(unittest.TestCase):
 
     def test_add_gff_synonyms(self):
         # Tests the function that adds the attribute 'Alias' and various related attributes to a GFF record
-        gff_record = gffutils.Feature()
+        gff_record = gff.GFFRecord()
         self.client._add_gff_synonyms(gff_record, {"alias": ["testalias", "otheralias"], "synonym": ["testsynonym"],
                                                    "otherkey": ["othervalue"]})
         self.assertEqual(gff_record.attributes["Alias"], ["testalias", "otheralias"])
@@ -884,7 +1958,7 @@ class TestGFFExport(unittest.TestCase):
 
     def test_add_gff_properties(self):
         # Tests the function that adds the 'source', 'score' and various attributes to a GFF record
-        gff_record = gffutils.Feature()
+        gff_record = gff.GFFRecord()
         self.client._add_gff_properties(
             gff_record, {"source": ["testsource"], "score": ["testscore"], "comment": ["testcomment", "othercomment"],
                          "otherkey": ["othervalue"]})
@@ -895,25 +1969,25 @@ class TestGFFExport(unittest.TestCase):
 
     def test_add_gff_publications(self):
         # Tests the function that adds the attribute 'literature' to a GFF record
-        gff_record = gffutils.Feature()
+        gff_record = gff.GFFRecord()
         self.client._add_gff_publications(gff_record, ["testpub"])
         self.assertEqual(gff_record.attributes["literature"], ["testpub"])
 
     def test_add_gff_cross_references(self):
         # Tests the function that adds the attribute 'Dbxref' to a GFF record
-        gff_record = gffutils.Feature()
+        gff_record = gff.GFFRecord()
         self.client._add_gff_cross_references(gff_record, ["testdbxref", "otherdbxref"])
         self.assertEqual(gff_record.attributes["Dbxref"], ["testdbxref", "otherdbxref"])
 
     def test_add_gff_ontology_terms(self):
         # Tests the function that adds the attribute 'Ontology_term' to a GFF record
-        gff_record = gffutils.Feature()
+        gff_record = gff.GFFRecord()
         self.client._add_gff_ontology_terms(gff_record, ["GO:12345"])
         self.assertEqual(gff_record.attributes["Ontology_term"], ["GO:12345"])
 
     def test_add_gff_relationships(self):
         # Tests the function that adds the attributes 'Parent' and 'Derives_from' to a GFF record
-        gff_record = gffutils.Feature()
+        gff_record = gff.GFFRecord()
         self.client._add_gff_relationships(gff_record, {"part_of": "feature1", "derives_from": "feature2",
                                                         "orthologous_to": "other_feature"})
         self.assertEqual(gff_record.attributes["Parent"], ["feature1"])
@@ -530,7 +530,37 @@ class TestTasks(unittest.TestCase):
         tasks.run_import_command(args[2], parsed_args, self.uri)
         mock_client.assert_called_with(self.uri, False)
         self.assertIn(unittest.mock.call().load("testfile", "testorganism", "testfasta", "contig",
-                                                True, True, True, False), mock_client.mock_calls)
+                                                True, True, True, False, 1, 0, False, False, False, False),
+                      mock_client.mock_calls)
+
+    @unittest.mock.patch('pychado.io.gff.GFFImportClient')
+    def test_import_gff_staging_with_checkpoints(self, mock_client):
+        # Checks that a GFF import via staging tables is not run together with parallel processes or checkpoints
+        self.assertIs(mock_client, gff.GFFImportClient)
+        for options in [["--jobs", "3"], ["--commit_interval", "100"], ["--commit_per_sequence"], ["--resume"]]:
+            args = ["chado", "import", "gff", "-f", "testfile", "-a", "testorganism", "--staging"] + options \
+                + ["testdb"]
+            parsed_args = chado_tools.parse_arguments(args)
+            tasks.run_import_command(args[2], parsed_args, self.uri)
+            mock_client.assert_not_called()
+
+        # Staging tables are not used for a fresh load
+        args = ["chado", "import", "gff", "-f", "testfile", "-a", "testorganism", "--fresh_load", "--staging",
+                "--commit_interval", "100", "testdb"]
+        parsed_args = chado_tools.parse_arguments(args)
+        tasks.run_import_command(args[2], parsed_args, self.uri)
+        mock_client.assert_called_with(self.uri, False)
+
+    @unittest.mock.patch('pychado.io.gff.GFFImportClient')
+    def test_import_gff_parallel_with_checkpoints(self, mock_client):
+        # Checks that a GFF import in parallel processes is not run together with checkpoints
+        self.assertIs(mock_client, gff.GFFImportClient)
+        for options in [["--commit_interval", "100"], ["--commit_per_sequence"], ["--resume"]]:
+            args = ["chado", "import", "gff", "-f", "testfile", "-a", "testorganism", "--jobs", "3"] + options \
+                + ["testdb"]
+            parsed_args = chado_tools.parse_arguments(args)
+            tasks.run_import_command(args[2], parsed_args, self.uri)
+            mock_client.assert_not_called()
 
     @unittest.mock.patch('pychado.io.fasta.FastaImportClient')
     def test_import_fasta(self, mock_client):
@@ -540,7 +570,8 @@ class TestTasks(unittest.TestCase):
         parsed_args = chado_tools.parse_arguments(args)
         tasks.run_import_command(args[2], parsed_args, self.uri)
         mock_client.assert_called_with(self.uri, False)
-        self.assertIn(unittest.mock.call().load("testfile", "testorganism", "contig"), mock_client.mock_calls)
+        self.assertIn(unittest.mock.call().load("testfile", "testorganism", "contig", 0, False),
+                      mock_client.mock_calls)
 
     @unittest.mock.patch('pychado.io.gaf.GAFImportClient')
     def test_import_gaf(self, mock_client):
@@ -550,7 +581,8 @@ class TestTasks(unittest.TestCase):
         parsed_args = chado_tools.parse_arguments(args)
         tasks.run_import_command(args[2], parsed_args, self.uri)
         mock_client.assert_called_with(self.uri, False)
-        self.assertIn(unittest.mock.call().load("testfile", "testorganism", "protein"), mock_client.mock_calls)
+        self.assertIn(unittest.mock.call().load("testfile", "testorganism", "protein", 0, False),
+                      mock_client.mock_calls)
 
     @unittest.mock.patch('pychado.tasks.run_export_command')
     def test_run_export(self, mock_run):
@@ -566,11 +598,12 @@ class TestTasks(unittest.TestCase):
         # Checks that the function exporting sequences from the database to a FASTA file is correctly called
         self.assertIs(mock_client, fasta.FastaExportClient)
         args = ["chado", "export", "fasta", "-f", "testfile", "-a", "testorganism", "-t", "proteins",
-                "-r", "testrelease", "testdb"]
+                "-r", "testrelease", "--region", "chr1:1-10", "testdb"]
         parsed_args = chado_tools.parse_arguments(args)
         tasks.run_export_command(args[2], parsed_args, self.uri)
         mock_client.assert_called_with(self.uri, False)
-        self.assertIn(unittest.mock.call().export("testfile", "testorganism", "proteins", "testrelease", False),
+        self.assertIn(unittest.mock.call().export("testfile", "testorganism", "proteins", "testrelease", False,
+                                                  [("chr1", 0, 10)]),
                       mock_client.mock_calls)
 
     @unittest.mock.patch('pychado.io.gff.GFFExportClient')
@@ -578,13 +611,56 @@ class TestTasks(unittest.TestCase):
         # Checks that the function exporting genomic data from the database to a GFF file is correctly called
         self.assertIs(mock_client, gff.GFFExportClient)
         args = ["chado", "export", "gff", "-f", "testfile", "-a", "testorganism", "--export_fasta", "--fasta_file",
-                "testfasta", "testdb"]
+                "testfasta", "--jobs", "4", "testdb"]
+        parsed_args = chado_tools.parse_arguments(args)
+        tasks.run_export_command(args[2], parsed_args, self.uri)
+        mock_client.assert_called_with(self.uri, False)
+        self.assertIn(unittest.mock.call().export("testfile", "testorganism", True, "testfasta", False, 4, None),
+                      mock_client.mock_calls)
+
+    @unittest.mock.patch('pychado.io.gff.GFFExportClient')
+    def test_export_gff_incremental(self, mock_client):
+        # Checks that the function exporting a GFF file incrementally from a previous export is correctly called
+        self.assertIs(mock_client, gff.GFFExportClient)
+        args = ["chado", "export", "gff", "-f", "testfile", "-a", "testorganism", "--previous_file", "previousfile",
+                "--since", "2019-01-31 12:00", "testdb"]
         parsed_args = chado_tools.parse_arguments(args)
         tasks.run_export_command(args[2], parsed_args, self.uri)
         mock_client.assert_called_with(self.uri, False)
-        self.assertIn(unittest.mock.call().export("testfile", "testorganism", True, "testfasta", False),
+        self.assertIn(unittest.mock.call().export_incremental("testfile", "previousfile", "2019-01-31 12:00",
+                                                              "testorganism", False, None, False),
                       mock_client.mock_calls)
 
+    @unittest.mock.patch('pychado.io.gff.GFFExportClient')
+    def test_export_gff_incremental_with_jobs(self, mock_client):
+        # Checks that an incremental GFF export is not run in parallel
+        self.assertIs(mock_client, gff.GFFExportClient)
+        args = ["chado", "export", "gff", "-f", "testfile", "-a", "testorganism", "--previous_file", "previousfile",
+                "--since", "2019-01-31 12:00", "--jobs", "4", "testdb"]
+        parsed_args = chado_tools.parse_arguments(args)
+        tasks.run_export_command(args[2], parsed_args, self.uri)
+        mock_client.assert_not_called()
+
+    @unittest.mock.patch('pychado.io.gff.GFFExportClient')
+    def test_export_gff_incremental_with_regions(self, mock_client):
+        # Checks that an incremental GFF export is not restricted to genomic regions
+        self.assertIs(mock_client, gff.GFFExportClient)
+        args = ["chado", "export", "gff", "-f", "testfile", "-a", "testorganism", "--previous_file", "previousfile",
+                "--since", "2019-01-31 12:00", "--region", "chr1:1-10", "testdb"]
+        parsed_args = chado_tools.parse_arguments(args)
+        tasks.run_export_command(args[2], parsed_args, self.uri)
+        mock_client.assert_not_called()
+
+    @unittest.mock.patch('pychado.io.gff.GFFExportClient')
+    def test_export_gff_since_without_previous_file(self, mock_client):
+        # Checks that a GFF export with the time of a previous export, but without the previous file, is not run
+        self.assertIs(mock_client, gff.GFFExportClient)
+        args = ["chado", "export", "gff", "-f", "testfile", "-a", "testorganism", "--since", "2019-01-31 12:00",
+                "testdb"]
+        parsed_args = chado_tools.parse_arguments(args)
+        tasks.run_export_command(args[2], parsed_args, self.uri)
+        mock_client.assert_not_called()
+
     @unittest.mock.patch('pychado.io.gaf.GAFExportClient')
     def test_export_gaf(self, mock_client):
         # Checks that the function exporting gene annotation data from the database to a GAF file is correctly called
@@ -102,6 +102,21 @@ class TestUtils(unittest.TestCase):
         parsed = utils.parse_string("ture")
         self.assertEqual(parsed, "ture")
 
+    def test_parse_region(self):
+        # checks if a genomic region is parsed correctly
+        parsed = utils.parse_region("chr1:101-200")
+        self.assertEqual(parsed, ("chr1", 100, 200))
+        parsed = utils.parse_region("chr1")
+        self.assertEqual(parsed, ("chr1", None, None))
+        parsed = utils.parse_region("chr:1:5-5")
+        self.assertEqual(parsed, ("chr:1", 4, 5))
+        with self.assertRaises(ValueError):
+            utils.parse_region("chr1:200-101")
+        with self.assertRaises(ValueError):
+            utils.parse_region("chr1:0-10")
+        with self.assertRaises(ValueError):
+            utils.parse_region("chr1:100")
+
     def test_list_to_string(self):
         # checks if a list is correctly concatenated
         test_list = [1.123, None, 'hello', True, 'A', 8, False]
@@ -147,6 +162,18 @@ class TestUtils(unittest.TestCase):
         with self.assertRaises(AttributeError):
             utils.list_to_dict(persons, "age")
 
+    def test_group_objects(self):
+        # checks if a function correctly groups the objects in a list into a dictionary
+        john = utils.EmptyObject(name="John", sex="m")
+        mike = utils.EmptyObject(name="Mike", sex="m")
+        mary = utils.EmptyObject(name="Mary", sex="f")
+        persons_dict = utils.group_objects([john, mike, mary], "sex")
+        self.assertEqual(len(persons_dict), 2)
+        self.assertEqual(persons_dict["m"], [john, mike])
+        self.assertEqual(persons_dict["f"], [mary])
+        with self.assertRaises(AttributeError):
+            utils.group_objects([john], "age")
+
     def test_random_string(self):
         # tests if a function generates a random string of lowercase letters
         string1 = utils.random_string(8)
@@ -189,6 +216,31 @@ class TestUtils(unittest.TestCase):
             printed = f.getvalue()
         self.assertEqual(printed, "AAA-BBB\n")
 
+    def test_peak_memory_usage(self):
+        # Tests the function that returns the peak memory usage of the current process
+        self.assertGreater(utils.peak_memory_usage(), 0)
+
+    def test_lru_cache(self):
+        # tests the cache evicting the least recently used objects
+        cache = utils.LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+        # unlimited size
+        cache = utils.LRUCache()
+        for i in range(100):
+            cache.put(i, i)
+        self.assertEqual(len(cache), 100)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2, buffer=True)
@@ -5,7 +5,10 @@ import subprocess
 import urllib.request
 import string
 import random
+import resource
+import collections
 import yaml
+from typing import Tuple, Union
 
 
 class EmptyObject:
@@ -33,6 +36,41 @@ class VerbosePrinter:
                 print(message)
 
 
+class LRUCache:
+    """Class caching objects by key, optionally limited in size by evicting the least recently used objects"""
+
+    def __init__(self, max_size=None):
+        """Constructor"""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of cached objects"""
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the object cached under a given key, or None if not present"""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value) -> None:
+        """Caches an object under a given key, and evicts the least recently used object if the cache is full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all cached objects"""
+        self._entries.clear()
+
+
 def open_file_read(filename: str):
     """Function opening a (potentially gzipped) text file for read access"""
     if not filename:
@@ -131,6 +169,19 @@ def parse_string(the_string: str):
         return the_string
 
 
+def parse_region(the_string: str) -> Tuple[str, Union[None, int], Union[None, int]]:
+    """Converts a genomic region 'seqid:start-end' (1-based, inclusive) or 'seqid' to a tuple (seqid, start, end) in
+    0-based, half-open coordinates"""
+    (seqid, separator, interval) = the_string.rpartition(":")
+    if not separator:
+        return the_string, None, None
+    (start, separator, end) = interval.partition("-")
+    if not seqid or not separator or not is_string_integer(start) or not is_string_integer(end) \
+            or int(start) < 1 or int(end) < int(start):
+        raise ValueError("Invalid genomic region '" + the_string + "'")
+    return seqid, int(start) - 1, int(end)
+
+
 def is_string_integer(the_string: str) -> bool:
     """Tests whether a string can be represented as integer number"""
     try:
@@ -184,8 +235,9 @@ def filter_objects(entries: list, **kwargs) -> list:
 def copy_attribute(old_object, new_object, attribute: str) -> bool:
     """Copies the value of a given attribute from one object to another"""
     new_value = getattr(new_object, attribute, None)
-    old_value = getattr(old_object, attribute, None)
-    if type(old_object) == type(new_object) and new_value is not None and old_value != new_value:
+    if type(old_object) != type(new_object) or new_value is None:
+        return False
+    if getattr(old_object, attribute, None) != new_value:
         setattr(old_object, attribute, new_value)
         return True
     return False
@@ -200,6 +252,18 @@ def list_to_dict(entries: list, key: str) -> dict:
     return dictionary
 
 
+def group_objects(entries: list, key: str) -> dict:
+    """Groups a list of objects of any type into a dictionary of lists, using a specified object parameter as key"""
+    dictionary = {}
+    for entry in entries:
+        current_key = getattr(entry, key)
+        if current_key in dictionary:
+            dictionary[current_key].append(entry)
+        else:
+            dictionary[current_key] = [entry]
+    return dictionary
+
+
 def random_string(n: int) -> str:
     """Generates a random string of n lowercase letters"""
     return "".join(random.choices(string.ascii_lowercase, k=n))
@@ -225,6 +289,14 @@ def current_date() -> str:
     return datetime.date.today().strftime('%Y%m%d')
 
 
+def peak_memory_usage() -> float:
+    """Returns the peak resident memory of the current process in megabytes"""
+    peak_usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_usage / 1024 / 1024
+    return peak_usage / 1024
+
+
 def download_file(url: str) -> str:
     """Downloads a file from the internet"""
     print("Downloading file from URL " + url + " ...")